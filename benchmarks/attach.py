@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+"""
+benchmarks.attach
+=================
+
+Measures attaching and detaching ``--routes`` routes at runtime with
+:meth:`flask_via.Via.attach` on applications already holding ``--sizes``
+url rules, against adding the same rules with ``add_url_rule`` and
+removing them from the url map. Times include updating the url map, which
+Werkzeug otherwise does, sorting every rule again, on the next request.
+
+    python benchmarks/attach.py --routes 50 --sizes 1000,5000,20000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from flask_via import Via  # noqa
+from flask_via.deferred import remove_rules  # noqa
+from flask_via.routers.default import Functional  # noqa
+
+
+def view(**kwargs):
+    return 'view'
+
+
+def build(size):
+    """ Returns an application with ``size`` url rules.
+    """
+
+    app = Flask(__name__, static_folder=None)
+    for i in range(size):
+        app.add_url_rule('/r{0}/<int:id>'.format(i), 'r{0}'.format(i), view)
+    app.test_client().get('/r0/1')
+    return app
+
+
+def timed(func):
+    start = time.time()
+    func()
+    return time.time() - start
+
+
+def run(size, count, repeat):
+    """ Returns seconds taken to attach and detach ``count`` routes on an
+    application of ``size`` rules, by Via and by the url map.
+    """
+
+    routes = [
+        Functional('/a{0}/<int:id>'.format(i), view, 'a{0}'.format(i))
+        for i in range(count)]
+
+    app = build(size)
+    via = Via()
+
+    def attach():
+        via.attach(app, 'feature', routes, url_prefix='/feature')
+        app.url_map.update()
+
+    def detach():
+        via.detach(app, 'feature')
+        app.url_map.update()
+
+    def add():
+        for i in range(count):
+            app.add_url_rule(
+                '/feature/a{0}/<int:id>'.format(i),
+                'a{0}'.format(i),
+                view)
+        app.url_map.update()
+
+    def remove():
+        for i in range(count):
+            remove_rules(app, 'a{0}'.format(i))
+        app.url_map.update()
+
+    # The first attach adds the placeholders
+    attach()
+    detach()
+    assert app.test_client().get('/feature/a0/1').status_code == 404
+
+    results = []
+    for funcs in ((attach, detach), (add, remove)):
+        attached = detached = 0
+        for i in range(repeat):
+            attached += timed(funcs[0])
+            detached += timed(funcs[1])
+        results.append((attached / repeat, detached / repeat))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--routes', type=int, default=50)
+    parser.add_argument('--sizes', default='1000,5000,20000')
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    for size in [int(s) for s in args.sizes.split(',')]:
+        via, url_map = run(size, args.routes, args.repeat)
+        print(
+            'rules={0:<7} via attach={1:.2f}ms detach={2:.2f}ms '
+            'url_map add={3:.2f}ms remove={4:.2f}ms'.format(
+                size,
+                via[0] * 1000,
+                via[1] * 1000,
+                url_map[0] * 1000,
+                url_map[1] * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+"""
+benchmarks.compile
+==================
+
+Times the two phases of route registration separately, compiling a routes
+tree into a ``RouteTable`` and applying that table to applications, and
+compares applying one table to several applications against calling
+``init_app`` for each.
+
+    python benchmarks/compile.py --routes 10000 --apps 5
+"""
+
+import argparse
+import os
+import sys
+import time
+import types
+
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from flask_via import Via  # noqa
+from flask_via.routers import Include  # noqa
+from flask_via.routers.default import Functional  # noqa
+
+
+def view():
+    return 'view'
+
+
+def generate(routes, modules, includes):
+    """ Creates ``modules`` in memory routes modules holding ``routes`` routes
+    between them, each included ``includes`` times by the root module.
+    """
+
+    root = types.ModuleType('via_bench_compile')
+    root.routes = []
+    sys.modules[root.__name__] = root
+
+    per_module = max(routes // (modules * includes), 1)
+    for m in range(modules):
+        module = types.ModuleType('via_bench_compile.m{0}'.format(m))
+        module.routes = [
+            Functional('/r{0}/<int:id>'.format(r), view, 'r{0}'.format(r))
+            for r in range(per_module)]
+        sys.modules[module.__name__] = module
+        for i in range(includes):
+            root.routes.append(Include(
+                module.__name__,
+                url_prefix='/m{0}i{1}'.format(m, i),
+                endpoint='m{0}i{1}'.format(m, i)))
+
+    return root.__name__
+
+
+def timed(func, *args, **kwargs):
+    start = time.time()
+    result = func(*args, **kwargs)
+    return time.time() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--routes', type=int, default=10000)
+    parser.add_argument('--modules', type=int, default=100)
+    parser.add_argument('--includes', type=int, default=1)
+    parser.add_argument('--apps', type=int, default=5)
+    args = parser.parse_args()
+
+    routes_module = generate(args.routes, args.modules, args.includes)
+    via = Via()
+
+    app = Flask(__name__)
+    elapsed, table = timed(via.compile, app, routes_module)
+    print('compile        {0:.3f}s ({1} entries)'.format(elapsed, len(table)))
+
+    elapsed, _ = timed(table.apply, app)
+    print('apply          {0:.3f}s'.format(elapsed))
+
+    apps = [Flask(__name__) for i in range(args.apps)]
+    elapsed, _ = timed(lambda: [table.apply(a) for a in apps])
+    print('apply x{0:<6} {1:.3f}s'.format(args.apps, elapsed))
+
+    apps = [Flask(__name__) for i in range(args.apps)]
+    elapsed, _ = timed(lambda: [
+        via.init_app(a, routes_module=routes_module) for a in apps])
+    print('init_app x{0:<3} {1:.3f}s'.format(args.apps, elapsed))
+
+
+if __name__ == '__main__':
+    main()
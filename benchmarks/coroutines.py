@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+"""
+benchmarks.coroutines
+=====================
+
+Compares the latency of a view calling ``--calls`` slow services one after
+another against a coroutine view awaiting them concurrently, and the
+overhead of reusing the worker event loop against creating a loop for every
+request. Requires Python 3.5 or later.
+
+    python benchmarks/coroutines.py --calls 5 --delay 0.02 --requests 50
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from flask_via.routers.default import Functional  # noqa
+
+
+def build(args):
+    """ Returns an application with sync, fan-out and per request loop
+    views.
+    """
+
+    async def service():
+        await asyncio.sleep(args.delay)
+
+    def sequential():
+        for i in range(args.calls):
+            time.sleep(args.delay)
+        return 'sequential'
+
+    async def fanout():
+        await asyncio.gather(*[service() for i in range(args.calls)])
+        return 'fanout'
+
+    def new_loop():
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(fanout())
+        finally:
+            loop.close()
+        return 'new loop'
+
+    async def empty():
+        return 'empty'
+
+    def empty_new_loop():
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(empty())
+        finally:
+            loop.close()
+
+    app = Flask(__name__)
+    for url, view in (
+            ('/sequential', sequential),
+            ('/fanout', fanout),
+            ('/new_loop', new_loop),
+            ('/empty', empty),
+            ('/empty_new_loop', empty_new_loop)):
+        Functional(url, view).add_to_app(app)
+
+    return app
+
+
+def timed(client, url, requests):
+    start = time.time()
+    for i in range(requests):
+        client.get(url)
+    return (time.time() - start) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--calls', type=int, default=5)
+    parser.add_argument('--delay', type=float, default=0.02)
+    parser.add_argument('--requests', type=int, default=50)
+    args = parser.parse_args()
+
+    client = build(args).test_client()
+
+    for url in ('/sequential', '/fanout', '/new_loop'):
+        print('{0:<16} {1:.2f}ms'.format(
+            url,
+            timed(client, url, args.requests) * 1000))
+
+    requests = args.requests * 20
+    for url in ('/empty', '/empty_new_loop'):
+        print('{0:<16} {1:.3f}ms'.format(
+            url,
+            timed(client, url, requests) * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+"""
+benchmarks.files
+================
+
+Loads ``--routes`` routes declared in JSON and TOML route
+files and from the same routes written out in a python routes module, each in a
+fresh interpreter, first without and then with the parsed route file cache
+or bytecode cache. Reports the seconds taken to load the routes, registering
+them costs the same either way.
+
+    python benchmarks/files.py --routes 50000
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+VIEWS = '''
+def view(**kwargs):
+    return 'view'
+'''
+
+ROUTE = "    Functional('/r{0}/<int:id>', '{1}.views.view', 'r{0}'),\n"
+
+TOML = '''[[routes]]
+router = "functional"
+url = "/r{0}/<int:id>"
+view = "{1}.views.view"
+endpoint = "r{0}"
+
+'''
+
+
+def generate(path, package, routes):
+    """ Writes a views module, route files and a routes module declaring
+    the same routes.
+    """
+
+    os.mkdir(os.path.join(path, package))
+    open(os.path.join(path, package, '__init__.py'), 'w').close()
+
+    with open(os.path.join(path, package, 'views.py'), 'w') as f:
+        f.write(VIEWS)
+
+    with open(os.path.join(path, package, 'routes.py'), 'w') as f:
+        f.write('from flask_via.routers.default import Functional\n\n')
+        f.write('routes = [\n')
+        for i in range(routes):
+            f.write(ROUTE.format(i, package))
+        f.write(']\n')
+
+    with open(os.path.join(path, package, 'routes.json'), 'w') as f:
+        json.dump({'routes': [{
+            'router': 'functional',
+            'url': '/r{0}/<int:id>'.format(i),
+            'view': '{0}.views.view'.format(package),
+            'endpoint': 'r{0}'.format(i),
+        } for i in range(routes)]}, f)
+
+    with open(os.path.join(path, package, 'routes.toml'), 'w') as f:
+        for i in range(routes):
+            f.write(TOML.format(i, package))
+
+
+def boot(path, routes_module):
+    """ Runs in a fresh interpreter, printing the seconds taken to load the
+    routes.
+    """
+
+    sys.path[:0] = [ROOT, path]
+
+    from flask_via import Via
+
+    start = time.time()
+    Via().include(routes_module, 'routes')
+    print(json.dumps(time.time() - start))
+
+
+def run(path, routes_module):
+    output = subprocess.check_output([
+        sys.executable,
+        os.path.abspath(__file__),
+        '--boot', path, routes_module])
+    return json.loads(output.decode('utf-8'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--routes', type=int, default=50000)
+    parser.add_argument('--boot', nargs=2)
+    args = parser.parse_args()
+
+    if args.boot:
+        return boot(*args.boot)
+
+    path = tempfile.mkdtemp()
+    try:
+        package = 'via_bench_files'
+        generate(path, package, args.routes)
+        for name, routes_module in (
+                ('module', '{0}.routes'.format(package)),
+                ('json', os.path.join(path, package, 'routes.json')),
+                ('toml', os.path.join(path, package, 'routes.toml'))):
+            for cached in (False, True):
+                print('{0:<6} cached={1:<5} load={2:.3f}s'.format(
+                    name,
+                    cached,
+                    run(path, routes_module)))
+    finally:
+        shutil.rmtree(path)
+
+
+if __name__ == '__main__':
+    main()
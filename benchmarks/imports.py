@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+"""
+benchmarks.imports
+==================
+
+Compares sequential and concurrent (``VIA_IMPORT_WORKERS``) import of a
+generated routes tree. Each generated routes module sleeps on import to
+stand in for slow file systems or compiled extension loading, pass
+``--latency 0`` to measure pure python imports.
+
+    python benchmarks/imports.py --modules 300 --workers 8
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from flask_via import Via  # noqa
+
+
+MODULE = '''
+import time
+from flask_via.routers import Include
+from flask_via.routers.default import Functional
+
+time.sleep({latency})
+
+
+def view():
+    return '{name}'
+
+
+routes = [
+    Functional('/{name}', view, '{name}'),
+] + [
+    Include('{package}.' + child, url_prefix='/' + child, endpoint=child)
+    for child in {children!r}
+]
+'''
+
+
+def generate(path, package, modules, fanout, latency):
+    """ Writes a package of ``modules`` routes modules to ``path``, each
+    including up to ``fanout`` children.
+    """
+
+    os.mkdir(os.path.join(path, package))
+    open(os.path.join(path, package, '__init__.py'), 'w').close()
+
+    for i in range(modules):
+        children = [
+            'm{0}'.format(c)
+            for c in range(i * fanout + 1, min((i + 1) * fanout + 1, modules))]
+        with open(os.path.join(path, package, 'm{0}.py'.format(i)), 'w') as f:
+            f.write(MODULE.format(
+                latency=latency,
+                name='m{0}'.format(i),
+                package=package,
+                children=children))
+
+
+def run(package, workers):
+    """ Boots an application from a generated package, returning the time
+    taken.
+    """
+
+    app = Flask(__name__)
+    app.config['VIA_IMPORT_WORKERS'] = workers
+
+    start = time.time()
+    Via().init_app(app, routes_module='{0}.m0'.format(package))
+    elapsed = time.time() - start
+
+    for name in list(sys.modules):
+        if name == package or name.startswith(package + '.'):
+            del sys.modules[name]
+
+    return elapsed, len(list(app.url_map.iter_rules()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--modules', type=int, default=300)
+    parser.add_argument('--fanout', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.005)
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    path = tempfile.mkdtemp()
+    sys.path.insert(0, path)
+    try:
+        for workers in (0, args.workers):
+            package = 'via_bench_imports_{0}'.format(workers)
+            generate(path, package, args.modules, args.fanout, args.latency)
+            elapsed, rules = run(package, workers)
+            print('workers={0:<3} rules={1:<6} init_app={2:.3f}s'.format(
+                workers, rules, elapsed))
+    finally:
+        sys.path.remove(path)
+        shutil.rmtree(path)
+
+
+if __name__ == '__main__':
+    main()
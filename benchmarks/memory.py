@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+"""
+benchmarks.memory
+=================
+
+Tracks bytes per route of ``--routes`` generated routes, split between
+``--modules`` routes modules: held by the routers in the routes modules,
+added by registering them with an application, and still held once
+``VIA_RELEASE_ROUTES`` deleted the routes from their modules. Requires
+Python 3.4 or later for :mod:`tracemalloc`, run it on an earlier revision
+to compare.
+
+    python benchmarks/memory.py --routes 100000 --modules 100
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+import types
+
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from flask_via import Via  # noqa
+from flask_via.routers import Include  # noqa
+from flask_via.routers.default import Functional  # noqa
+
+
+def view(**kwargs):
+    return 'view'
+
+
+def generate(package, routes, modules):
+    """ Creates in memory routes modules holding ``routes`` routes between
+    them, urls and endpoints are built at runtime as generated routes are.
+    """
+
+    root = types.ModuleType(package)
+    root.routes = []
+    sys.modules[package] = root
+
+    per_module = max(routes // modules, 1)
+    for m in range(modules):
+        module = types.ModuleType('{0}.m{1}'.format(package, m))
+        module.routes = [
+            Functional('/r{0}/<int:id>'.format(r), view, 'r{0}'.format(r))
+            for r in range(per_module)]
+        sys.modules[module.__name__] = module
+        root.routes.append(Include(
+            module.__name__,
+            url_prefix='/m{0}'.format(m),
+            endpoint='m{0}'.format(m)))
+
+    return per_module * modules
+
+
+def measure():
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def run(routes, modules, release):
+    """ Returns the bytes allocated by routers, by registration and still
+    allocated once registered.
+    """
+
+    package = 'via_bench_memory_{0}'.format(int(release))
+
+    start = measure()
+    count = generate(package, routes, modules)
+    routers = measure()
+
+    app = Flask(__name__)
+    app.config['VIA_RELEASE_ROUTES'] = release
+    Via().init_app(app, routes_module=package)
+    registered = measure()
+
+    return count, routers - start, registered - routers, registered - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--routes', type=int, default=100000)
+    parser.add_argument('--modules', type=int, default=100)
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    for release in (False, True):
+        count, routers, registration, total = run(
+            args.routes,
+            args.modules,
+            release)
+        print(
+            'release={0:<5} routers={1:.0f}B registration={2:.0f}B '
+            'total={3:.0f}B per route'.format(
+                release,
+                routers / float(count),
+                registration / float(count),
+                total / float(count)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+"""
+benchmarks.metrics
+==================
+
+Measures the overhead ``VIA_METRICS`` adds to a request, calling a view
+directly and wrapped by :func:`flask_via.metrics.measured`, and dispatching
+``--requests`` requests through the test client with and without metrics.
+
+    python benchmarks/metrics.py --calls 1000000 --requests 10000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from flask_via.metrics import Histogram, install, measured  # noqa
+from flask_via.routers.default import Functional  # noqa
+
+
+def view():
+    return 'view'
+
+
+def build(metrics):
+    """ Returns an application with a single route, measured or not.
+    """
+
+    app = Flask(__name__)
+    Functional('/', view, 'index').add_to_app(app)
+    if metrics:
+        install(app)
+
+    return app
+
+
+def timed(func, calls):
+    start = time.time()
+    for i in range(calls):
+        func()
+    return (time.time() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--calls', type=int, default=1000000)
+    parser.add_argument('--requests', type=int, default=10000)
+    args = parser.parse_args()
+
+    plain = timed(view, args.calls)
+    wrapped = timed(measured(view, Histogram('index')), args.calls)
+    print('{0:<16} {1:.3f}us'.format('view', plain * 1e6))
+    print('{0:<16} {1:.3f}us'.format('measured', wrapped * 1e6))
+    print('{0:<16} {1:.3f}us'.format('overhead', (wrapped - plain) * 1e6))
+
+    for metrics in (False, True):
+        client = build(metrics).test_client()
+        print('{0:<16} {1:.3f}us'.format(
+            'request' + (' metrics' if metrics else ''),
+            timed(lambda: client.get('/'), args.requests) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+"""
+benchmarks.pluggable
+====================
+
+Compares the per request overhead of a ``Pluggable`` method view creating an
+instance of its class for every request, as Flask does, against one reusing
+an instance per thread with its handlers looked up at registration. Views are
+called directly inside a request context, isolating the view overhead, and
+through the test client.
+
+    python benchmarks/pluggable.py --calls 200000 --requests 5000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from flask import Flask
+from flask.views import MethodView
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from flask_via.routers.default import Pluggable  # noqa
+
+
+class ItemView(MethodView):
+
+    def __init__(self):
+        self.items = None
+
+    def get(self, id):
+        return 'item'
+
+    def post(self, id):
+        return 'created'
+
+
+def build():
+    """ Returns an application with a per request and a reused view.
+    """
+
+    app = Flask(__name__)
+    Pluggable('/new/<int:id>', ItemView, 'new').add_to_app(app)
+    Pluggable('/reused/<int:id>', ItemView, 'reused', reuse=True).add_to_app(
+        app)
+
+    return app
+
+
+def called(app, endpoint, calls):
+    view = app.view_functions[endpoint]
+    with app.test_request_context('/', method='GET'):
+        start = time.time()
+        for i in range(calls):
+            view(id=1)
+        return (time.time() - start) / calls
+
+
+def requested(client, url, requests):
+    start = time.time()
+    for i in range(requests):
+        client.get(url)
+    return (time.time() - start) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--calls', type=int, default=200000)
+    parser.add_argument('--requests', type=int, default=5000)
+    args = parser.parse_args()
+
+    app = build()
+    client = app.test_client()
+
+    for endpoint in ('new', 'reused'):
+        print('{0:<8} call {1:.3f}us request {2:.1f}us'.format(
+            endpoint,
+            called(app, endpoint, args.calls) * 1e6,
+            requested(client, '/{0}/1'.format(endpoint), args.requests)
+            * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+
+"""
+benchmarks.registration
+=======================
+
+Measures how ``Via.init_app`` scales over synthesised routes trees. For each
+scenario a fresh interpreter builds the tree and records:
+
+* ``compile`` / ``apply`` / ``init`` time in seconds
+* ``peak_memory`` in bytes allocated during ``init_app`` (Python 3 only)
+* ``rss`` maximum resident set size of the process in bytes
+* ``match_mean`` / ``match_p99`` url matching latency in microseconds
+* ``dispatch_mean`` / ``dispatch_p99`` url matching latency in microseconds
+  with ``VIA_PREFIX_DISPATCH`` and ``VIA_STATIC_DISPATCH``
+
+Results are written as JSON. Pass a previous results file with ``--baseline``
+to fail when any scenario is slower or larger than the baseline by more than
+``--tolerance``::
+
+    python benchmarks/registration.py --output results.json
+    python benchmarks/registration.py --baseline results.json
+
+Scenarios with 100k routes only run with ``--all``.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+#: name: (routes, modules, depth, blueprints, pluggable, resources, static,
+#: large)
+SCENARIOS = [
+    ('functional-1k', 1000, 10, 1, 0, 0.0, 0.0, 0.0, False),
+    ('functional-10k', 10000, 100, 1, 0, 0.0, 0.0, 0.0, False),
+    ('functional-100k', 100000, 300, 1, 0, 0.0, 0.0, 0.0, True),
+    ('pluggable-10k', 10000, 100, 1, 0, 1.0, 0.0, 0.0, False),
+    ('static-10k', 10000, 100, 1, 0, 0.0, 0.0, 1.0, False),
+    ('mixed-100k', 100000, 300, 3, 50, 0.3, 0.1, 0.3, True),
+    ('depth-5', 5000, 50, 5, 0, 0.0, 0.0, 0.0, False),
+    ('depth-20', 5000, 50, 20, 0, 0.0, 0.0, 0.0, False),
+    ('blueprints-1', 5000, 50, 1, 1, 0.0, 0.0, 0.0, False),
+    ('blueprints-50', 5000, 50, 1, 50, 0.0, 0.0, 0.0, False),
+    ('blueprints-500', 5000, 50, 1, 500, 0.0, 0.0, 0.0, False),
+    ('resources-5k', 5000, 50, 1, 0, 0.0, 0.5, 0.0, False),
+]
+
+#: Metrics compared against a baseline, lower is better for all of them
+METRICS = (
+    'init',
+    'compile',
+    'apply',
+    'peak_memory',
+    'match_mean',
+    'dispatch_mean')
+
+
+def run(name, routes, modules, depth, blueprints, pluggable, resources,
+        static, memory=True, samples=1000):
+    """ Runs a single scenario in this process and returns its results.
+    """
+
+    from flask import Flask
+    from flask_via import Via
+    from flask_via.dispatch import install
+    from tree import flask_restful, generate
+
+    try:
+        import tracemalloc
+    except ImportError:  # Python 2
+        tracemalloc = None
+
+    try:
+        import resource
+    except ImportError:  # Windows
+        resource = None
+
+    routes_module, targets = generate(
+        'via_bench_' + name.replace('-', '_'),
+        routes=routes,
+        modules=modules,
+        depth=depth,
+        blueprints=blueprints,
+        pluggable=pluggable,
+        resources=resources,
+        static=static)
+
+    kwargs = {}
+    app = Flask(__name__, static_folder=None)
+    if flask_restful is not None:
+        kwargs['restful_api'] = flask_restful.Api(app)
+
+    via = Via()
+
+    start = time.time()
+    table = via.compile(app, routes_module, **kwargs)
+    compile_time = time.time() - start
+
+    start = time.time()
+    table.apply(app)
+    apply_time = time.time() - start
+
+    def fresh():
+        other = Flask(__name__, static_folder=None)
+        if flask_restful is not None:
+            kwargs['restful_api'] = flask_restful.Api(other)
+        return other
+
+    other = fresh()
+    start = time.time()
+    via.init_app(other, routes_module=routes_module, **kwargs)
+    init_time = time.time() - start
+
+    peak = None
+    if memory and tracemalloc is not None:
+        other = fresh()
+        tracemalloc.start()
+        via.init_app(other, routes_module=routes_module, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    adapter = app.url_map.bind('localhost')
+    random.seed(0)
+    paths = [
+        adapter.build(endpoint, values)
+        for endpoint, values in random.sample(
+            targets,
+            min(samples, len(targets)))]
+
+    def latencies(adapter):
+        measured = []
+        for path in paths:
+            start = time.time()
+            adapter.match(path)
+            measured.append((time.time() - start) * 1e6)
+        measured.sort()
+        return measured
+
+    match = latencies(adapter)
+
+    install(app)
+    app.url_map.update()
+    dispatch = latencies(app.url_map.bind('localhost'))
+
+    rss = None
+    if resource is not None:
+        # Kilobytes on Linux, bytes on OS X
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform != 'darwin':
+            rss *= 1024
+
+    return {
+        'scenario': name,
+        'routes': routes,
+        'rules': len(list(app.url_map.iter_rules())),
+        'depth': depth,
+        'blueprints': blueprints,
+        'compile': compile_time,
+        'apply': apply_time,
+        'init': init_time,
+        'peak_memory': peak,
+        'rss': rss,
+        'match_mean': sum(match) / len(match),
+        'match_p99': match[int(len(match) * 0.99) - 1],
+        'dispatch_mean': sum(dispatch) / len(dispatch),
+        'dispatch_p99': dispatch[int(len(dispatch) * 0.99) - 1],
+    }
+
+
+def spawn(scenario, memory=True):
+    """ Runs a scenario in a fresh interpreter.
+    """
+
+    output = subprocess.check_output([
+        sys.executable,
+        __file__,
+        '--run',
+        json.dumps(list(scenario[:8]) + [memory])])
+
+    return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+
+def compare(results, baseline, tolerance):
+    """ Returns a list of regressions of ``results`` against ``baseline``.
+    """
+
+    previous = dict((r['scenario'], r) for r in baseline['results'])
+    regressions = []
+
+    for result in results:
+        before = previous.get(result['scenario'])
+        if before is None:
+            continue
+        for metric in METRICS:
+            if not before.get(metric) or result.get(metric) is None:
+                continue
+            change = result[metric] / before[metric] - 1
+            if change > tolerance:
+                regressions.append(
+                    '{0} {1}: {2:.4g} -> {3:.4g} (+{4:.0%})'.format(
+                        result['scenario'],
+                        metric,
+                        before[metric],
+                        result[metric],
+                        change))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--run', help=argparse.SUPPRESS)
+    parser.add_argument('--all', action='store_true')
+    parser.add_argument('--scenario', action='append', default=[])
+    parser.add_argument('--output')
+    parser.add_argument('--baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--no-memory', action='store_true')
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(1, os.path.join(os.path.dirname(__file__), '..'))
+
+    if args.run:
+        print(json.dumps(run(*json.loads(args.run))))
+        return
+
+    import flask
+    import werkzeug
+
+    scenarios = [
+        s for s in SCENARIOS
+        if (s[0] in args.scenario) or (
+            not args.scenario and (args.all or not s[8]))]
+
+    results = []
+    for scenario in scenarios:
+        result = spawn(scenario, not args.no_memory)
+        results.append(result)
+        print(
+            '{scenario:<16} rules={rules:<7} init={init:.3f}s '
+            'compile={compile:.3f}s apply={apply:.3f}s '
+            'match={match_mean:.1f}us p99={match_p99:.1f}us '
+            'dispatch={dispatch_mean:.1f}us p99={dispatch_p99:.1f}us'.format(
+                **result))
+
+    report = {
+        'flask_via': open(os.path.join(
+            os.path.dirname(__file__), '..', 'VERSION')).read().strip(),
+        'flask': flask.__version__,
+        'werkzeug': werkzeug.__version__,
+        'python': platform.python_version(),
+        'timestamp': time.time(),
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=1, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print('REGRESSION ' + regression)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
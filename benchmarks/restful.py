@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+"""
+benchmarks.restful
+==================
+
+Compares registering ``--resources`` Flask-Restful resource classes
+imported at boot against resources given as python dotted paths, imported on
+first request. Each resource lives in its own generated module.
+
+    python benchmarks/restful.py --resources 2000
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from flask import Flask
+from flask_restful import Api
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from flask_via.routers.restful import Resource  # noqa
+
+
+MODULE = '''
+from flask_restful import Resource
+
+
+class R{index}(Resource):
+
+    def get(self, id):
+        return {{'id': id}}
+'''
+
+PACKAGE = 'via_bench_restful'
+
+
+def generate(path, resources):
+    """ Writes a package of ``resources`` resource modules to ``path``.
+    """
+
+    os.mkdir(os.path.join(path, PACKAGE))
+    open(os.path.join(path, PACKAGE, '__init__.py'), 'w').close()
+
+    for i in range(resources):
+        with open(os.path.join(path, PACKAGE, 'r{0}.py'.format(i)), 'w') as f:
+            f.write(MODULE.format(index=i))
+
+
+def forget():
+    for name in list(sys.modules):
+        if name.startswith(PACKAGE):
+            del sys.modules[name]
+
+
+def routes(resources, lazy):
+    """ Returns the resource routes, importing the resource classes unless
+    ``lazy``.
+    """
+
+    result = []
+    for i in range(resources):
+        path = '{0}.r{1}.R{1}'.format(PACKAGE, i)
+        if not lazy:
+            module = __import__(path.rpartition('.')[0], fromlist=['x'])
+            path = getattr(module, 'R{0}'.format(i))
+        result.append(Resource('/r{0}/<int:id>'.format(i), path))
+    return result
+
+
+def timed(resources, lazy):
+    forget()
+    app = Flask(__name__)
+    api = Api(app)
+
+    start = time.time()
+    entries = routes(resources, lazy)
+    imported = time.time() - start
+
+    start = time.time()
+    for route in entries:
+        route.add_to_app(app, restful_api=api)
+    registered = time.time() - start
+
+    client = app.test_client()
+    start = time.time()
+    client.get('/r0/1')
+    first = time.time() - start
+
+    return imported, registered, first
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--resources', type=int, default=2000)
+    args = parser.parse_args()
+
+    path = tempfile.mkdtemp()
+    sys.path.insert(0, path)
+    try:
+        generate(path, args.resources)
+        # Compile the generated modules once
+        routes(args.resources, False)
+        for name, lazy in (('classes', False), ('lazy', True)):
+            imported, registered, first = timed(args.resources, lazy)
+            print(
+                '{0:<14} import {1:.3f}s register {2:.3f}s '
+                'first request {3:.2f}ms'.format(
+                    name,
+                    imported,
+                    registered,
+                    first * 1000))
+    finally:
+        sys.path.remove(path)
+        shutil.rmtree(path)
+
+
+if __name__ == '__main__':
+    main()
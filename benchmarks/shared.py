@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+"""
+benchmarks.shared
+=================
+
+Boots ``--apps`` applications registering the same generated routes module
+of ``--routes`` routes, as tenant applications built by one factory do, with
+and without ``VIA_SHARED_ROUTES``. Each run is a fresh interpreter reporting
+the boot time and the resident memory the applications added. Requires
+Linux for ``/proc``.
+
+    python benchmarks/shared.py --routes 500 --apps 1,10,50
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import types
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def view(**kwargs):
+    return 'view'
+
+
+def rss():
+    """ Returns the resident memory of this process in kB.
+    """
+
+    with open('/proc/self/status') as f:
+        return [int(l.split()[1]) for l in f if l.startswith('VmRSS:')][0]
+
+
+def boot(routes, apps, shared):
+    """ Runs in a fresh interpreter, printing the seconds taken to boot the
+    applications and the memory they added.
+    """
+
+    sys.path.insert(0, ROOT)
+
+    from flask import Flask
+    from flask_via import Via
+    from flask_via.routers.default import Functional
+
+    module = types.ModuleType('via_bench_shared')
+    module.routes = [
+        Functional('/r{0}/<int:id>'.format(i), view, 'r{0}'.format(i))
+        for i in range(routes)]
+    sys.modules[module.__name__] = module
+
+    via = Via()
+    before = rss()
+    start = time.time()
+    created = []
+    for i in range(apps):
+        app = Flask(__name__, static_folder=None)
+        app.config['VIA_SHARED_ROUTES'] = shared
+        via.init_app(app, routes_module=module.__name__)
+        # Werkzeug sorts the url map on the first request
+        app.url_map.update()
+        created.append(app)
+
+    print(json.dumps([time.time() - start, rss() - before]))
+
+
+def run(routes, apps, shared):
+    output = subprocess.check_output([
+        sys.executable,
+        os.path.abspath(__file__),
+        '--boot', str(routes), str(apps), str(int(shared))])
+    return json.loads(output.decode('utf-8'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--routes', type=int, default=500)
+    parser.add_argument('--apps', default='1,10,50')
+    parser.add_argument('--boot', nargs=3, type=int)
+    args = parser.parse_args()
+
+    if args.boot:
+        routes, apps, shared = args.boot
+        return boot(routes, apps, bool(shared))
+
+    for apps in [int(a) for a in args.apps.split(',')]:
+        for shared in (False, True):
+            seconds, memory = run(args.routes, apps, shared)
+            print('apps={0:<4} shared={1:<5} boot={2:.3f}s rss={3}kB'.format(
+                apps,
+                shared,
+                seconds,
+                memory))
+
+
+if __name__ == '__main__':
+    main()
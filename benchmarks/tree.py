@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+"""
+benchmarks.tree
+===============
+
+Synthesises routes trees as in memory routes modules for the benchmarks.
+"""
+
+import os
+import sys
+import types
+
+from flask.views import MethodView
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from flask_via.routers import Include  # noqa
+from flask_via.routers.default import Blueprint, Functional, Pluggable  # noqa
+from flask_via.routers.restful import Resource  # noqa
+
+try:
+    import flask_restful
+except ImportError:
+    flask_restful = None
+
+
+def view(id):
+    return str(id)
+
+
+class View(MethodView):
+
+    def get(self, id):
+        return str(id)
+
+
+if flask_restful is not None:
+
+    class ApiResource(flask_restful.Resource):
+
+        def get(self, id):
+            return {'id': id}
+
+
+def module(name, routes):
+    """ Creates an in memory module holding ``routes``.
+    """
+
+    mod = types.ModuleType(name)
+    mod.__file__ = os.path.join(os.path.dirname(__file__), 'tree.py')
+    mod.routes = routes
+    sys.modules[name] = mod
+    return mod
+
+
+def clear(package):
+    """ Removes every generated module of ``package``.
+    """
+
+    for name in list(sys.modules):
+        if name == package or name.startswith(package + '.'):
+            del sys.modules[name]
+
+
+def generate(
+        package,
+        routes=1000,
+        modules=10,
+        depth=1,
+        blueprints=0,
+        pluggable=0.0,
+        resources=0.0,
+        static=0.0):
+    """ Generates a routes tree, returning the root routes module name and
+    a list of ``(endpoint, values)`` for every route which can be requested.
+
+    Arguments
+    ---------
+    package : str
+        Name of the package to generate modules in
+
+    Keyword Arguments
+    -----------------
+    routes : int
+        Total number of routes
+    modules : int
+        Number of routes modules holding routes outside of blueprints
+    depth : int
+        Number of nested ``Include`` routers between the root and each
+        routes module
+    blueprints : int
+        Number of ``Blueprint`` routers, half of the routes are placed in
+        blueprints when greater than zero
+    pluggable : float
+        Fraction of routes using the ``Pluggable`` router
+    resources : float
+        Fraction of routes using the ``Resource`` router, ignored if
+        ``Flask-Restful`` is not installed
+    static : float
+        Fraction of routes using the ``Functional`` router without url
+        converters
+    """
+
+    clear(package)
+
+    if flask_restful is None:
+        resources = 0.0
+
+    counter = [0]
+    targets = []
+
+    def make_routes(count, prefix):
+        made = []
+        for i in range(count):
+            n = counter[0]
+            counter[0] += 1
+            url = '/r{0}/<int:id>'.format(n)
+            kind = (n % 100) / 100.0
+            if kind < resources:
+                endpoint = 'res{0}'.format(n)
+                made.append(Resource(url, ApiResource, endpoint=endpoint))
+                targets.append((endpoint, {'id': n}))
+                continue
+            elif kind < resources + pluggable:
+                endpoint = 'p{0}'.format(n)
+                made.append(Pluggable(url, View, endpoint))
+            elif kind < resources + pluggable + static:
+                endpoint = 's{0}'.format(n)
+                made.append(Functional(
+                    '/r{0}'.format(n),
+                    lambda: 'static',
+                    endpoint))
+                targets.append((prefix + endpoint, {}))
+                continue
+            else:
+                endpoint = 'f{0}'.format(n)
+                made.append(Functional(url, view, endpoint))
+            targets.append((prefix + endpoint, {'id': n}))
+        return made
+
+    root = []
+
+    in_blueprints = routes // 2 if blueprints else 0
+    for b in range(blueprints):
+        name = '{0}.bp{1}'.format(package, b)
+        count = in_blueprints // blueprints
+        module(name, [])
+        module(name + '.routes', make_routes(count, 'bp{0}.'.format(b)))
+        root.append(Blueprint(
+            'bp{0}'.format(b),
+            name,
+            url_prefix='/bp{0}'.format(b)))
+
+    outside = routes - in_blueprints
+    for m in range(modules):
+        count = outside // modules + (1 if m < outside % modules else 0)
+        parent = root
+        prefix = ''
+        for d in range(depth - 1):
+            name = '{0}.m{1}d{2}'.format(package, m, d)
+            level = []
+            module(name, level)
+            parent.append(Include(
+                name,
+                url_prefix='/d{0}'.format(d),
+                endpoint='d{0}'.format(d)))
+            prefix += 'd{0}.'.format(d)
+            parent = level
+        name = '{0}.m{1}'.format(package, m)
+        module(name, make_routes(count, prefix + 'm{0}.'.format(m)))
+        parent.append(Include(
+            name,
+            url_prefix='/m{0}'.format(m),
+            endpoint='m{0}'.format(m)))
+
+    module(package, root)
+
+    return package, targets
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+"""
+benchmarks.urls
+===============
+
+Times building the links of a page with Flask's ``url_for`` against the
+precompiled builders of ``flask_via.build``, both from python and from a
+Jinja template, over an application with ``--routes`` routes included
+under endpoint prefixes.
+
+    python benchmarks/urls.py --links 10000 --routes 1000
+"""
+
+import argparse
+import os
+import sys
+import time
+import types
+
+from flask import Flask, render_template_string, url_for as flask_url_for
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from flask_via import Via  # noqa
+from flask_via.build import url_for, url_for_many  # noqa
+from flask_via.routers import Include  # noqa
+from flask_via.routers.default import Functional  # noqa
+
+
+TEMPLATE = (
+    '{% for endpoint, id in links %}'
+    '<a href="{{ url_for(endpoint, id=id, tab="a") }}">{{ id }}</a>'
+    '{% endfor %}')
+
+
+def view(**kwargs):
+    return 'view'
+
+
+def generate(routes, modules):
+    """ Creates ``modules`` in memory routes modules holding ``routes`` routes
+    between them, each included with an endpoint prefix.
+    """
+
+    root = types.ModuleType('via_bench_urls')
+    root.routes = []
+    sys.modules[root.__name__] = root
+
+    per_module = max(routes // modules, 1)
+    for m in range(modules):
+        module = types.ModuleType('via_bench_urls.m{0}'.format(m))
+        module.routes = [
+            Functional('/r{0}/<int:id>'.format(r), view, 'r{0}'.format(r))
+            for r in range(per_module)]
+        sys.modules[module.__name__] = module
+        root.routes.append(Include(
+            module.__name__,
+            url_prefix='/m{0}'.format(m),
+            endpoint='m{0}'.format(m)))
+
+    return root.__name__, [
+        'm{0}.r{1}'.format(m, r)
+        for m in range(modules)
+        for r in range(per_module)]
+
+
+def timed(func, *args, **kwargs):
+    start = time.time()
+    result = func(*args, **kwargs)
+    return time.time() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--links', type=int, default=10000)
+    parser.add_argument('--routes', type=int, default=1000)
+    parser.add_argument('--modules', type=int, default=10)
+    args = parser.parse_args()
+
+    routes_module, endpoints = generate(args.routes, args.modules)
+
+    app = Flask(__name__)
+    app.config['VIA_URL_BUILDERS'] = True
+    Via().init_app(app, routes_module=routes_module)
+
+    links = [
+        (endpoints[i % len(endpoints)], i) for i in range(args.links)]
+    same = endpoints[0]
+
+    with app.test_request_context('/'):
+        elapsed, expected = timed(
+            lambda: [flask_url_for(e, id=i, tab='a') for e, i in links])
+        print('flask url_for  {0:.3f}s'.format(elapsed))
+
+        elapsed, result = timed(
+            lambda: [url_for(e, id=i, tab='a') for e, i in links])
+        assert result == expected
+        print('via url_for    {0:.3f}s'.format(elapsed))
+
+        elapsed, expected = timed(
+            lambda: [flask_url_for(same, id=i) for _, i in links])
+        print('flask same     {0:.3f}s'.format(elapsed))
+
+        elapsed, result = timed(
+            url_for_many,
+            same,
+            [{'id': i} for _, i in links])
+        assert result == expected
+        print('url_for_many   {0:.3f}s'.format(elapsed))
+
+        app.jinja_env.globals['url_for'] = flask_url_for
+        elapsed, expected = timed(
+            render_template_string,
+            TEMPLATE,
+            links=links)
+        print('flask template {0:.3f}s'.format(elapsed))
+
+        app.jinja_env.globals['url_for'] = url_for
+        elapsed, result = timed(render_template_string, TEMPLATE, links=links)
+        assert result == expected
+        print('via template   {0:.3f}s'.format(elapsed))
+
+
+if __name__ == '__main__':
+    main()
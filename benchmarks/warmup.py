@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+"""
+benchmarks.warmup
+=================
+
+Forks ``--workers`` workers from an application booted in the master, as
+``gunicorn --preload`` does, with and without :meth:`flask_via.Via.warmup`.
+Each worker reports the latency of its first request to every route of a
+generated tree of ``--modules`` lazily imported view modules, and its
+resident and private memory afterwards. Private memory is what a worker no
+longer shares with the master. Requires Linux for ``/proc``.
+
+    python benchmarks/warmup.py --modules 200 --workers 4
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from flask_via import Via  # noqa
+
+
+VIEWS = '''
+TABLE = dict((i, str(i) * 8) for i in range({size}))
+
+
+def view():
+    return TABLE[{name}]
+'''
+
+ROUTES = '''
+from flask_via.routers.default import Functional
+
+routes = [
+    Functional('/v{{0}}'.format(i), '{package}.v{{0}}.view'.format(i),
+               'v{{0}}'.format(i))
+    for i in range({modules})
+]
+'''
+
+
+def generate(path, package, modules, size):
+    """ Writes a routes module and ``modules`` view modules, each building a
+    table of ``size`` entries on import.
+    """
+
+    os.mkdir(os.path.join(path, package))
+    open(os.path.join(path, package, '__init__.py'), 'w').close()
+
+    with open(os.path.join(path, package, 'routes.py'), 'w') as f:
+        f.write(ROUTES.format(package=package, modules=modules))
+
+    for i in range(modules):
+        with open(os.path.join(path, package, 'v{0}.py'.format(i)), 'w') as f:
+            f.write(VIEWS.format(size=size, name=i % size))
+
+
+def memory():
+    """ Returns resident and private memory of this process in kB.
+    """
+
+    with open('/proc/self/status') as f:
+        rss = [int(l.split()[1]) for l in f if l.startswith('VmRSS:')][0]
+
+    private = 0
+    with open('/proc/self/smaps') as f:
+        for line in f:
+            if line.startswith(('Private_Clean:', 'Private_Dirty:')):
+                private += int(line.split()[1])
+
+    return rss, private
+
+
+def worker(app, modules, write):
+    """ Runs in a forked worker, writing its measurements to a pipe.
+    """
+
+    client = app.test_client()
+    latencies = []
+    for i in range(modules):
+        start = time.time()
+        client.get('/v{0}'.format(i))
+        latencies.append(time.time() - start)
+
+    rss, private = memory()
+    os.write(write, json.dumps({
+        'first': latencies[0],
+        'mean': sum(latencies) / len(latencies),
+        'rss': rss,
+        'private': private,
+    }).encode('utf-8'))
+
+
+def run(package, modules, workers, warm):
+    """ Boots an application in this process and forks workers from it,
+    returning the measurements of each worker.
+    """
+
+    app = Flask(__name__)
+    via = Via()
+    via.init_app(app, routes_module='{0}.routes'.format(package))
+    if warm:
+        via.warmup(app)
+
+    results = []
+    for i in range(workers):
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read)
+            try:
+                worker(app, modules, write)
+            finally:
+                os._exit(0)
+        os.close(write)
+        with os.fdopen(read) as f:
+            results.append(json.loads(f.read()))
+        os.waitpid(pid, 0)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--modules', type=int, default=200)
+    parser.add_argument('--size', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    path = tempfile.mkdtemp()
+    sys.path.insert(0, path)
+    try:
+        for warm in (False, True):
+            package = 'via_bench_warmup_{0}'.format(int(warm))
+            generate(path, package, args.modules, args.size)
+            results = run(package, args.modules, args.workers, warm)
+            print(
+                'warmup={0:<5} first={1:.3f}ms mean={2:.3f}ms '
+                'rss={3}kB private={4}kB'.format(
+                    warm,
+                    sum(r['first'] for r in results) / len(results) * 1000,
+                    sum(r['mean'] for r in results) / len(results) * 1000,
+                    sum(r['rss'] for r in results) // len(results),
+                    sum(r['private'] for r in results) // len(results)))
+    finally:
+        sys.path.remove(path)
+        shutil.rmtree(path)
+
+
+if __name__ == '__main__':
+    main()
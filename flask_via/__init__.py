@@ -5,8 +5,37 @@ flask_via
 ---------
 """
 
+import sys
+import time
+import warnings
+
+from flask_via import (
+    attach, build, dispatch, files, metrics, reloader, shared, warmup)
 from flask_via.exceptions import ImproperlyConfigured
+from flask_via.lazy import resolve_views, string_types
+from flask_via.manifest import RouteManifest
+from flask_via.profile import Profiler, describe, profile_endpoints
+from flask_via.table import RouteTable, RouterRule, check_options, prefix
 from importlib import import_module
+from multiprocessing.pool import ThreadPool
+
+
+#: Keyword arguments used internally while compiling routes, these are not
+#: passed on to routers which do not implement ``compile``
+COMPILE_KWARGS = (
+    'blueprint',
+    'include_path',
+    'profiler',
+    'routes_cache',
+    'routes_included',
+    'routes_modules')
+
+#: Keyword arguments ``Include`` and ``Blueprint`` routers pass on to every
+#: route they include, changing how its view is run
+VIEW_OPTIONS = (
+    'cache',
+    'executor',
+    'limit')
 
 
 class RoutesImporter(object):
@@ -16,14 +45,21 @@ class RoutesImporter(object):
     .. versionadded:: 2014.05.06
     """
 
+    __slots__ = ()
+
     def include(self, routes_module, routes_name):
         """ Imports a routes module and gets the routes from within that
         module and returns them.
 
+        .. versionchanged:: 2015.2.0
+
+            * ``routes_module`` can be the path of a JSON, TOML or YAML
+              route file, see :mod:`flask_via.files`
+
         Arguments
         ---------
         routes_module : str
-            Python dotted path to routes module
+            Python dotted path to routes module, or route file path
         routes_name : str
             Module attribute name to use when attempted to get the routes
 
@@ -40,6 +76,10 @@ class RoutesImporter(object):
             If routes do not exist in the moduke
         """
 
+        # Route files declare routes rather than define them
+        if files.is_routes_file(routes_module):
+            return files.include(routes_module, routes_name)
+
         # Import the moduke
         module = import_module(routes_module)
 
@@ -48,6 +88,68 @@ class RoutesImporter(object):
 
         return routes
 
+    def prefetch(self, app, routes_module, routes_name, workers):
+        """ Imports a routes module and every routes module reachable from it
+        through ``Include`` and ``Blueprint`` routes, using a pool of threads
+        to import all modules found at the same depth at once. Routes are not
+        loaded, a later :meth:`include` of any found module is then a
+        ``sys.modules`` lookup.
+
+        .. versionadded:: 2015.2.0
+
+        Arguments
+        ---------
+        app : flask.app.Flask
+            Flask application instance
+        routes_module : str
+            Python dotted path to the root routes module
+        routes_name : str
+            Module attribute name to use when attempted to get the routes
+        workers : int
+            Number of import threads
+
+        Returns
+        -------
+        list
+            Python dotted paths of the routes modules found
+        """
+
+        default_name = app.config.get('VIA_ROUTES_NAME', 'routes')
+
+        found = [routes_module]
+        seen = set([(routes_module, routes_name)])
+        level = [(routes_module, routes_name)]
+
+        pool = ThreadPool(workers)
+        try:
+            while level:
+                modules = pool.map(_import, [name for name, _ in level])
+                children = []
+                for module, (_, name) in zip(modules, level):
+                    # Import errors are raised by the registration pass
+                    for route in getattr(module, name, None) or []:
+                        # Deferred blueprints import on first request
+                        if getattr(route, 'deferred', False):
+                            continue
+                        child = getattr(route, 'routes_module', None)
+                        if not isinstance(child, string_types):
+                            continue
+                        child_name = getattr(route, 'routes_name', None)
+                        if not isinstance(child_name, string_types):
+                            child_name = default_name
+                        if (child, child_name) in seen:
+                            continue
+                        seen.add((child, child_name))
+                        children.append((child, child_name))
+                        if child not in found:
+                            found.append(child)
+                level = children
+        finally:
+            pool.close()
+            pool.join()
+
+        return found
+
     def load(self, app, routes, **kwargs):
         """ Loads passed routes onto the application by calling each routes
         ``add_to_app`` method which must be implemented by the route class.
@@ -56,6 +158,268 @@ class RoutesImporter(object):
         for route in routes:
             route.add_to_app(app, **kwargs)
 
+    def compile_routes(self, app, routes, **kwargs):
+        """ Compiles passed routes into a flat list of entries by calling each
+        routes ``compile`` method, the entries can later be registered with
+        :func:`flask_via.table.apply`. Routes which do not implement
+        ``compile`` are kept as :class:`flask_via.table.RouterRule` entries
+        and added to the application when applied.
+
+        .. versionadded:: 2015.2.0
+
+        Arguments
+        ---------
+        app : flask.app.Flask
+            Flask application instance, used for configuration only
+        routes : list
+            List of routes
+        \*\*kwargs
+            Arbitrary keyword arguments passed in to ``init_app``
+
+        Returns
+        -------
+        list
+            List of :mod:`flask_via.table` entries
+        """
+
+        profiler = kwargs.get('profiler')
+
+        entries = []
+        if profiler is None:
+            for route in routes:
+                entries.extend(self.compile_route(app, route, **kwargs))
+            return entries
+
+        for route in routes:
+            node = profiler.push(describe(route), 'router')
+            start = time.time()
+            try:
+                compiled = self.compile_route(app, route, **kwargs)
+            finally:
+                profiler.pop()
+            node.compile_time = time.time() - start
+            node.rules = len(compiled)
+            entries.extend(compiled)
+
+        return entries
+
+    def compile_route(self, app, route, **kwargs):
+        """ Compiles a single route, see :meth:`compile_routes`.
+
+        .. versionadded:: 2015.2.0
+
+        Returns
+        -------
+        list
+            List of :mod:`flask_via.table` entries
+        """
+
+        if compiles(route):
+            return route.compile(app, **kwargs)
+
+        return [self.router_rule(route, **kwargs)]
+
+    def router_rule(self, route, **kwargs):
+        """ Returns the :class:`flask_via.table.RouterRule` adding a route
+        with its ``add_to_app`` when the compiled routes are applied.
+
+        .. versionadded:: 2015.2.0
+
+        Arguments
+        ---------
+        route : flask_via.routers.BaseRouter
+            The route
+        \*\*kwargs
+            Keyword arguments passed in to ``compile``
+
+        Returns
+        -------
+        flask_via.table.RouterRule
+        """
+
+        return RouterRule(
+            route,
+            kwargs.get('blueprint'),
+            dict(
+                (k, v) for k, v in kwargs.items()
+                if k not in COMPILE_KWARGS))
+
+    def compile_module(self, app, routes_module, routes_name, **kwargs):
+        """ Includes a routes module and compiles its routes, see
+        :meth:`include` and :meth:`compile_routes`. If a ``routes_modules``
+        list is passed in ``kwargs`` the routes module is appended to it.
+
+        If a ``routes_cache`` dict is passed in ``kwargs`` each routes module
+        is compiled once without prefixes and stored in the cache, later
+        includes of the same module only prefix the cached entries.
+
+        .. versionadded:: 2015.2.0
+
+        Returns
+        -------
+        list
+            List of compiled entries
+
+        Raises
+        ------
+        ImproperlyConfigured
+            If the routes module includes itself
+        """
+
+        kwargs['include_path'] = self.trace(
+            routes_module,
+            routes_name,
+            **kwargs)
+
+        profiler = kwargs.get('profiler')
+        if profiler is None:
+            return self._compile_module(
+                app,
+                routes_module,
+                routes_name,
+                **kwargs)
+
+        node = profiler.push(
+            '{0}:{1}'.format(routes_module, routes_name),
+            'include')
+        node.cached = cache_key(routes_module, routes_name, **kwargs) in (
+            kwargs.get('routes_cache') or {})
+
+        start = time.time()
+        try:
+            entries = self._compile_module(
+                app,
+                routes_module,
+                routes_name,
+                **kwargs)
+        finally:
+            profiler.pop()
+        node.compile_time = time.time() - start - node.import_time
+        node.rules = len(entries)
+
+        return entries
+
+    def _compile_module(self, app, routes_module, routes_name, **kwargs):
+        """ Compiles a routes module for :meth:`compile_module` once the
+        include path has been traced.
+        """
+
+        cache = kwargs.get('routes_cache')
+        if cache is None:
+            routes = self.import_routes(routes_module, routes_name, **kwargs)
+            return self.compile_routes(app, routes, **kwargs)
+
+        key = cache_key(routes_module, routes_name, **kwargs)
+        try:
+            entries = cache[key]
+        except KeyError:
+            routes = self.import_routes(routes_module, routes_name, **kwargs)
+
+            # Compile without prefixes so the entries can be reused
+            relative = dict(
+                (k, v) for k, v in kwargs.items()
+                if k not in ('url_prefix', 'endpoint', 'blueprint'))
+            entries = self.compile_routes(app, routes, **relative)
+            cache[key] = entries
+
+        return prefix(
+            entries,
+            kwargs.get('url_prefix'),
+            kwargs.get('endpoint'),
+            kwargs.get('blueprint'))
+
+    def import_routes(self, routes_module, routes_name, **kwargs):
+        """ Includes and tracks a routes module, see :meth:`include` and
+        :meth:`track`. If a ``profiler`` is passed in ``kwargs`` the import
+        time is recorded on its current node, if a ``routes_included`` list
+        is passed the routes module and name are appended to it.
+
+        .. versionadded:: 2015.2.0
+
+        Returns
+        -------
+        list
+            List of routes in the module
+        """
+
+        profiler = kwargs.get('profiler')
+        if profiler is None:
+            routes = self.include(routes_module, routes_name)
+        else:
+            start = time.time()
+            routes = self.include(routes_module, routes_name)
+            profiler.stack[-1].import_time = time.time() - start
+
+        self.track(routes_module, **kwargs)
+        if kwargs.get('routes_included') is not None:
+            kwargs['routes_included'].append((routes_module, routes_name))
+
+        return routes
+
+    def track(self, routes_module, **kwargs):
+        """ Appends the routes module to the ``routes_modules`` list in
+        ``kwargs`` if present.
+        """
+
+        if kwargs.get('routes_modules') is not None:
+            kwargs['routes_modules'].append(routes_module)
+
+    def release(self, included):
+        """ Deletes included routes from their routes modules, so the
+        routers are freed once registered rather than kept for the life of
+        the process. Routes released cannot be included again.
+
+        .. versionadded:: 2015.2.0
+
+        Arguments
+        ---------
+        included : iterable
+            ``(routes_module, routes_name)`` pairs, see
+            :attr:`flask_via.table.RouteTable.included`
+        """
+
+        for routes_module, routes_name in set(included):
+            module = sys.modules.get(routes_module)
+            if module is not None and hasattr(module, routes_name):
+                delattr(module, routes_name)
+
+    def trace(self, routes_module, routes_name, **kwargs):
+        """ Returns the chain of included routes modules in ``kwargs``,
+        ``include_path``, with this routes module added. Routers including
+        other routes modules pass this on so include cycles can be detected
+        rather than recursing forever.
+
+        .. versionadded:: 2015.2.0
+
+        Arguments
+        ---------
+        routes_module : str
+            Python dotted path to routes module
+        routes_name : str
+            Module attribute name to use when attempted to get the routes
+        \*\*kwargs
+            Arbitrary keyword arguments passed in to ``init_app``
+
+        Returns
+        -------
+        tuple
+            The include path
+
+        Raises
+        ------
+        ImproperlyConfigured
+            If the routes module is already in the include path
+        """
+
+        path = kwargs.get('include_path', ()) + ((routes_module, routes_name),)
+
+        if path[-1] in path[:-1]:
+            raise ImproperlyConfigured(
+                'Include cycle detected: {0}'.format(' -> '.join(
+                    '{0}:{1}'.format(*i) for i in path)))
+
+        return path
+
 
 class Via(RoutesImporter):
     """ Flask-VIa integration into Flask applications. Flask-Via can
@@ -150,6 +514,36 @@ class Via(RoutesImporter):
 
             * Improved ``init_app`` method
 
+        .. versionchanged:: 2015.2.0
+
+            * Routes are compiled with :meth:`compile` and then registered
+              in one step
+            * Routes are loaded from ``VIA_ROUTES_MANIFEST`` when configured
+            * Lazy views are imported when ``VIA_RESOLVE_VIEWS`` is set
+            * Routes modules are imported concurrently when
+              ``VIA_IMPORT_WORKERS`` is set
+            * Registration is profiled when ``VIA_PROFILE`` is set, see
+              :class:`flask_via.profile.Profiler`
+            * Requests are matched with :class:`flask_via.dispatch.ViaMap`
+              when ``VIA_PREFIX_DISPATCH`` or ``VIA_STATIC_DISPATCH`` is set
+            * Url builders are compiled when ``VIA_URL_BUILDERS`` is set, see
+              :func:`flask_via.build.install`
+            * Endpoint latency is measured when ``VIA_METRICS`` is set, see
+              :class:`flask_via.metrics.Metrics`
+            * Endpoints matching ``VIA_PROFILE_ENDPOINTS`` are profiled, see
+              :func:`flask_via.profile.profile_endpoints`
+            * Routes are deleted from their modules once registered when
+              ``VIA_RELEASE_ROUTES`` is set, see :meth:`release`
+            * Routes are read from ``VIA_ROUTES_FILE`` when configured, see
+              :mod:`flask_via.files`
+            * Changed routes modules are reloaded when ``VIA_RELOAD`` is set,
+              see :class:`flask_via.reloader.Reloader`
+            * Routes are compiled once for every application when
+              ``VIA_SHARED_ROUTES`` is set, see
+              :class:`flask_via.shared.SharedTable`
+            * Executors and limits named by routes must be configured in
+              ``VIA_EXECUTORS`` and ``VIA_LIMITS``
+
         Arguments
         ---------
         app : flask.app.Flask
@@ -169,23 +563,381 @@ class Via(RoutesImporter):
         Raises
         ------
         ImproperlyConfigured
-            If ``VIA_ROUTES_MODULE`` is not configured in appluication config
-            and ``route_module`` keyword argument has not been provided.
+            If neither ``VIA_ROUTES_MODULE`` nor ``VIA_ROUTES_FILE`` is
+            configured in appluication config and ``route_module`` keyword
+            argument has not been provided, or a route names an executor or
+            limit which is not configured.
         """
 
         app.config.setdefault('VIA_ROUTES_MODULE', routes_module)
         app.config.setdefault('VIA_ROUTES_NAME', routes_name or 'routes')
 
-        if not app.config['VIA_ROUTES_MODULE']:
+        routes_module = (
+            app.config.get('VIA_ROUTES_FILE') or
+            app.config['VIA_ROUTES_MODULE'])
+
+        if not routes_module:
             raise ImproperlyConfigured(
                 'VIA_ROUTES_MODULE is not defined in application '
                 'configuration.')
 
-        routes_module = app.config['VIA_ROUTES_MODULE']
         routes_name = app.config['VIA_ROUTES_NAME']
 
-        # Get the routes
-        routes = self.include(routes_module, routes_name)
+        profiler = None
+        if app.config.get('VIA_PROFILE'):
+            profiler = Profiler()
+            kwargs['profiler'] = profiler
+
+        # Endpoints registered by others are not measured
+        existing = set(app.view_functions)
+
+        # Compile the routes tree and register it in one step
+        if app.config.get('VIA_SHARED_ROUTES'):
+            table = shared.shared_table(
+                self,
+                app,
+                routes_module,
+                routes_name,
+                **kwargs)
+        else:
+            table = self.compile(app, routes_module, routes_name, **kwargs)
+
+        # Fail now on executors and limits VIA_EXECUTORS and VIA_LIMITS lack
+        check_options(app, table.entries)
+
+        if profiler is None:
+            table.apply(app)
+        else:
+            timings = []
+            table.apply(app, timings)
+            profiler.record_apply(timings)
+            app.extensions.setdefault('via', {})['profile'] = profiler
+            app.logger.debug(
+                'Route registration profile:\n%s',
+                profiler.report())
+
+        # Free the routers now their routes are registered
+        if app.config.get('VIA_RELEASE_ROUTES'):
+            self.release(table.included)
+
+        # Import lazy views now rather than on first request
+        if app.config.get('VIA_RESOLVE_VIEWS'):
+            resolve_views(app)
+
+        # Match requests only against rules under their url prefix
+        if app.config.get('VIA_PREFIX_DISPATCH'):
+            dispatch.install(app, static=False)
+
+        # Look up requests for rules without converters
+        if app.config.get('VIA_STATIC_DISPATCH'):
+            dispatch.install(app, prefix=False)
+
+        # Compile a url builder per endpoint for templates
+        if app.config.get('VIA_URL_BUILDERS'):
+            build.install(app)
+
+        # Wrap the views registered with latency histograms
+        if app.config.get('VIA_METRICS'):
+            metrics.install(app, existing)
+
+        # Profile the views of selected endpoints for a number of requests
+        if app.config.get('VIA_PROFILE_ENDPOINTS'):
+            profile_endpoints(app)
+
+        # Register changes to routes modules while the application runs
+        if app.config.get('VIA_RELOAD'):
+            reloader.install(
+                self,
+                app,
+                table,
+                routes_module,
+                routes_name,
+                **kwargs)
+
+    def attach(
+            self,
+            app,
+            name,
+            routes,
+            url_prefix=None,
+            subdomain=None,
+            endpoint=None,
+            **kwargs):
+        """ Attaches routes to an application which may already be serving
+        requests, or replaces the routes attached under ``name``, see
+        :class:`flask_via.attach.Attachment`. Attaching costs the same
+        whatever the number of routes the application already has.
+
+        .. versionadded:: 2015.2.0
+
+        Example
+        -------
+        .. sourcecode:: python
+
+            via.attach(app, 'reports', 'yourapp.reports.routes',
+                       url_prefix='/reports', endpoint='reports')
+            ...
+            via.detach(app, 'reports')
+
+        Arguments
+        ---------
+        app : flask.app.Flask
+            Flask application instance
+        name : str
+            Name to detach the routes by
+        routes : list or str
+            List of routes, or python dotted path to a routes module
+
+        Keyword Arguments
+        -----------------
+        url_prefix : str, optional
+            Url prefix of the routes, defaults to ``None``
+        subdomain : str, optional
+            Subdomain of the routes, defaults to ``None``
+        endpoint : str, optional
+            Endpoint prefix of the routes, as for ``Include``, defaults to
+            ``None``
+        \*\*kwargs
+            Keyword arguments routers accept from ``Include``, e.g.
+            ``cache``, and ``routes_name``
+
+        Returns
+        -------
+        flask_via.attach.Attachment
+            The attached routes
+
+        Raises
+        ------
+        ImproperlyConfigured
+            If neither ``url_prefix`` nor ``subdomain`` is given, or the
+            routes include blueprints or routers which do not implement
+            ``compile``
+        """
+
+        attached = attach.attachment(app, name, url_prefix, subdomain)
+
+        if url_prefix is not None:
+            kwargs['url_prefix'] = url_prefix
+        if endpoint is not None:
+            kwargs['endpoint'] = endpoint + '.'
+
+        if isinstance(routes, string_types):
+            routes_name = kwargs.pop(
+                'routes_name',
+                None) or app.config.get('VIA_ROUTES_NAME', 'routes')
+            entries = self.compile_module(app, routes, routes_name, **kwargs)
+        else:
+            entries = self.compile_routes(app, routes, **kwargs)
+
+        check_options(app, entries)
+        attached.attach(entries)
+
+        return attached
+
+    def detach(self, app, name):
+        """ Detaches routes attached with :meth:`attach`, requests to them
+        answer ``404`` once detached.
+
+        .. versionadded:: 2015.2.0
+
+        Arguments
+        ---------
+        app : flask.app.Flask
+            Flask application instance
+        name : str
+            Name the routes were attached by
+
+        Raises
+        ------
+        KeyError
+            If no routes were attached by this name
+        """
+
+        app.extensions.get('via', {}).get('attached', {})[name].detach()
+
+    def warmup(self, app, **kwargs):
+        """ Prepares an application to be forked once its routes and other
+        extensions are set up, see :func:`flask_via.warmup.warmup`.
+
+        .. versionadded:: 2015.2.0
+
+        Example
+        -------
+        .. sourcecode:: python
+
+            via = Via()
+            via.init_app(app)
+            via.warmup(app)  # Last, before gunicorn --preload forks
+
+        Arguments
+        ---------
+        app : flask.app.Flask
+            Flask application instance
+        \*\*kwargs
+            Keyword arguments for :func:`flask_via.warmup.warmup`
+
+        Returns
+        -------
+        dict
+            Seconds taken by each step
+        """
+
+        return warmup.warmup(app, **kwargs)
+
+    def compile(self, app, routes_module, routes_name='routes', **kwargs):
+        """ Compiles a routes tree into a :class:`flask_via.table.RouteTable`
+        without registering anything with the application. If
+        ``VIA_ROUTES_MANIFEST`` is configured the table is read from the
+        manifest, or the manifest is written if missing or stale.
+
+        .. versionadded:: 2015.2.0
+
+        Arguments
+        ---------
+        app : flask.app.Flask
+            Flask application instance, used for configuration only
+        routes_module : str
+            Python dotted path to the root routes module
+
+        Keyword Arguments
+        -----------------
+        routes_name : str, optional
+            Name of the variable holding the routes in the module, defaults
+            to ``routes``
+        profiler : flask_via.profile.Profiler, optional
+            Records the time spent compiling each routes module and router,
+            defaults to ``None``
+        \*\*kwargs
+            Arbitrary keyword arguments passed in to ``init_app``
+
+        Returns
+        -------
+        flask_via.table.RouteTable
+            The compiled routes
+        """
+
+        # The profiler is not part of the manifest key
+        profiler = kwargs.pop('profiler', None)
+        start = time.time()
+
+        manifest = None
+        if app.config.get('VIA_ROUTES_MANIFEST'):
+            manifest = RouteManifest(app.config['VIA_ROUTES_MANIFEST'])
+            key = manifest.key(routes_module, routes_name, **kwargs)
+
+            entries = manifest.load(key)
+            if entries is not None:
+                if profiler is not None:
+                    node = profiler.push(manifest.path, 'manifest')
+                    profiler.pop()
+                    node.compile_time = time.time() - start
+                    node.rules = profiler.root.rules = len(entries)
+                    profiler.root.compile_time = node.compile_time
+                return RouteTable(entries, modules=manifest.modules)
+
+        self.prefetch_routes(app, routes_module, routes_name)
+
+        if profiler is not None:
+            # Time spent before the walk, importing with VIA_IMPORT_WORKERS
+            profiler.root.import_time = time.time() - start
+            kwargs['profiler'] = profiler
+
+        modules = []
+        included = []
+        entries = self.compile_module(
+            app,
+            routes_module,
+            routes_name,
+            routes_modules=modules,
+            routes_included=included,
+            routes_cache={},
+            **kwargs)
+
+        if profiler is not None:
+            del kwargs['profiler']
+            profiler.root.compile_time = (
+                time.time() - start - profiler.root.import_time)
+            profiler.root.rules = len(entries)
+
+        if manifest is not None and not manifest.dump(entries, modules, key):
+            warnings.warn(
+                'Routes in {0} cannot be stored in VIA_ROUTES_MANIFEST, '
+                'routers must implement compile, views must be importable '
+                'by path and routes modules must have a source '
+                'file.'.format(routes_module),
+                RuntimeWarning)
+
+        return RouteTable(entries, included)
+
+    def prefetch_routes(self, app, routes_module, routes_name):
+        """ Imports the routes tree concurrently with
+        :meth:`RoutesImporter.prefetch` when ``VIA_IMPORT_WORKERS`` is set,
+        the time taken is logged at debug level.
+
+        .. versionadded:: 2015.2.0
+
+        Arguments
+        ---------
+        app : flask.app.Flask
+            Flask application instance
+        routes_module : str
+            Python dotted path to the root routes module
+        routes_name : str
+            Name of the variable holding the routes in the module
+        """
+
+        workers = app.config.get('VIA_IMPORT_WORKERS')
+        if not workers:
+            return
+
+        start = time.time()
+        modules = self.prefetch(app, routes_module, routes_name, workers)
+
+        app.logger.debug(
+            'Imported %d routes modules with %d workers in %.3fs',
+            len(modules),
+            workers,
+            time.time() - start)
+
+
+def compiles(route):
+    """ Returns whether a route implements ``compile``, routers which only
+    implement ``add_to_app`` inherit the ``compile`` of
+    :class:`flask_via.routers.BaseRouter`.
+    """
+
+    # The routers package imports this module
+    from flask_via.routers import BaseRouter
+
+    method = getattr(type(route), 'compile', None)
+    if method is None:
+        return False
+
+    return getattr(method, '__func__', method) is not getattr(
+        BaseRouter.compile,
+        '__func__',
+        BaseRouter.compile)
+
+
+def _import(name):
+    """ Imports a module for :meth:`RoutesImporter.prefetch`, returning
+    ``None`` on failure.
+    """
+
+    try:
+        return import_module(name)
+    except Exception:
+        return None
+
+
+def cache_key(routes_module, routes_name, **kwargs):
+    """ Returns the ``routes_cache`` key for a routes module, modules
+    included with view options, see ``VIEW_OPTIONS``, are compiled
+    separately as their views are wrapped.
+    """
+
+    options = tuple(kwargs.get(name) for name in VIEW_OPTIONS)
+    if all(option is None for option in options):
+        return (routes_module, routes_name)
 
-        # Load the routes
-        self.load(app, routes, **kwargs)
+    return (routes_module, routes_name) + options
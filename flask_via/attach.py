@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+
+"""
+flask_via.attach
+----------------
+
+Attaches routes to, and detaches them from, an application which is already
+serving requests. Flask cannot remove url rules and adding one re-sorts every
+rule of the url map, so attached routes are matched against a url map of
+their own, reached through placeholder rules reserving their url prefix.
+"""
+
+import threading
+
+from flask import Flask, request
+from flask_via.deferred import METHODS, setup
+from flask_via.exceptions import ImproperlyConfigured
+from flask_via.table import Rule, apply
+from werkzeug.exceptions import HTTPException, NotFound
+from werkzeug.routing import Map
+
+#: Request environ key of the views a request was matched against
+ENVIRON_KEY = 'flask_via.attached'
+
+
+class Attachment(object):
+    """ Routes attached to an application under a url prefix or subdomain.
+    The first attachment of a name adds placeholder rules for its url prefix
+    to the application, requests matching them are matched again against
+    the attached routes by a url value preprocessor, before
+    ``before_request`` functions run, so ``request.url_rule``,
+    ``request.endpoint`` and ``request.view_args`` are those of the attached
+    route, and dispatched to its view.
+
+    The attached url map and views are replaced together in one assignment,
+    so requests in flight finish with the routes they were matched against.
+    Attaching and detaching costs the same whatever the size of the
+    application's url map, detached attachments keep their placeholders and
+    answer ``404``.
+
+    Attachments are stored in ``app.extensions['via']['attached']`` by name,
+    see :meth:`flask_via.Via.attach`.
+
+    .. versionadded:: 2015.2.0
+    """
+
+    def __init__(self, app, name, url_prefix=None, subdomain=None):
+        """ Constructor, adds the placeholder rules to the application.
+
+        Arguments
+        ---------
+        app : flask.app.Flask
+            Flask application instance
+        name : str
+            Attachment name
+
+        Keyword Arguments
+        -----------------
+        url_prefix : str, optional
+            Url prefix to reserve, defaults to ``None``
+        subdomain : str, optional
+            Subdomain to reserve, defaults to ``None``
+
+        Raises
+        ------
+        ImproperlyConfigured
+            If neither ``url_prefix`` nor ``subdomain`` is given, the
+            attachment would reserve every url of the application
+        """
+
+        if not url_prefix and not subdomain:
+            raise ImproperlyConfigured(
+                'Attached routes {0} require a url_prefix or '
+                'subdomain.'.format(name))
+
+        self.app = app
+        self.name = name
+        self.endpoint = 'via_attached.{0}'.format(name)
+        self.url_prefix = url_prefix
+        self.subdomain = subdomain
+        self.routes = None
+        self.lock = threading.Lock()
+
+        url_prefix = (url_prefix or '').rstrip('/')
+        with setup(app):
+            for url in (url_prefix or '/', url_prefix + '/<path:path>'):
+                app.add_url_rule(
+                    url,
+                    self.endpoint,
+                    self.dispatch,
+                    methods=METHODS,
+                    subdomain=subdomain,
+                    strict_slashes=False)
+
+        # Runs before url value preprocessors registered earlier
+        app.url_value_preprocessors.setdefault(None, []).insert(
+            0,
+            self.match)
+
+        extension = app.extensions.setdefault('via', {})
+        extension.setdefault('attached', {})[name] = self
+
+    def attach(self, entries):
+        """ Replaces the attached routes.
+
+        Arguments
+        ---------
+        entries : list
+            List of :class:`flask_via.table.Rule` entries
+
+        Raises
+        ------
+        ImproperlyConfigured
+            If entries are not url rules of the application, blueprints
+            and routers which do not implement ``compile`` cannot be
+            attached, or if an endpoint of the entries already exists in
+            the application outside this attachment
+        """
+
+        if not all(
+                isinstance(e, Rule) and e.blueprint is None
+                for e in entries):
+            raise ImproperlyConfigured(
+                'Routes attached as {0} must be compiled url rules, '
+                'blueprints cannot be attached.'.format(self.name))
+
+        # Flask works out methods and endpoints of the rules
+        scratch = Flask(self.app.import_name, static_folder=None)
+        scratch.url_map = url_map(self.app.url_map, self.subdomain)
+        apply(scratch, entries)
+        # Flask would answer OPTIONS with the methods of the placeholder
+        # rules, dispatch answers with those of the attached rule instead
+        for rule in scratch.url_map.iter_rules():
+            rule.attached_options = rule.provide_automatic_options
+            rule.provide_automatic_options = False
+        routes = (scratch.url_map, scratch.view_functions)
+
+        with self.lock:
+            self.check(routes)
+            previous, self.routes = self.routes, routes
+            # Endpoints attached again keep their view throughout
+            self.link(routes)
+            self.unlink(previous)
+
+    def detach(self):
+        """ Detaches the routes, requests to them answer ``404``.
+        """
+
+        with self.lock:
+            previous, self.routes = self.routes, None
+            self.unlink(previous)
+
+    def check(self, routes):
+        """ Raises ``ImproperlyConfigured`` if an endpoint of the routes
+        to attach is an endpoint of the application, or of other attached
+        routes, rather than of the routes attached now.
+        """
+
+        attached = {}
+        if self.routes is not None:
+            attached = self.routes[0]._rules_by_endpoint
+
+        for endpoint in routes[0]._rules_by_endpoint:
+            if endpoint in attached:
+                continue
+            if (endpoint in self.app.url_map._rules_by_endpoint or
+                    endpoint in self.app.view_functions):
+                raise ImproperlyConfigured(
+                    'Routes attached as {0} use the endpoint {1} which '
+                    'already exists.'.format(self.name, endpoint))
+
+    def link(self, routes):
+        """ Makes the endpoints of attached routes buildable with
+        ``url_for`` and dispatches them through :meth:`dispatch`.
+        """
+
+        by_endpoint = self.app.url_map._rules_by_endpoint
+        builders = self.builders()
+        for endpoint, rules in routes[0]._rules_by_endpoint.items():
+            by_endpoint[endpoint] = rules
+            self.app.view_functions[endpoint] = self.dispatch
+            builders.pop(endpoint, None)
+
+    def unlink(self, routes):
+        """ Removes the endpoints of detached routes from the application.
+        """
+
+        if routes is None:
+            return
+
+        by_endpoint = self.app.url_map._rules_by_endpoint
+        builders = self.builders()
+        for endpoint, rules in routes[0]._rules_by_endpoint.items():
+            if by_endpoint.get(endpoint) is rules:
+                del by_endpoint[endpoint]
+                self.app.view_functions.pop(endpoint, None)
+            builders.pop(endpoint, None)
+
+    def builders(self):
+        """ Returns the ``VIA_URL_BUILDERS`` builders by endpoint, urls to
+        attached endpoints are built by Flask.
+        """
+
+        builders = self.app.extensions['via'].get('builders')
+        if builders is None:
+            return {}
+
+        return builders.builders
+
+    def match(self, endpoint, values):
+        """ Url value preprocessor, matches requests to the placeholder
+        rules against the attached routes and binds the rule matched to
+        the request. Requests matching no attached route are answered with
+        the routing exception once ``before_request`` functions ran, as
+        Flask does for the urls of the application.
+        """
+
+        if endpoint != self.endpoint:
+            return
+
+        request.url_rule = request.view_args = None
+        routes = self.routes
+        if routes is None:
+            request.routing_exception = NotFound()
+            return
+        attached, views = routes
+
+        adapter = attached.bind_to_environ(
+            request.environ,
+            server_name=self.app.config['SERVER_NAME'])
+        try:
+            request.url_rule, request.view_args = adapter.match(
+                return_rule=True)
+        except HTTPException as e:
+            request.routing_exception = e
+            return
+
+        request.environ[ENVIRON_KEY] = (views, adapter)
+
+    def dispatch(self, **kwargs):
+        """ View of the attached endpoints, dispatches the request to the
+        view of the attached routes it was matched against.
+        """
+
+        views, adapter = request.environ[ENVIRON_KEY]
+        rule = request.url_rule
+        if rule.attached_options and request.method == 'OPTIONS':
+            response = self.app.response_class()
+            response.allow.update(adapter.allowed_methods())
+            return response
+
+        return views[rule.endpoint](**kwargs)
+
+
+def url_map(original, subdomain=None):
+    """ Returns an empty url map configured as another, rules are matched
+    under ``subdomain`` if given.
+    """
+
+    return Map(
+        default_subdomain=subdomain or original.default_subdomain,
+        charset=original.charset,
+        strict_slashes=original.strict_slashes,
+        redirect_defaults=original.redirect_defaults,
+        converters=original.converters,
+        sort_parameters=original.sort_parameters,
+        sort_key=original.sort_key,
+        encoding_errors=original.encoding_errors,
+        host_matching=original.host_matching)
+
+
+def attachment(app, name, url_prefix=None, subdomain=None):
+    """ Returns the attachment of a name, created on first use.
+
+    .. versionadded:: 2015.2.0
+
+    Raises
+    ------
+    ImproperlyConfigured
+        If the name is attached under another url prefix or subdomain
+    """
+
+    attached = app.extensions.get('via', {}).get('attached', {})
+    try:
+        found = attached[name]
+    except KeyError:
+        return Attachment(app, name, url_prefix, subdomain)
+
+    if (found.url_prefix, found.subdomain) != (url_prefix, subdomain):
+        raise ImproperlyConfigured(
+            'Routes {0} are attached under {1}, not {2}.'.format(
+                name,
+                found.url_prefix or found.subdomain,
+                url_prefix or subdomain))
+
+    return found
@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+
+"""
+flask_via.build
+---------------
+
+Precompiled url builders. :func:`flask.url_for` resolves the url adapter,
+looks up every rule of the endpoint and checks each is suitable on every
+call. Here one builder is compiled per endpoint, :func:`url_for` goes
+straight to it and :func:`url_for_many` builds many urls for an endpoint
+resolving the request context only once.
+
+Anything a builder cannot handle, such as ``_external``, ``_anchor``,
+endpoints with several rules or host matching, is passed on to
+:func:`flask.url_for` so urls are always the same.
+"""
+
+from flask import url_for as flask_url_for
+from flask.globals import _request_ctx_stack
+from flask_via.dispatch import stale
+
+
+#: Values :func:`flask.url_for` handles itself
+FLASK_VALUES = frozenset(('_external', '_anchor', '_method', '_scheme'))
+
+
+class URLBuilder(object):
+    """ Builds urls for an endpoint with a single url rule.
+
+    .. versionadded:: 2015.2.0
+    """
+
+    __slots__ = ('rule', 'arguments', 'defaults')
+
+    def __init__(self, rule):
+        """ Constructor.
+
+        Arguments
+        ---------
+        rule : werkzeug.routing.Rule
+            The only url rule of the endpoint
+        """
+
+        defaults = rule.defaults or {}
+
+        self.rule = rule
+        self.arguments = tuple(a for a in rule.arguments if a not in defaults)
+        self.defaults = tuple(defaults.items())
+
+    def build(self, values):
+        """ Builds the subdomain and path of a url, the same as
+        :meth:`werkzeug.routing.MapAdapter.build` would.
+
+        Arguments
+        ---------
+        values : dict
+            Url values without ``None`` values, values the rule does not use
+            are added to the query string
+
+        Returns
+        -------
+        tuple
+            ``(subdomain, path)`` or ``None`` if the rule is not suitable
+            for the values
+        """
+
+        for name in self.arguments:
+            if name not in values:
+                return None
+
+        for name, value in self.defaults:
+            if name in values and values[name] != value:
+                return None
+
+        return self.rule.build(values)
+
+
+class URLBuilders(object):
+    """ The :class:`URLBuilder` of every endpoint of an application with a
+    single url rule, compiled again whenever rules are added or removed.
+
+    .. versionadded:: 2015.2.0
+    """
+
+    def __init__(self, url_map):
+        """ Constructor, compiles the builders.
+
+        Arguments
+        ---------
+        url_map : werkzeug.routing.Map
+            The application url map
+        """
+
+        self.url_map = url_map
+        self.compile()
+
+    def compile(self):
+        """ Compiles a builder for each endpoint of the url map.
+        """
+
+        url_map = self.url_map
+        url_map.update()
+
+        self.rules = url_map._rules
+        self.size = len(url_map._rules)
+        self.builders = {}
+
+        # Werkzeug builds urls for other hosts as external urls
+        if url_map.host_matching:
+            return
+
+        for endpoint, rules in url_map._rules_by_endpoint.items():
+            if len(rules) == 1:
+                self.builders[endpoint] = URLBuilder(rules[0])
+
+    def get(self, endpoint):
+        """ Returns the builder for an endpoint, ``None`` if the endpoint
+        has no builder.
+        """
+
+        url_map = self.url_map
+        if url_map._remap or stale(self, url_map._rules):
+            self.compile()
+
+        return self.builders.get(endpoint)
+
+
+class Context(object):
+    """ What building urls for an endpoint needs from the request context,
+    see :func:`context`.
+    """
+
+    __slots__ = ('app', 'endpoint', 'builder', 'script_name', 'subdomain')
+
+    def __init__(self, app, endpoint, builder, adapter):
+        self.app = app
+        self.endpoint = endpoint
+        self.builder = builder
+        self.script_name = adapter.script_name.rstrip('/')
+        self.subdomain = adapter.subdomain
+
+    def build(self, values):
+        """ Returns the url for ``values`` or ``None`` to build it with
+        :func:`flask.url_for`.
+        """
+
+        if not FLASK_VALUES.isdisjoint(values):
+            return None
+
+        if self.app.url_default_functions:
+            values = dict(values)
+            self.app.inject_url_defaults(self.endpoint, values)
+
+        # Werkzeug drops None values
+        if None in values.values():
+            values = dict(i for i in values.items() if i[1] is not None)
+
+        rv = self.builder.build(values)
+        if rv is None or rv[0] != self.subdomain:
+            return None
+
+        return '{0}/{1}'.format(self.script_name, rv[1].lstrip('/'))
+
+
+def context(endpoint):
+    """ Returns a :class:`Context` for building urls to an endpoint in the
+    current request, ``None`` if urls must be built by
+    :func:`flask.url_for`.
+
+    .. versionadded:: 2015.2.0
+    """
+
+    reqctx = _request_ctx_stack.top
+    if reqctx is None or reqctx.url_adapter is None:
+        return None
+
+    app = reqctx.app
+    try:
+        builders = app.extensions['via']['builders']
+    except KeyError:
+        return None
+
+    request = reqctx.request
+    if getattr(request, '_is_old_module', False):
+        return None
+
+    if endpoint[:1] == '.':
+        if request.blueprint is not None:
+            endpoint = request.blueprint + endpoint
+        else:
+            endpoint = endpoint[1:]
+
+    builder = builders.get(endpoint)
+    if builder is None:
+        return None
+
+    return Context(app, endpoint, builder, reqctx.url_adapter)
+
+
+def url_for(endpoint, **values):
+    """ Generates a url to an endpoint, the same as :func:`flask.url_for`
+    though faster for endpoints with a precompiled builder, see
+    :func:`install`.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    endpoint : str
+        The endpoint of the url, may start with ``.`` for an endpoint of the
+        current blueprint
+    \*\*values
+        Url values, the same as :func:`flask.url_for`
+
+    Returns
+    -------
+    str
+        The url
+    """
+
+    ctx = context(endpoint)
+    if ctx is not None:
+        rv = ctx.build(values)
+        if rv is not None:
+            return rv
+        endpoint = ctx.endpoint
+
+    return flask_url_for(endpoint, **values)
+
+
+def url_for_many(endpoint, items, **values):
+    """ Generates urls to an endpoint for many sets of values, for example
+    the links of a listing page.
+
+    .. versionadded:: 2015.2.0
+
+    Example
+    -------
+    .. sourcecode:: python
+
+        urls = url_for_many('users.show', [{'id': u.id} for u in users])
+
+    Arguments
+    ---------
+    endpoint : str
+        The endpoint of the urls
+    items : list
+        Url values for each url
+    \*\*values
+        Url values shared by every url, values in ``items`` take precedence
+
+    Returns
+    -------
+    list
+        The urls in the order of ``items``
+    """
+
+    ctx = context(endpoint)
+    if ctx is not None:
+        endpoint = ctx.endpoint
+
+    urls = []
+    for item in items:
+        if values:
+            item = dict(item)
+            for key, value in values.items():
+                item.setdefault(key, value)
+
+        rv = ctx.build(item) if ctx is not None else None
+        if rv is None:
+            rv = flask_url_for(endpoint, **item)
+
+        urls.append(rv)
+
+    return urls
+
+
+def install(app):
+    """ Compiles url builders for an application and makes :func:`url_for`
+    and :func:`url_for_many` available to its templates, replacing Flask's
+    ``url_for``. Rules added later are compiled on their first use.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    app : flask.app.Flask
+        Flask application instance
+
+    Returns
+    -------
+    URLBuilders
+        The builders of the application
+    """
+
+    extension = app.extensions.setdefault('via', {})
+
+    builders = extension.get('builders')
+    if builders is None:
+        builders = extension['builders'] = URLBuilders(app.url_map)
+    else:
+        builders.compile()
+
+    app.jinja_env.globals.update(url_for=url_for, url_for_many=url_for_many)
+
+    return builders
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+
+"""
+flask_via.cache
+---------------
+
+An in process response cache for read heavy views, given to ``Functional``
+and ``Pluggable`` routers or to ``Include`` and ``Blueprint`` routers to cache
+every route they include.
+"""
+
+import threading
+import time
+
+from collections import OrderedDict
+from flask import current_app, request
+from flask_via.wrappers import update_view
+
+
+class ResponseCache(object):
+    """ A bounded least recently used cache of responses which expire after
+    ``ttl`` seconds. Responses are keyed by application, host, script root,
+    endpoint, view arguments, query parameters and the request headers named
+    in the ``Vary`` header of the response, so applications built from the
+    same routes module never serve each other's responses.
+
+    Only ``GET`` and ``HEAD`` requests are cached, and only ``200`` responses
+    which do not set cookies, are not streamed and do not send
+    ``Cache-Control: no-store`` or ``private`` or ``Vary: *``.
+
+    .. versionadded:: 2015.2.0
+
+    Example
+    -------
+    .. sourcecode:: python
+
+        from flask.ext.via.cache import ResponseCache
+        from flask.ext.via.routers import default, Include
+
+        cache = ResponseCache(maxsize=512, ttl=30, query=['page'])
+
+        routes = [
+            default.Functional('/', 'yourapp.views.home', cache=cache),
+            Include('yourapp.reports.routes', url_prefix='/reports',
+                    cache=cache),
+        ]
+
+    Attributes
+    ----------
+    hits : int
+        Requests served from the cache
+    misses : int
+        Cacheable requests not found in the cache, or found expired
+    evictions : int
+        Responses removed to keep the cache within ``maxsize``
+    """
+
+    #: Methods served from the cache
+    methods = ('GET', 'HEAD')
+
+    def __init__(self, maxsize=1024, ttl=60, query=None, vary=None):
+        """ Constructor.
+
+        Keyword Arguments
+        -----------------
+        maxsize : int, optional
+            Maximum number of responses held, defaults to ``1024``
+        ttl : int, optional
+            Seconds a response is served from the cache, defaults to ``60``
+        query : list, optional
+            Query parameters which are part of the key, by default the whole
+            query string is
+        vary : list, optional
+            Request headers which are always part of the key, in addition to
+            those the response ``Vary`` header names, defaults to ``None``
+        """
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.query = tuple(query) if query is not None else None
+        self.vary = tuple(h.lower() for h in vary or ())
+        self.entries = OrderedDict()
+        self.varies = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __call__(self, view):
+        """ Returns ``view`` wrapped to serve responses from the cache.
+
+        Arguments
+        ---------
+        view : function
+            The view function
+
+        Returns
+        -------
+        function
+            The cached view
+        """
+
+        def cached(*args, **kwargs):
+            if request.method not in self.methods:
+                return view(*args, **kwargs)
+
+            key = self.key(kwargs)
+            response = self.get(key)
+            if response is not None:
+                return response
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if self.cacheable(response):
+                self.set(response, kwargs)
+
+            return response
+
+        return update_view(cached, view, response_cache=self)
+
+    def key(self, view_args, vary=None):
+        """ Returns the cache key of the current request.
+
+        Arguments
+        ---------
+        view_args : dict
+            Arguments passed to the view
+
+        Keyword Arguments
+        -----------------
+        vary : tuple, optional
+            Request headers to include, defaults to those last seen in the
+            ``Vary`` header of responses for the endpoint
+
+        Returns
+        -------
+        tuple
+            The key
+        """
+
+        if vary is None:
+            vary = self.varies.get(self.scope(), self.vary)
+
+        if self.query is None:
+            query = tuple(sorted(request.args.items(multi=True)))
+        else:
+            query = tuple(
+                (name, tuple(request.args.getlist(name)))
+                for name in self.query)
+
+        return (
+            self.scope(),
+            request.host,
+            request.script_root,
+            tuple(sorted(view_args.items())),
+            query,
+            tuple(request.headers.get(h) for h in vary))
+
+    def scope(self):
+        """ Returns the application and endpoint of the current request.
+        """
+
+        return (id(current_app._get_current_object()), request.endpoint)
+
+    def get(self, key):
+        """ Returns a new response for a cached entry, ``None`` if there is
+        no entry for ``key`` or it has expired.
+        """
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < time.time():
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+            self.hits += 1
+            # Mark as recently used
+            del self.entries[key]
+            self.entries[key] = entry
+
+        expires, data, status, headers = entry
+
+        return current_app.response_class(
+            data,
+            status=status,
+            headers=headers)
+
+    def set(self, response, view_args):
+        """ Stores a copy of a response for the current request, evicting
+        the least recently used responses if the cache is full.
+        """
+
+        vary = tuple(sorted(set(self.vary).union(
+            h.lower() for h in response.vary)))
+        self.varies[self.scope()] = vary
+
+        entry = (
+            time.time() + self.ttl,
+            response.get_data(),
+            response.status_code,
+            list(response.headers))
+        key = self.key(view_args, vary)
+
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = entry
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def cacheable(self, response):
+        """ Returns whether a response may be cached.
+        """
+
+        if response.status_code != 200:
+            return False
+
+        if response.is_streamed or response.direct_passthrough:
+            return False
+
+        if 'Set-Cookie' in response.headers:
+            return False
+
+        if '*' in response.vary:
+            return False
+
+        control = response.cache_control
+        return not (control.no_store or control.private)
+
+    def clear(self):
+        """ Removes every response from the cache.
+        """
+
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        """ Returns the cache counters.
+
+        Returns
+        -------
+        dict
+            ``hits``, ``misses``, ``evictions`` and ``size``
+        """
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self.entries),
+        }
+
+
+def cached(view, cache):
+    """ Wraps a view with ``cache``, unwrapping it first if it is already
+    wrapped by another cache.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    view : function
+        The view function
+    cache : ResponseCache
+        The cache, ``None`` or ``False`` to leave ``view`` uncached
+
+    Returns
+    -------
+    function
+        The view
+    """
+
+    view = uncached(view)
+
+    if not cache:
+        return view
+
+    return cache(view)
+
+
+def uncached(view):
+    """ Returns the view wrapped by a :class:`ResponseCache`.
+    """
+
+    if response_cache(view) is not None:
+        return view.__wrapped__
+
+    return view
+
+
+def response_cache(view):
+    """ Returns the :class:`ResponseCache` wrapping a view or ``None``.
+
+    .. versionadded:: 2015.2.0
+    """
+
+    cache = getattr(view, 'response_cache', None)
+    if isinstance(cache, ResponseCache):
+        return cache
+
+    return None
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+"""
+flask_via.coroutines
+--------------------
+
+Runs ``async def`` views, and pluggable views with ``async def`` handlers, on
+an event loop kept by each worker thread and reused across requests. A view
+awaiting several slow services at once, for example with
+``asyncio.gather``, waits only as long as the slowest of them.
+
+Coroutine views require Python 3.5 or later, on earlier versions every view
+is treated as a plain view.
+"""
+
+import inspect
+import os
+import threading
+
+from functools import wraps
+
+try:
+    import asyncio
+except ImportError:  # Python 2
+    asyncio = None
+
+
+#: Methods of pluggable views which may be coroutines
+HANDLERS = (
+    'dispatch_request',
+    'get',
+    'head',
+    'post',
+    'put',
+    'patch',
+    'delete',
+    'options')
+
+#: Holds the event loop of each worker thread
+local = threading.local()
+
+
+def iscoroutinefunction(func):
+    """ Returns whether ``func`` is an ``async def`` function.
+
+    .. versionadded:: 2015.2.0
+    """
+
+    if asyncio is None:
+        return False
+
+    return asyncio.iscoroutinefunction(func)
+
+
+def is_async(view):
+    """ Returns whether a view, or the class of a pluggable view, must be run
+    on an event loop.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    view : function, class
+        A view function, the result of ``as_view`` or a pluggable view class
+
+    Returns
+    -------
+    bool
+    """
+
+    view_class = getattr(view, 'view_class', None)
+    if view_class is None and inspect.isclass(view):
+        view_class = view
+
+    if view_class is None:
+        return iscoroutinefunction(view)
+
+    return any(
+        iscoroutinefunction(getattr(view_class, name, None))
+        for name in HANDLERS)
+
+
+def event_loop():
+    """ Returns the event loop of the current worker thread, created on first
+    use and again in forked processes.
+
+    .. versionadded:: 2015.2.0
+
+    Returns
+    -------
+    asyncio.AbstractEventLoop
+        The event loop
+    """
+
+    loop = getattr(local, 'loop', None)
+    if loop is None or loop.is_closed() or local.pid != os.getpid():
+        loop = asyncio.new_event_loop()
+        local.loop = loop
+        local.pid = os.getpid()
+
+    return loop
+
+
+def sync(view):
+    """ Returns ``view`` wrapped to run the coroutines it returns to
+    completion on the worker thread event loop, see :func:`event_loop`.
+    Views which are not async are returned unchanged.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    view : function
+        A view function or the result of ``as_view``
+
+    Returns
+    -------
+    function
+        The view
+    """
+
+    if unsync(view) is not view or not is_async(view):
+        return view
+
+    @wraps(view)
+    def run(*args, **kwargs):
+        rv = view(*args, **kwargs)
+        if asyncio.iscoroutine(rv):
+            rv = event_loop().run_until_complete(rv)
+        return rv
+
+    run.__wrapped__ = view
+    run.coroutine = True
+
+    return run
+
+
+def unsync(view):
+    """ Returns the view wrapped by :func:`sync`.
+
+    .. versionadded:: 2015.2.0
+    """
+
+    if getattr(view, 'coroutine', None) is True:
+        return view.__wrapped__
+
+    return view
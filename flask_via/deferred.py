@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+
+"""
+flask_via.deferred
+------------------
+
+Defers importing and registering a blueprint's routes until the first request
+under its url prefix or subdomain.
+"""
+
+import threading
+
+from contextlib import contextmanager
+from flask import request
+from flask_via.exceptions import ImproperlyConfigured
+
+
+#: Methods reserved urls accept, the request is dispatched again once the
+#: real routes are registered so unsupported methods are still refused
+METHODS = ('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS')
+
+
+class DeferredLoader(object):
+    """ Reserves the urls of a blueprint with placeholder rules. The first
+    request matching a placeholder calls ``load``, which registers the real
+    routes, then the placeholders are removed and the request is dispatched
+    again to the real view.
+
+    Loaders are stored in ``app.extensions['via']['deferred']`` by blueprint
+    name, see :func:`load_deferred`.
+
+    .. versionadded:: 2015.2.0
+    """
+
+    def __init__(self, app, name, load, url_prefix=None, subdomain=None):
+        """ Constructor, adds the placeholder rules to the application.
+
+        Arguments
+        ---------
+        app : flask.app.Flask
+            Flask application instance
+        name : str
+            Blueprint name
+        load : function
+            Called with no arguments to register the blueprint
+
+        Keyword Arguments
+        -----------------
+        url_prefix : str, optional
+            Url prefix to reserve, defaults to ``None``
+        subdomain : str, optional
+            Subdomain to reserve, defaults to ``None``
+
+        Raises
+        ------
+        ImproperlyConfigured
+            If neither ``url_prefix`` nor ``subdomain`` is given, the
+            blueprint would reserve every url of the application
+        """
+
+        if not url_prefix and not subdomain:
+            raise ImproperlyConfigured(
+                'Deferred blueprint {0} requires a url_prefix or '
+                'subdomain.'.format(name))
+
+        self.app = app
+        self.name = name
+        self.endpoint = 'via_deferred.{0}'.format(name)
+        self.load_routes = load
+        self.loaded = False
+        self.lock = threading.Lock()
+
+        url_prefix = (url_prefix or '').rstrip('/')
+        for url in (url_prefix or '/', url_prefix + '/<path:path>'):
+            app.add_url_rule(
+                url,
+                self.endpoint,
+                self.dispatch,
+                methods=METHODS,
+                subdomain=subdomain,
+                strict_slashes=False)
+
+        extension = app.extensions.setdefault('via', {})
+        extension.setdefault('deferred', {})[name] = self
+
+    def load(self):
+        """ Registers the blueprint and removes the placeholder rules, only
+        the first call has any effect.
+        """
+
+        if self.loaded:
+            return
+
+        with self.lock:
+            if self.loaded:
+                return
+            with setup(self.app):
+                self.load_routes()
+            remove_rules(self.app, self.endpoint)
+            metrics = self.app.extensions['via'].get('metrics')
+            if metrics is not None:
+                metrics.instrument()
+            self.loaded = True
+
+    def dispatch(self, **kwargs):
+        """ Placeholder view, loads the blueprint and dispatches the request
+        to the view now matching it.
+        """
+
+        self.load()
+
+        adapter = self.app.create_url_adapter(request)
+        request.url_rule, request.view_args = adapter.match(return_rule=True)
+
+        # The application already preprocessed the request, run only what
+        # the blueprint adds
+        bp = request.blueprint
+        if bp is not None:
+            for func in self.app.url_value_preprocessors.get(bp, ()):
+                func(request.endpoint, request.view_args)
+            for func in self.app.before_request_funcs.get(bp, ()):
+                rv = func()
+                if rv is not None:
+                    return rv
+
+        return self.app.dispatch_request()
+
+
+def load_deferred(app):
+    """ Registers every deferred blueprint of an application now, for
+    example before building urls to their endpoints with ``url_for``.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    app : flask.app.Flask
+        Flask application instance
+    """
+
+    deferred = app.extensions.get('via', {}).get('deferred', {})
+    for loader in list(deferred.values()):
+        loader.load()
+
+
+def remove_rules(app, endpoint):
+    """ Removes every url rule for an endpoint from the application.
+    """
+
+    url_map = app.url_map
+    url_map._rules = [r for r in url_map._rules if r.endpoint != endpoint]
+    url_map._rules_by_endpoint.pop(endpoint, None)
+    url_map._remap = True
+    app.view_functions.pop(endpoint, None)
+
+
+#: Guards applications without a before first request lock
+lock = threading.Lock()
+
+
+@contextmanager
+def setup(app):
+    """ Allows routes to be added once the application has handled requests,
+    Flask refuses this in debug mode.
+
+    Flask only refuses once the first request flag is set, the flag is
+    cleared for the duration while holding the lock Flask takes to run
+    ``before_first_request`` functions, so a request starting meanwhile
+    waits rather than running them again. Other application state, such as
+    ``debug``, is left untouched.
+    """
+
+    if not (app.debug and app._got_first_request):
+        yield
+        return
+
+    with getattr(app, '_before_request_lock', lock):
+        app._got_first_request = False
+        try:
+            yield
+        finally:
+            app._got_first_request = True
@@ -0,0 +1,373 @@
+# -*- coding: utf-8 -*-
+
+"""
+flask_via.dispatch
+------------------
+
+Faster url matching for applications with many routes. Werkzeug tests every
+rule of the url map in order until one matches, here rules are indexed so a
+request is only matched against the rules which could match it:
+
+* :class:`PrefixTrie` indexes rules by the static path segments they start
+  with, usually the ``url_prefix`` of their ``Include`` or ``Blueprint``
+* :class:`StaticIndex` indexes rules without converters by their exact
+  domain and path, most of these requests are resolved by a dict lookup
+
+Werkzeug still performs any matching which is not a plain lookup, so
+converters, strict slashes, redirects and methods behave exactly the same.
+"""
+
+from heapq import merge
+from werkzeug.exceptions import MethodNotAllowed, NotFound
+from werkzeug.routing import Map, MapAdapter
+
+
+class PrefixTrie(object):
+    """ Indexes url rules by the static path segments they start with.
+
+    .. versionadded:: 2015.2.0
+
+    Example
+    -------
+    .. sourcecode:: python
+
+        trie = PrefixTrie(app.url_map._rules)
+        rules = trie.candidates('/api/v1/users/1')
+    """
+
+    def __init__(self, rules):
+        """ Constructor.
+
+        Arguments
+        ---------
+        rules : list
+            Url rules in the order werkzeug matches them
+        """
+
+        self.rules = rules
+        self.size = len(rules)
+        self.root = TrieNode()
+
+        for index, rule in enumerate(rules):
+            node = self.root
+            for segment in prefix_segments(rule.rule):
+                node = node.children.setdefault(segment, TrieNode())
+            node.rules.append((index, rule))
+
+    def candidates(self, path_info):
+        """ Returns the rules which could match a path, in the order werkzeug
+        matches them.
+
+        Arguments
+        ---------
+        path_info : str
+            The request path
+
+        Returns
+        -------
+        list
+            Url rules
+        """
+
+        found = []
+        node = self.root
+        if node.rules:
+            found.append(node.rules)
+
+        # Only segments followed by a slash are complete
+        for segment in path_info.split('/')[:-1]:
+            if not segment:
+                continue
+            node = node.children.get(segment)
+            if node is None:
+                break
+            if node.rules:
+                found.append(node.rules)
+
+        if len(found) == 1:
+            return [rule for _, rule in found[0]]
+
+        return [rule for _, rule in merge(*found)]
+
+
+class TrieNode(object):
+    """ A static path segment of :class:`PrefixTrie`.
+    """
+
+    __slots__ = ('children', 'rules')
+
+    def __init__(self):
+        self.children = {}
+        self.rules = []
+
+
+class StaticIndex(object):
+    """ Indexes url rules without converters or defaults by the domain and
+    path they match. Werkzeug tries these rules before any other so the
+    first of them to match a request is the rule werkzeug would match.
+
+    .. versionadded:: 2015.2.0
+
+    Attributes
+    ----------
+    candidates : dict
+        Rules which could match each ``(domain, path)`` in the order
+        werkzeug matches them
+    direct : dict
+        The rule matching each ``(domain, path, method)`` without redirects,
+        only present when it is the only candidate for its path
+    """
+
+    def __init__(self, url_map):
+        """ Constructor.
+
+        Arguments
+        ---------
+        url_map : werkzeug.routing.Map
+            Url map with sorted rules
+        """
+
+        self.rules = url_map._rules
+        self.size = len(url_map._rules)
+        self.candidates = {}
+        self.direct = {}
+
+        exact = {}
+        for rule in self.rules:
+            if rule.arguments or rule.build_only:
+                continue
+
+            domain = rule.host if url_map.host_matching else rule.subdomain
+
+            if rule.is_leaf and rule.strict_slashes:
+                paths = [(rule.rule, True)]
+            else:
+                # Werkzeug accepts the path with or without the trailing
+                # slash, redirecting if the slash is missing and strict
+                base = rule.rule if rule.is_leaf else rule.rule.rstrip('/')
+                paths = [
+                    (base, rule.is_leaf or not rule.strict_slashes),
+                    (base + '/', True),
+                ]
+
+            for path, plain in paths:
+                self.candidates.setdefault((domain, path), []).append(rule)
+                if plain:
+                    exact[(domain, path)] = rule
+
+        for key, rules in self.candidates.items():
+            rule = rules[0]
+            if (len(rules) > 1
+                    or exact.get(key) is not rule
+                    or rule.methods is None
+                    or rule.redirect_to is not None
+                    or rule.alias):
+                continue
+            # Other rules of the endpoint may redirect to themselves
+            if (url_map.redirect_defaults
+                    and len(url_map._rules_by_endpoint[rule.endpoint]) > 1):
+                continue
+            for method in rule.methods:
+                self.direct[key + (method,)] = rule
+
+
+class RuleSubset(object):
+    """ Stands in for a url map while :class:`ViaMapAdapter` matches against
+    a subset of its rules.
+    """
+
+    def __init__(self, url_map, rules):
+        self.url_map = url_map
+        self._rules = rules
+
+    def __getattr__(self, name):
+        return getattr(self.url_map, name)
+
+
+class ViaMap(Map):
+    """ A werkzeug url map matching requests with :class:`StaticIndex` and
+    :class:`PrefixTrie`, see :func:`install`.
+
+    .. versionadded:: 2015.2.0
+    """
+
+    #: Whether requests are matched with :class:`PrefixTrie`
+    prefix_dispatch = False
+
+    #: Whether requests are matched with :class:`StaticIndex`
+    static_dispatch = False
+
+    trie = None
+    static = None
+
+    def update(self):
+        """ Sorts the rules if they changed, see
+        :meth:`werkzeug.routing.Map.update`, and rebuilds the indexes if
+        rules were added or removed.
+        """
+
+        super(ViaMap, self).update()
+
+        if self.prefix_dispatch and stale(self.trie, self._rules):
+            self.trie = PrefixTrie(self._rules)
+
+        if self.static_dispatch and stale(self.static, self._rules):
+            self.static = StaticIndex(self)
+
+    def bind(self, *args, **kwargs):
+        return adapter(super(ViaMap, self).bind(*args, **kwargs))
+
+    def bind_to_environ(self, *args, **kwargs):
+        return adapter(super(ViaMap, self).bind_to_environ(*args, **kwargs))
+
+
+class ViaMapAdapter(MapAdapter):
+    """ A werkzeug map adapter which looks requests up in the
+    :class:`StaticIndex` and otherwise only matches them against the rules
+    :class:`PrefixTrie` returns for their path.
+
+    .. versionadded:: 2015.2.0
+    """
+
+    def match(
+            self,
+            path_info=None,
+            method=None,
+            return_rule=False,
+            query_args=None):
+        """ See :meth:`werkzeug.routing.MapAdapter.match`.
+        """
+
+        url_map = self.map
+        url_map.update()
+
+        path = self.path_info if path_info is None else path_info
+        if not isinstance(path, type(u'')):
+            path = path.decode(url_map.charset)
+
+        static = url_map.static if url_map.static_dispatch else None
+        if static is not None:
+            key = (
+                url_map.host_matching and self.server_name or self.subdomain,
+                path and '/' + path.lstrip('/'))
+
+            rule = static.direct.get(
+                key + ((method or self.default_method).upper(),))
+            if rule is not None:
+                values = dict(rule.defaults) if rule.defaults else {}
+                return (rule if return_rule else rule.endpoint), values
+
+            rules = static.candidates.get(key)
+            if rules:
+                try:
+                    return self.match_rules(
+                        rules,
+                        path_info,
+                        method,
+                        return_rule,
+                        query_args)
+                except (MethodNotAllowed, NotFound):
+                    # Rules with converters may still match
+                    pass
+
+        trie = url_map.trie if url_map.prefix_dispatch else None
+        if trie is None:
+            return super(ViaMapAdapter, self).match(
+                path_info,
+                method,
+                return_rule,
+                query_args)
+
+        return self.match_rules(
+            trie.candidates(path),
+            path_info,
+            method,
+            return_rule,
+            query_args)
+
+    def match_rules(self, rules, *args):
+        """ Matches the request against some of the map rules with
+        :meth:`werkzeug.routing.MapAdapter.match`.
+        """
+
+        # Adapters belong to a single request so the map can be swapped
+        url_map = self.map
+        self.map = RuleSubset(url_map, rules)
+        try:
+            return super(ViaMapAdapter, self).match(*args)
+        finally:
+            self.map = url_map
+
+
+def prefix_segments(rule):
+    """ Returns the complete static path segments a rule string starts with.
+    A fully static rule ending in a slash also matches the path without the
+    slash, which werkzeug redirects, so its last segment is not included.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    rule : str
+        Url rule, for example ``/api/v1/users/<int:id>``
+
+    Returns
+    -------
+    list
+        Path segments, for example ``['api', 'v1', 'users']``
+    """
+
+    static, converter, _ = rule.partition('<')
+    segments = [s for s in static.split('/')[:-1] if s]
+
+    if not converter and segments and rule.endswith('/'):
+        segments.pop()
+
+    return segments
+
+
+def adapter(map_adapter):
+    """ Returns a werkzeug map adapter as a :class:`ViaMapAdapter`.
+    """
+
+    map_adapter.__class__ = ViaMapAdapter
+    return map_adapter
+
+
+def stale(index, rules):
+    """ Returns whether an index was built from a different list of rules.
+    """
+
+    return (
+        index is None
+        or index.rules is not rules
+        or index.size != len(rules))
+
+
+def install(app, prefix=True, static=True):
+    """ Switches an application url map to :class:`ViaMap`, rules already
+    added and added later are all indexed.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    app : flask.app.Flask
+        Flask application instance
+
+    Keyword Arguments
+    -----------------
+    prefix : bool, optional
+        Match requests with :class:`PrefixTrie`, defaults to ``True``
+    static : bool, optional
+        Match requests with :class:`StaticIndex`, defaults to ``True``
+    """
+
+    url_map = app.url_map
+
+    if not isinstance(url_map, ViaMap):
+        # Rules keep a reference to their map so the map itself is changed
+        url_map.__class__ = ViaMap
+
+    url_map.prefix_dispatch = url_map.prefix_dispatch or prefix
+    url_map.static_dispatch = url_map.static_dispatch or static
@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+
+"""
+flask_via.executors
+-------------------
+
+Bulkheads isolating slow sections of an application. Views given an executor
+run on its own bounded thread pool, so when every thread of the pool is busy
+further requests wait in a bounded queue and are then refused, while views
+of other sections keep their own threads.
+
+Executors are configured by name with ``VIA_EXECUTORS`` and given to
+``Functional`` and ``Pluggable`` routers, or to ``Include`` and ``Blueprint``
+routers for every route they include, with the ``executor`` keyword
+argument.
+"""
+
+import os
+import threading
+import time
+
+from flask import current_app
+from flask.globals import _app_ctx_stack, _request_ctx_stack
+from flask_via.lazy import string_types
+from flask_via.wrappers import update_view
+from multiprocessing import TimeoutError
+from multiprocessing.pool import ThreadPool
+from werkzeug.exceptions import GatewayTimeout, ServiceUnavailable
+
+
+class Bulkhead(object):
+    """ A named thread pool of ``workers`` threads running views. At most
+    ``queue`` requests wait for a thread, requests beyond that are refused
+    with ``503 Service Unavailable`` and requests whose view did not start
+    within ``timeout`` seconds receive ``504 Gateway Timeout``, their view
+    is then never run.
+
+    Views run with the request and application context of the request, which
+    Flask tears down once the request is answered. Views which started are
+    therefore waited for however long they take, ``timeout`` only bounds the
+    wait for a thread.
+
+    .. versionadded:: 2015.2.0
+
+    Example
+    -------
+    .. sourcecode:: python
+
+        app.config['VIA_EXECUTORS'] = {
+            'reports': {'workers': 4, 'queue': 8, 'timeout': 30},
+        }
+
+        routes = [
+            Include('yourapp.reports.routes', executor='reports'),
+        ]
+
+    Attributes
+    ----------
+    active : int
+        Views currently running
+    queued : int
+        Requests waiting for a thread
+    completed : int
+        Views which returned or raised
+    rejected : int
+        Requests refused as the queue was full
+    timeouts : int
+        Requests which timed out
+    wait_time : float
+        Seconds requests spent waiting for a thread in total
+    max_wait : float
+        Longest a request waited for a thread
+    """
+
+    def __init__(self, name, workers=4, queue=0, timeout=None):
+        """ Constructor, threads are started on first use.
+
+        Arguments
+        ---------
+        name : str
+            Executor name
+
+        Keyword Arguments
+        -----------------
+        workers : int, optional
+            Number of threads, defaults to ``4``
+        queue : int, optional
+            Number of requests which may wait for a thread, defaults to ``0``
+        timeout : float, optional
+            Seconds to wait for a view to start, defaults to ``None`` to
+            wait indefinitely
+        """
+
+        self.name = name
+        self.workers = workers
+        self.queue = queue
+        self.timeout = timeout
+        self.slots = threading.Semaphore(workers + queue)
+        self.lock = threading.Lock()
+        self.pool = None
+        self.pid = None
+        self.active = 0
+        self.queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+
+    def __call__(self, view):
+        """ Returns ``view`` wrapped to run on this executor, see
+        :func:`offload`.
+        """
+
+        return offload(view, self)
+
+    def get_pool(self):
+        """ Returns the thread pool, started on first use and again in
+        forked processes.
+        """
+
+        pid = os.getpid()
+        if self.pool is None or self.pid != pid:
+            with self.lock:
+                if self.pool is None or self.pid != pid:
+                    self.pool = ThreadPool(self.workers)
+                    self.pid = pid
+
+        return self.pool
+
+    def run(self, view, *args, **kwargs):
+        """ Runs a view on the executor and waits for its result.
+
+        Arguments
+        ---------
+        view : function
+            The view function
+        \*\*kwargs
+            View arguments
+
+        Returns
+        -------
+        object
+            The view result
+
+        Raises
+        ------
+        werkzeug.exceptions.ServiceUnavailable
+            If the executor queue is full
+        werkzeug.exceptions.GatewayTimeout
+            If the view does not start within ``timeout`` seconds
+        """
+
+        if not self.slots.acquire(False):
+            with self.lock:
+                self.rejected += 1
+            raise ServiceUnavailable()
+
+        appctx = _app_ctx_stack.top
+        reqctx = _request_ctx_stack.top
+        submitted = time.time()
+        state = {'started': False, 'cancelled': False}
+
+        def task():
+            wait = time.time() - submitted
+            with self.lock:
+                self.queued -= 1
+                if not state['cancelled']:
+                    state['started'] = True
+                    self.active += 1
+                    self.wait_time += wait
+                    self.max_wait = max(self.max_wait, wait)
+
+            if state['cancelled']:
+                self.slots.release()
+                return None
+
+            # The request is handled by this thread now, so the contexts are
+            # only made visible to it rather than pushed again
+            _app_ctx_stack.push(appctx)
+            _request_ctx_stack.push(reqctx)
+            try:
+                return view(*args, **kwargs)
+            finally:
+                _request_ctx_stack.pop()
+                _app_ctx_stack.pop()
+                with self.lock:
+                    self.active -= 1
+                    self.completed += 1
+                self.slots.release()
+
+        with self.lock:
+            self.queued += 1
+
+        try:
+            result = self.get_pool().apply_async(task)
+        except Exception:
+            with self.lock:
+                self.queued -= 1
+            self.slots.release()
+            raise
+
+        try:
+            return result.get(self.timeout)
+        except TimeoutError:
+            with self.lock:
+                if not state['started']:
+                    state['cancelled'] = True
+                    self.timeouts += 1
+
+        if state['cancelled']:
+            raise GatewayTimeout()
+
+        # The view uses the request context, which must outlive it
+        return result.get()
+
+    def stats(self):
+        """ Returns the executor counters for monitoring.
+
+        Returns
+        -------
+        dict
+            ``workers``, ``queue``, ``active``, ``queued``, ``completed``,
+            ``rejected``, ``timeouts``, ``wait_time`` and ``max_wait``
+        """
+
+        with self.lock:
+            return {
+                'workers': self.workers,
+                'queue': self.queue,
+                'active': self.active,
+                'queued': self.queued,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'timeouts': self.timeouts,
+                'wait_time': self.wait_time,
+                'max_wait': self.max_wait,
+            }
+
+    def shutdown(self):
+        """ Stops the threads once running views return.
+        """
+
+        with self.lock:
+            pool, self.pool = self.pool, None
+
+        if pool is not None:
+            pool.close()
+
+
+def get_executor(app, executor):
+    """ Returns an executor of an application, executors given by name are
+    created from ``VIA_EXECUTORS`` on first use and stored in
+    ``app.extensions['via']['executors']``.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    app : flask.app.Flask
+        Flask application instance
+    executor : str, Bulkhead
+        Executor name or instance
+
+    Returns
+    -------
+    Bulkhead
+        The executor
+
+    Raises
+    ------
+    KeyError
+        If ``VIA_EXECUTORS`` does not configure the executor name
+    """
+
+    if isinstance(executor, Bulkhead):
+        return executor
+
+    executors = app.extensions.setdefault('via', {}).setdefault(
+        'executors',
+        {})
+
+    try:
+        return executors[executor]
+    except KeyError:
+        options = app.config.get('VIA_EXECUTORS', {})[executor]
+        return executors.setdefault(
+            executor,
+            Bulkhead(executor, **options))
+
+
+def executor_stats(app):
+    """ Returns the counters of every executor an application has used, see
+    :meth:`Bulkhead.stats`.
+
+    .. versionadded:: 2015.2.0
+
+    Returns
+    -------
+    dict
+        Counters by executor name
+    """
+
+    executors = app.extensions.get('via', {}).get('executors', {})
+
+    return dict((n, e.stats()) for n, e in executors.items())
+
+
+def offload(view, executor):
+    """ Wraps a view to run on an executor, unwrapping it first if it already
+    runs on another.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    view : function
+        The view function
+    executor : str, Bulkhead
+        Executor name or instance, ``None`` or ``False`` to leave ``view`` to
+        run on the request thread
+
+    Returns
+    -------
+    function
+        The view
+    """
+
+    view = inline(view)
+
+    if not executor:
+        return view
+
+    def offloaded(*args, **kwargs):
+        bulkhead = get_executor(current_app._get_current_object(), executor)
+        return bulkhead.run(view, *args, **kwargs)
+
+    return update_view(offloaded, view, executor=executor)
+
+
+def view_executor(view):
+    """ Returns the executor, name or instance, a view runs on or ``None``.
+
+    .. versionadded:: 2015.2.0
+    """
+
+    executor = getattr(view, 'executor', None)
+    if isinstance(executor, (Bulkhead, string_types)):
+        return executor
+
+    return None
+
+
+def inline(view):
+    """ Returns the view wrapped by :func:`offload`.
+    """
+
+    if view_executor(view) is not None:
+        return view.__wrapped__
+
+    return view
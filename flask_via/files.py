@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+
+"""
+flask_via.files
+---------------
+
+Routes declared in JSON, TOML or YAML route files rather than python routes
+modules. Each top level key of a route file is a routes list, each route a
+table naming its ``router`` with the other keys passed to the router as
+keyword arguments, views are given as python dotted paths:
+
+.. sourcecode:: json
+
+    {
+        "routes": [
+            {"router": "functional", "url": "/", "view": "app.views.home"},
+            {"router": "include", "routes_module": "api.toml",
+             "url_prefix": "/api", "endpoint": "api"}
+        ]
+    }
+
+Parsed route files are cached with :mod:`marshal` in a ``__pycache__``
+directory next to the route file, as python caches bytecode, so later boots
+skip parsing until the route file changes.
+"""
+
+import json
+import marshal
+import os
+import sys
+
+from flask_via.cache import ResponseCache
+from flask_via.exceptions import ImproperlyConfigured
+from werkzeug.utils import import_string
+
+#: Extensions of route files, any other routes module is imported
+EXTENSIONS = ('.json', '.toml', '.yaml', '.yml')
+
+#: Routers by the name given as ``router`` in route files, other routers
+#: can be given by python dotted path
+ROUTERS = {
+    'functional': 'flask_via.routers.default.Functional',
+    'pluggable': 'flask_via.routers.default.Pluggable',
+    'blueprint': 'flask_via.routers.default.Blueprint',
+    'include': 'flask_via.routers.Include',
+    'resource': 'flask_via.routers.restful.Resource',
+}
+
+#: Route file keys renamed to the keyword arguments of routers
+ALIASES = {
+    'functional': {'view': 'func'},
+    'resource': {'view': 'resource'},
+    'blueprint': {'name': 'name_or_instance'},
+}
+
+#: Router classes by router name once imported, see :func:`router_class`
+classes = {}
+
+#: Tag of the running interpreter in cache file names, cached files are
+#: only read by the interpreter which wrote them
+CACHE_TAG = getattr(getattr(sys, 'implementation', None), 'cache_tag', None)
+if CACHE_TAG is None:  # Python 2
+    CACHE_TAG = 'py{0}{1}'.format(*sys.version_info[:2])
+
+
+def is_routes_file(routes_module):
+    """ Returns whether a routes module is a route file path rather than a
+    python dotted path.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    routes_module : str
+        Route file path or python dotted path to a routes module
+
+    Returns
+    -------
+    bool
+        If the routes module has a route file extension
+    """
+
+    return os.path.splitext(routes_module)[1].lower() in EXTENSIONS
+
+
+def cache_file(path):
+    """ Returns the path a route file is cached at once parsed.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    path : str
+        Route file path
+
+    Returns
+    -------
+    str
+        Cache file path
+    """
+
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(
+        directory,
+        '__pycache__',
+        '{0}.{1}.marshal'.format(name, CACHE_TAG))
+
+
+def parse(path):
+    """ Parses a route file by its extension, JSON with :mod:`json`, TOML
+    with :mod:`tomllib` or ``toml`` and YAML with ``PyYAML``.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    path : str
+        Route file path
+
+    Returns
+    -------
+    dict
+        Routes lists by name
+
+    Raises
+    ------
+    ImproperlyConfigured
+        If the library required to parse the file is not installed, or the
+        file does not declare routes lists
+    """
+
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    if extension == '.json':
+        data = json.loads(content.decode('utf-8'))
+    elif extension == '.toml':
+        try:
+            import tomllib as toml
+        except ImportError:  # Python < 3.11
+            try:
+                import toml
+            except ImportError:
+                raise ImproperlyConfigured(
+                    'toml must be installed to read {0}'.format(path))
+        data = toml.loads(content.decode('utf-8'))
+    else:
+        try:
+            import yaml
+        except ImportError:
+            raise ImproperlyConfigured(
+                'PyYAML must be installed to read {0}'.format(path))
+        data = yaml.safe_load(content)
+
+    if not isinstance(data, dict) or not all(
+            isinstance(routes, list) and
+            all(isinstance(route, dict) for route in routes)
+            for routes in data.values()):
+        raise ImproperlyConfigured(
+            '{0} must map names to lists of routes'.format(path))
+
+    return data
+
+
+def load(path):
+    """ Returns the parsed content of a route file, from its cache file if
+    written for the same size and modification time of the route file,
+    otherwise the route file is parsed and the cache file written. Cache
+    files which cannot be written, e.g. on read only file systems, are
+    skipped.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    path : str
+        Route file path
+
+    Returns
+    -------
+    dict
+        Routes lists by name
+    """
+
+    stat = os.stat(path)
+    key = (getattr(stat, 'st_mtime_ns', stat.st_mtime), stat.st_size)
+    cache = cache_file(path)
+
+    try:
+        # Unmarshalling a file object reads it in small chunks
+        with open(cache, 'rb') as f:
+            cached_key, data = marshal.loads(f.read())
+        if tuple(cached_key) == key:
+            return data
+    except (IOError, OSError, EOFError, ValueError, TypeError):
+        pass
+
+    data = parse(path)
+
+    try:
+        directory = os.path.dirname(cache)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        temp = '{0}.{1}.tmp'.format(cache, os.getpid())
+        with open(temp, 'wb') as f:
+            f.write(marshal.dumps((key, data)))
+        os.rename(temp, cache)
+    except (IOError, OSError, ValueError):
+        # Unmarshallable values, e.g. TOML dates, are parsed every boot
+        pass
+
+    return data
+
+
+def include(path, routes_name):
+    """ Loads a route file and builds the routers of one of its routes
+    lists, see :func:`load` and :func:`build`.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    path : str
+        Route file path
+    routes_name : str
+        Name of the routes list in the route file
+
+    Returns
+    -------
+    list
+        List of routers
+
+    Raises
+    ------
+    AttributeError
+        If the routes list does not exist in the route file
+    """
+
+    data = load(path)
+    try:
+        routes = data[routes_name]
+    except KeyError:
+        raise AttributeError(
+            '{0} has no routes named {1}'.format(path, routes_name))
+
+    return [build(path, route) for route in routes]
+
+
+def build(path, route):
+    """ Builds the router of a route declared in a route file. Includes of
+    route files are relative to the including file, includes without a
+    ``routes_module`` include another routes list of the same file.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    path : str
+        Path of the route file declaring the route
+    route : dict
+        Declared route
+
+    Returns
+    -------
+    flask_via.routers.BaseRouter
+        The router
+
+    Raises
+    ------
+    ImproperlyConfigured
+        If the route does not name a router
+    """
+
+    kwargs = dict((str(k), v) for k, v in route.items())
+    try:
+        name = kwargs.pop('router')
+    except KeyError:
+        raise ImproperlyConfigured(
+            '{0}: route {1!r} does not name a router'.format(path, route))
+
+    for key, argument in ALIASES.get(name, {}).items():
+        if key in kwargs:
+            kwargs[argument] = kwargs.pop(key)
+
+    if name == 'include':
+        routes_module = kwargs.get('routes_module')
+        if not routes_module:
+            kwargs['routes_module'] = path
+        elif is_routes_file(routes_module):
+            kwargs['routes_module'] = os.path.normpath(os.path.join(
+                os.path.dirname(path),
+                routes_module))
+
+    if isinstance(kwargs.get('cache'), dict):
+        kwargs['cache'] = ResponseCache(**dict(
+            (str(k), v) for k, v in kwargs['cache'].items()))
+
+    return router_class(name)(**kwargs)
+
+
+def router_class(name):
+    """ Returns the router class of a router name or python dotted path,
+    imported once rather than for every route.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    name : str
+        Router name, see ``ROUTERS``, or python dotted path to a router
+
+    Returns
+    -------
+    type
+        The router class
+    """
+
+    try:
+        return classes[name]
+    except KeyError:
+        cls = classes[name] = import_string(ROUTERS.get(name, name))
+        return cls
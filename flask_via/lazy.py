@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+
+"""
+flask_via.lazy
+--------------
+
+Lazily imported views, allowing routes to reference views by python dotted
+path so view modules are only imported when first requested.
+"""
+
+import sys
+import threading
+
+from flask_via.coroutines import sync
+from flask_via.metrics import unmeasured
+from flask_via.pluggable import reusable_view
+from werkzeug.utils import import_string
+
+try:
+    string_types = basestring  # noqa
+except NameError:  # Python 3
+    string_types = str
+
+try:
+    intern_string = sys.intern
+except AttributeError:  # Python 2
+    intern_string = intern  # noqa
+
+
+def interned(value):
+    """ Returns the interned copy of a url or endpoint string so every
+    route, werkzeug rule and view function key naming it shares one string,
+    other values are returned as they are.
+
+    .. versionadded:: 2015.2.0
+    """
+
+    if type(value) is str:
+        return intern_string(value)
+
+    return value
+
+
+class LazyView(object):
+    """ Proxy registered in place of a view given as a python dotted path.
+    The view is imported on the first call, once per process, and every
+    call is passed on to it.
+
+    .. versionadded:: 2015.2.0
+
+    Example
+    -------
+    .. sourcecode:: python
+
+        from flask.ext.via.routers.default import Functional, Pluggable
+
+        routes = [
+            Functional('/foo', 'yourapp.views.foo'),
+            Pluggable('/bar', 'yourapp.views.BarView', 'bar',
+                      methods=['GET', 'POST']),
+        ]
+    """
+
+    def __init__(self, path, name=None, reuse=False):
+        """ Constructor.
+
+        .. versionchanged:: 2015.2.0
+
+            Added ``reuse`` keyword argument
+
+        Arguments
+        ---------
+        path : str
+            Python dotted path to the view, e.g. ``yourapp.views.foo``
+
+        Keyword Arguments
+        -----------------
+        name : str, optional
+            When set the path is a pluggable view class and ``as_view`` is
+            called with this name on import, defaults to ``None``
+        reuse : bool, optional
+            Reuse the instances of the pluggable view class, see
+            :func:`as_view`, defaults to ``False``
+        """
+
+        self.path = path
+        self.name = name
+        self.reuse = reuse
+        self.view = None
+        self.lock = threading.Lock()
+
+        #: Flask uses the view name as the default endpoint
+        self.__name__ = name or path.replace(':', '.').rpartition('.')[2]
+
+    def resolve(self):
+        """ Imports the view if it has not been imported yet.
+
+        Returns
+        -------
+        function
+            The view function
+
+        Raises
+        ------
+        ImportError
+            If the view cannot be imported
+        """
+
+        if self.view is None:
+            with self.lock:
+                if self.view is None:
+                    view = self.load()
+                    if self.name is not None:
+                        view = as_view(view, self.name, self.reuse)
+                    else:
+                        view = sync(view)
+                    self.view = view
+
+        return self.view
+
+    def load(self):
+        """ Imports the object at ``path``, called once by :meth:`resolve`.
+
+        Returns
+        -------
+        object
+            The view function or pluggable view class
+        """
+
+        return import_string(self.path)
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        return '<LazyView {0}>'.format(self.path)
+
+
+def as_view(view_class, name, reuse=False):
+    """ Returns the view function of a pluggable view class, see
+    :meth:`flask.views.View.as_view`, run on an event loop if the class has
+    coroutine handlers, see :func:`flask_via.coroutines.sync`.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    view_class : class
+        The pluggable view class
+    name : str
+        The view name, used as its endpoint
+
+    Keyword Arguments
+    -----------------
+    reuse : bool, optional
+        Reuse one instance of the view class per thread rather than creating
+        one per request, see :func:`flask_via.pluggable.reusable_view`,
+        defaults to ``False``
+
+    Returns
+    -------
+    function
+        The view function
+    """
+
+    if reuse:
+        return sync(reusable_view(view_class, name))
+
+    return sync(view_class.as_view(name))
+
+
+def resolve_views(app):
+    """ Imports every lazy view registered with the application, for example
+    before forking worker processes.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    app : flask.app.Flask
+        Flask application instance
+    """
+
+    # The table imports this module, the view options wrapping views are
+    # imported once both are loaded
+    from flask_via.table import unwrap
+
+    for view in list(app.view_functions.values()):
+        view = unwrap(unmeasured(view))
+        # Flask-Restful wraps resource views with functools.wraps
+        view = getattr(view, '__wrapped__', view)
+        if isinstance(view, LazyView):
+            view.resolve()
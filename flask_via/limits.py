@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+
+"""
+flask_via.limits
+----------------
+
+Concurrency limits shedding load before it reaches views. A limited route
+admits at most ``concurrency`` requests at once, a few more may wait briefly
+for one of them to finish and any others are refused straight away with
+``503 Service Unavailable`` and a ``Retry-After`` header, before any view
+code runs.
+
+Limits are configured by name with ``VIA_LIMITS`` and given to
+``Functional`` and ``Pluggable`` routers, or to ``Include`` and ``Blueprint``
+routers for every route they include, with the ``limit`` keyword argument.
+Routes given the same name share its limit.
+"""
+
+import threading
+import time
+
+from flask import current_app
+from flask_via.lazy import string_types
+from flask_via.wrappers import update_view
+from werkzeug.exceptions import ServiceUnavailable
+
+
+class Overloaded(ServiceUnavailable):
+    """ Raised when a limit refuses a request, adds a ``Retry-After`` header
+    to the ``503 Service Unavailable`` response.
+
+    .. versionadded:: 2015.2.0
+    """
+
+    description = (
+        'The server is handling too many requests for this resource, '
+        'please try again later.'
+    )
+
+    def __init__(self, retry_after=None, description=None):
+        """ Constructor.
+
+        Keyword Arguments
+        -----------------
+        retry_after : int, optional
+            Seconds clients should wait before retrying, defaults to ``None``
+            to leave out the ``Retry-After`` header
+        description : str, optional
+            Response description, defaults to ``None``
+        """
+
+        super(Overloaded, self).__init__(description)
+        self.retry_after = retry_after
+
+    def get_headers(self, environ=None):
+        headers = super(Overloaded, self).get_headers(environ)
+        if self.retry_after is not None:
+            headers.append(('Retry-After', str(self.retry_after)))
+        return headers
+
+
+class Limiter(object):
+    """ Admits at most ``concurrency`` requests at once. At most ``queue``
+    further requests wait up to ``wait`` seconds to be admitted, requests
+    beyond that or which waited too long are refused with
+    :class:`Overloaded`.
+
+    .. versionadded:: 2015.2.0
+
+    Example
+    -------
+    .. sourcecode:: python
+
+        app.config['VIA_LIMITS'] = {
+            'search': {'concurrency': 8, 'queue': 4, 'wait': 0.05},
+        }
+
+        routes = [
+            Include('yourapp.search.routes', limit='search'),
+        ]
+
+    Attributes
+    ----------
+    active : int
+        Requests currently admitted
+    waiting : int
+        Requests waiting to be admitted
+    admitted : int
+        Requests admitted in total
+    rejected : int
+        Requests refused in total
+    """
+
+    def __init__(self, name, concurrency, queue=0, wait=0.1, retry_after=1):
+        """ Constructor.
+
+        Arguments
+        ---------
+        name : str
+            Limit name
+        concurrency : int
+            Number of requests admitted at once
+
+        Keyword Arguments
+        -----------------
+        queue : int, optional
+            Number of requests which may wait to be admitted, defaults to
+            ``0``
+        wait : float, optional
+            Seconds a request may wait to be admitted, defaults to ``0.1``
+        retry_after : int, optional
+            ``Retry-After`` header value of refused requests, defaults to
+            ``1``
+        """
+
+        self.name = name
+        self.condition = threading.Condition(threading.Lock())
+        self.options = None
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.configure(concurrency, queue, wait, retry_after)
+
+    def __call__(self, view):
+        """ Returns ``view`` wrapped to be limited by this limiter, see
+        :func:`limited`.
+        """
+
+        return limited(view, self)
+
+    def configure(self, concurrency, queue=0, wait=0.1, retry_after=1):
+        """ Changes the limit, requests already admitted are unaffected and
+        waiting requests are admitted if the limit grew. Takes the
+        arguments of the constructor.
+        """
+
+        with self.condition:
+            self.concurrency = concurrency
+            self.queue = queue
+            self.wait = wait
+            self.retry_after = retry_after
+            self.condition.notify_all()
+
+    def acquire(self):
+        """ Admits a request, waiting for a slot if the queue allows it.
+
+        Raises
+        ------
+        Overloaded
+            If the request is refused
+        """
+
+        with self.condition:
+            if self.active < self.concurrency:
+                self.active += 1
+                self.admitted += 1
+                return
+
+            if self.waiting < self.queue:
+                self.waiting += 1
+                try:
+                    deadline = time.time() + self.wait
+                    while self.active >= self.concurrency:
+                        remaining = deadline - time.time()
+                        if remaining <= 0:
+                            break
+                        self.condition.wait(remaining)
+                    else:
+                        self.active += 1
+                        self.admitted += 1
+                        return
+                finally:
+                    self.waiting -= 1
+
+            self.rejected += 1
+            retry_after = self.retry_after
+
+        raise Overloaded(retry_after)
+
+    def release(self):
+        """ Releases the slot of a finished request.
+        """
+
+        with self.condition:
+            self.active -= 1
+            self.condition.notify()
+
+    def stats(self):
+        """ Returns the limiter counters for monitoring.
+
+        Returns
+        -------
+        dict
+            ``concurrency``, ``queue``, ``active``, ``waiting``,
+            ``admitted`` and ``rejected``
+        """
+
+        with self.condition:
+            return {
+                'concurrency': self.concurrency,
+                'queue': self.queue,
+                'active': self.active,
+                'waiting': self.waiting,
+                'admitted': self.admitted,
+                'rejected': self.rejected,
+            }
+
+
+def get_limiter(app, limit):
+    """ Returns a limiter of an application, limiters given by name are
+    created from ``VIA_LIMITS`` on first use and stored in
+    ``app.extensions['via']['limits']``. Their configuration is read on
+    every request, so changing ``VIA_LIMITS`` changes the limit without a
+    restart. A name removed from ``VIA_LIMITS`` keeps the options it was
+    last given, a name never configured leaves its views unlimited, either
+    is logged as a warning once.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    app : flask.app.Flask
+        Flask application instance
+    limit : str, Limiter
+        Limit name or instance
+
+    Returns
+    -------
+    Limiter or None
+        The limiter, ``None`` if the limit name was never configured
+    """
+
+    if isinstance(limit, Limiter):
+        return limit
+
+    extension = app.extensions.setdefault('via', {})
+    limiters = extension.setdefault('limits', {})
+    missing = extension.setdefault('limits_missing', set())
+
+    try:
+        options = (app.config.get('VIA_LIMITS') or {})[limit]
+    except KeyError:
+        limiter = limiters.get(limit)
+        if limit not in missing:
+            missing.add(limit)
+            app.logger.warning(
+                'Limit %s is not configured in VIA_LIMITS, %s',
+                limit,
+                'keeping its last options' if limiter else 'not limiting')
+        return limiter
+
+    missing.discard(limit)
+
+    try:
+        limiter = limiters[limit]
+    except KeyError:
+        limiter = limiters.setdefault(limit, Limiter(limit, **options))
+
+    # Configured options are kept as given so an unchanged configuration
+    # costs a single comparison per request
+    if limiter.options != options:
+        limiter.configure(**options)
+        limiter.options = dict(options)
+
+    return limiter
+
+
+def limit_stats(app):
+    """ Returns the counters of every limit an application has used, see
+    :meth:`Limiter.stats`.
+
+    .. versionadded:: 2015.2.0
+
+    Returns
+    -------
+    dict
+        Counters by limit name
+    """
+
+    limiters = app.extensions.get('via', {}).get('limits', {})
+
+    return dict((n, l.stats()) for n, l in limiters.items())
+
+
+def limited(view, limit):
+    """ Wraps a view to be admitted by a limiter, unwrapping it first if it
+    already is limited by another.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    view : function
+        The view function
+    limit : str, Limiter
+        Limit name or instance, ``None`` or ``False`` to leave ``view``
+        unlimited
+
+    Returns
+    -------
+    function
+        The view
+    """
+
+    view = unlimited(view)
+
+    if not limit:
+        return view
+
+    def admitted(*args, **kwargs):
+        limiter = get_limiter(current_app._get_current_object(), limit)
+        if limiter is None:
+            return view(*args, **kwargs)
+        limiter.acquire()
+        try:
+            return view(*args, **kwargs)
+        finally:
+            limiter.release()
+
+    return update_view(admitted, view, limit=limit)
+
+
+def view_limit(view):
+    """ Returns the limit, name or instance, admitting a view or ``None``.
+
+    .. versionadded:: 2015.2.0
+    """
+
+    limit = getattr(view, 'limit', None)
+    if isinstance(limit, (Limiter, string_types)):
+        return limit
+
+    return None
+
+
+def unlimited(view):
+    """ Returns the view wrapped by :func:`limited`.
+    """
+
+    if view_limit(view) is not None:
+        return view.__wrapped__
+
+    return view
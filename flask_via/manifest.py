@@ -0,0 +1,443 @@
+# -*- coding: utf-8 -*-
+
+"""
+flask_via.manifest
+------------------
+
+Stores compiled routes on disk so later application boots can register them
+without importing and walking every routes module.
+"""
+
+import hashlib
+import json
+import os
+import pkgutil
+
+from flask_via.coroutines import sync, unsync
+from flask_via.files import is_routes_file
+from flask_via.lazy import LazyView, as_view, interned
+from flask_via.pluggable import reused
+from flask_via.table import BlueprintRule, Rule, RouterRule, unwrap
+from importlib import import_module
+
+
+def module_file(name):
+    """ Finds the source file of a module without importing it, parent
+    packages may be imported. Route files are their own source file.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    name : str
+        Python dotted path to the module, or route file path
+
+    Returns
+    -------
+    str or None
+        Path to the module source file, ``None`` if it cannot be found
+    """
+
+    if is_routes_file(name):
+        return name if os.path.isfile(name) else None
+
+    try:
+        from importlib.util import find_spec
+    except ImportError:  # Python 2
+        try:
+            loader = pkgutil.get_loader(name)
+        except ImportError:
+            return None
+        filename = loader.get_filename() if loader else None
+    else:
+        try:
+            spec = find_spec(name)
+        except (ImportError, ValueError):
+            return None
+        filename = spec.origin if spec else None
+
+    if filename and os.path.isfile(filename):
+        return filename
+
+    return None
+
+
+def object_path(obj):
+    """ Returns an import path for an object in the form ``module:name``.
+
+    .. versionadded:: 2015.2.0
+
+    Raises
+    ------
+    ValueError
+        If importing the path does not return the same object
+    """
+
+    module = getattr(obj, '__module__', None)
+    name = getattr(obj, '__qualname__', None) or getattr(obj, '__name__', None)
+
+    if module and name and '<' not in name:
+        path = '{0}:{1}'.format(module, name)
+        try:
+            if import_path(path) is obj:
+                return path
+        except (ImportError, AttributeError):
+            pass
+
+    raise ValueError('{0!r} cannot be imported by path'.format(obj))
+
+
+def import_path(path):
+    """ Imports an object from a path returned by :func:`object_path`.
+
+    .. versionadded:: 2015.2.0
+
+    Raises
+    ------
+    ImportError
+        If the module cannot be imported
+    AttributeError
+        If the object does not exist in the module
+    """
+
+    module, _, name = path.partition(':')
+
+    obj = import_module(module)
+    for attr in name.split('.'):
+        obj = getattr(obj, attr)
+
+    return obj
+
+
+def fingerprinted(value):
+    """ Returns a value as it is stored in a manifest key, values which
+    cannot be serialised, such as a ``restful_api`` extension instance, are
+    replaced by the python dotted path of their type.
+
+    .. versionadded:: 2015.2.0
+    """
+
+    try:
+        json.dumps(value, sort_keys=True)
+    except (TypeError, ValueError):
+        cls = type(value)
+        return '<{0}.{1}>'.format(
+            cls.__module__,
+            getattr(cls, '__qualname__', cls.__name__))
+
+    return value
+
+
+class RouteManifest(object):
+    """ A JSON file holding the compiled routes of an application along with
+    a fingerprint of every routes module used to build them. The manifest is
+    stale as soon as any of those modules change.
+
+    .. versionadded:: 2015.2.0
+
+    Example
+    -------
+    .. sourcecode:: python
+
+        manifest = RouteManifest('/tmp/routes.json')
+        key = manifest.key('yourapp.routes', 'routes')
+
+        entries = manifest.load(key)
+        if entries is None:
+            entries = via.compile_module(app, 'yourapp.routes', 'routes')
+            manifest.dump(entries, ['yourapp.routes'], key)
+    """
+
+    #: Manifest format version, manifests of other versions are stale
+    version = 1
+
+    def __init__(self, path):
+        """ Constructor.
+
+        Arguments
+        ---------
+        path : str
+            File path the manifest is read from and written to
+        """
+
+        self.path = path
+
+        #: Routes modules of the entries last loaded, see :meth:`load`
+        self.modules = None
+
+    def key(self, routes_module, routes_name, **kwargs):
+        """ Returns the values, other than module sources, a manifest
+        depends on.
+
+        Arguments
+        ---------
+        routes_module : str
+            Python dotted path to the root routes module
+        routes_name : str
+            Name of the variable holding the routes in the module
+        \*\*kwargs
+            Arbitrary keyword arguments passed in to ``init_app``, those
+            which cannot be serialised are keyed by their type
+
+        Returns
+        -------
+        dict
+            The manifest key
+        """
+
+        return {
+            'routes_module': routes_module,
+            'routes_name': routes_name,
+            'kwargs': dict(
+                (name, fingerprinted(value))
+                for name, value in kwargs.items()),
+        }
+
+    def fingerprint(self, modules, key):
+        """ Hashes the source of each routes module together with the key.
+
+        Arguments
+        ---------
+        modules : list
+            Python dotted paths of the routes modules
+        key : dict
+            Manifest key from :meth:`key`
+
+        Returns
+        -------
+        str or None
+            Hex digest, ``None`` if a module source or the key cannot be
+            hashed
+        """
+
+        try:
+            header = json.dumps([self.version, key], sort_keys=True)
+        except TypeError:
+            return None
+
+        digest = hashlib.sha1(header.encode('utf-8'))
+
+        for name in modules:
+            filename = module_file(name)
+            if filename is None:
+                return None
+            digest.update(name.encode('utf-8'))
+            with open(filename, 'rb') as f:
+                digest.update(f.read())
+
+        return digest.hexdigest()
+
+    def load(self, key):
+        """ Reads the manifest and rebuilds its entries.
+
+        Arguments
+        ---------
+        key : dict
+            Manifest key from :meth:`key`
+
+        Returns
+        -------
+        list or None
+            List of compiled entries, ``None`` if the manifest is missing,
+            stale or references views which can no longer be imported. The
+            routes modules the entries were compiled from are set on
+            :attr:`modules`
+        """
+
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+        if data.get('version') != self.version:
+            return None
+
+        fingerprint = self.fingerprint(data.get('modules', []), key)
+        if fingerprint is None or fingerprint != data.get('fingerprint'):
+            return None
+
+        try:
+            entries = self.loads(data['entries'])
+        except (ImportError, AttributeError, KeyError, TypeError):
+            return None
+
+        self.modules = list(data.get('modules', []))
+
+        return entries
+
+    def dump(self, entries, modules, key):
+        """ Writes entries to the manifest, the file is replaced atomically.
+
+        Arguments
+        ---------
+        entries : list
+            List of compiled entries
+        modules : list
+            Python dotted paths of the routes modules used to compile entries
+        key : dict
+            Manifest key from :meth:`key`
+
+        Returns
+        -------
+        bool
+            ``False`` if the entries cannot be stored, for example if a view
+            cannot be imported by path
+        """
+
+        modules = list(unique(modules))
+
+        fingerprint = self.fingerprint(modules, key)
+        if fingerprint is None:
+            return False
+
+        try:
+            data = json.dumps({
+                'version': self.version,
+                'fingerprint': fingerprint,
+                'modules': modules,
+                'entries': self.dumps(entries),
+            }, indent=1, sort_keys=True)
+        except (TypeError, ValueError):
+            return False
+
+        tmp = '{0}.{1}.tmp'.format(self.path, os.getpid())
+        with open(tmp, 'w') as f:
+            f.write(data)
+        os.rename(tmp, self.path)
+
+        return True
+
+    def dumps(self, entries):
+        """ Converts compiled entries into JSON serialisable dicts.
+
+        Raises
+        ------
+        ValueError
+            If an entry cannot be stored
+        """
+
+        blueprints = []
+
+        def blueprint(entry):
+            for i, b in enumerate(blueprints):
+                if b is entry:
+                    return i
+            if entry.instance is not None:
+                raise ValueError(
+                    'Blueprint instances cannot be stored in a manifest')
+            blueprints.append(entry)
+            return len(blueprints) - 1
+
+        data = []
+        for entry in entries:
+            if isinstance(entry, BlueprintRule):
+                data.append({'register': blueprint(entry)})
+                continue
+
+            if isinstance(entry, RouterRule):
+                raise ValueError(
+                    '{0!r} cannot be stored in a manifest'.format(
+                        entry.router))
+
+            if unwrap(entry.view) is not entry.view:
+                raise ValueError(
+                    'View {0!r} is cached, limited or run on an executor, '
+                    'it cannot be stored in a manifest'.format(entry.endpoint))
+
+            lazy = isinstance(entry.view, LazyView)
+            if lazy:
+                view = entry.view.path
+            elif entry.view_class is not None:
+                view = object_path(entry.view_class)
+            else:
+                view = object_path(unsync(entry.view))
+
+            data.append({
+                'url': entry.url,
+                'endpoint': entry.endpoint,
+                'view': view,
+                'lazy': lazy,
+                'pluggable': (
+                    entry.view_class is not None
+                    or lazy and entry.view.name is not None),
+                'reuse': reused(entry.view),
+                'blueprint': (
+                    None if entry.blueprint is None
+                    else blueprint(entry.blueprint)),
+                'options': entry.options,
+            })
+
+        return {
+            'blueprints': [{
+                'name': b.name,
+                'import_name': b.import_name,
+                'options': b.options,
+            } for b in blueprints],
+            'rules': data,
+        }
+
+    def loads(self, data):
+        """ Rebuilds compiled entries from :meth:`dumps` output, importing
+        each view other than lazily imported views.
+
+        Raises
+        ------
+        ImportError
+            If a view module cannot be imported
+        AttributeError
+            If a view no longer exists in its module
+        """
+
+        blueprints = [
+            BlueprintRule(b['name'], b['import_name'], b['options'], None)
+            for b in data['blueprints']]
+
+        entries = []
+        for rule in data['rules']:
+            if 'register' in rule:
+                entries.append(blueprints[rule['register']])
+                continue
+
+            url = interned(rule['url'])
+            endpoint = interned(rule['endpoint'])
+
+            view_class = None
+            reuse = rule.get('reuse', False)
+            if rule['lazy']:
+                view = LazyView(
+                    rule['view'],
+                    endpoint if rule['pluggable'] else None,
+                    reuse)
+            else:
+                view = import_path(rule['view'])
+                if rule['pluggable']:
+                    view_class = view
+                    view = as_view(view_class, endpoint, reuse)
+                else:
+                    view = sync(view)
+
+            blueprint = None
+            if rule['blueprint'] is not None:
+                blueprint = blueprints[rule['blueprint']]
+
+            entries.append(Rule(
+                url,
+                endpoint,
+                view,
+                view_class,
+                blueprint,
+                rule['options']))
+
+        return entries
+
+
+def unique(items):
+    """ Yields items in order, skipping any already seen.
+    """
+
+    seen = set()
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            yield item
@@ -0,0 +1,436 @@
+# -*- coding: utf-8 -*-
+
+"""
+flask_via.metrics
+-----------------
+
+Latency histograms of the endpoints ``Via`` registers, enabled with the
+``VIA_METRICS`` configuration variable. Each view is wrapped to count its
+requests, errors and duration in fixed buckets allocated once, so measuring
+a request allocates nothing and percentiles are estimated from the buckets
+when read.
+"""
+
+import threading
+import time
+
+from bisect import bisect_left
+from flask import Response
+from flask_via.wrappers import update_view
+from werkzeug.exceptions import HTTPException
+
+
+#: Upper bounds of the latency buckets in seconds, a last bucket counts
+#: anything slower
+BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+#: Most precise clock available, ``time.perf_counter`` is Python 3 only
+timer = getattr(time, 'perf_counter', time.time)
+
+
+class Histogram(object):
+    """ Request count, error count and latency distribution of an endpoint.
+
+    .. versionadded:: 2015.2.0
+
+    Attributes
+    ----------
+    name : str
+        Endpoint or group name
+    buckets : tuple
+        Upper bounds of the buckets in seconds
+    counts : list
+        Requests per bucket, one more than ``buckets``
+    count : int
+        Requests measured
+    errors : int
+        Requests which raised or returned a server error
+    total : float
+        Seconds spent in the view in total
+    """
+
+    def __init__(self, name, buckets=BUCKETS):
+        """ Constructor.
+
+        Arguments
+        ---------
+        name : str
+            Endpoint or group name
+
+        Keyword Arguments
+        -----------------
+        buckets : tuple, optional
+            Upper bounds of the buckets in seconds, ascending, defaults to
+            ``BUCKETS``
+        """
+
+        self.name = name
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, seconds, error=False):
+        """ Counts a request.
+
+        Arguments
+        ---------
+        seconds : float
+            Time spent in the view
+
+        Keyword Arguments
+        -----------------
+        error : bool, optional
+            Whether the request failed, defaults to ``False``
+        """
+
+        index = bisect_left(self.buckets, seconds)
+        with self.lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += seconds
+            if error:
+                self.errors += 1
+
+    def merge(self, other):
+        """ Adds the counts of a histogram with the same buckets to this one,
+        for example to aggregate a group of endpoints.
+        """
+
+        with other.lock:
+            counts = list(other.counts)
+            count, errors, total = other.count, other.errors, other.total
+
+        with self.lock:
+            for index, value in enumerate(counts):
+                self.counts[index] += value
+            self.count += count
+            self.errors += errors
+            self.total += total
+
+    def quantile(self, q):
+        """ Estimates a latency quantile, interpolating within the bucket it
+        falls in.
+
+        Arguments
+        ---------
+        q : float
+            Quantile between ``0`` and ``1``, ``0.99`` for the 99th
+            percentile
+
+        Returns
+        -------
+        float
+            Seconds, ``0.0`` if no requests were measured
+        """
+
+        with self.lock:
+            counts = list(self.counts)
+            count = self.count
+
+        if not count:
+            return 0.0
+
+        rank = q * count
+        seen = 0
+        for index, value in enumerate(counts):
+            if value and seen + value >= rank:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - seen) / value
+            seen += value
+
+        return self.buckets[-1]
+
+    def stats(self):
+        """ Returns the histogram summary for monitoring.
+
+        Returns
+        -------
+        dict
+            ``count``, ``errors`` and the ``mean``, ``p50``, ``p95`` and
+            ``p99`` latencies in seconds
+        """
+
+        with self.lock:
+            count, errors, total = self.count, self.errors, self.total
+
+        return {
+            'count': count,
+            'errors': errors,
+            'mean': total / count if count else 0.0,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+        }
+
+
+class Metrics(object):
+    """ The histograms of an application, by endpoint. Endpoints are grouped
+    by their endpoint prefix, the name of the blueprint or ``Include``
+    endpoint prefix they were registered under.
+
+    Stored in ``app.extensions['via']['metrics']``, see :func:`install`.
+
+    .. versionadded:: 2015.2.0
+
+    Example
+    -------
+    .. sourcecode:: python
+
+        app.config['VIA_METRICS'] = True
+        via.init_app(app)
+
+        metrics = app.extensions['via']['metrics']
+        print(metrics.stats()['admin.users']['p99'])
+    """
+
+    def __init__(self, app, ignore=(), buckets=BUCKETS):
+        """ Constructor.
+
+        Arguments
+        ---------
+        app : flask.app.Flask
+            Flask application instance
+
+        Keyword Arguments
+        -----------------
+        ignore : iterable, optional
+            Endpoints not to measure, defaults to ``()``
+        buckets : tuple, optional
+            Upper bounds of the buckets in seconds, defaults to ``BUCKETS``
+        """
+
+        self.app = app
+        self.ignore = set(ignore)
+        self.buckets = buckets
+        self.histograms = {}
+
+    def instrument(self):
+        """ Wraps the views of endpoints registered since the last call,
+        ``Via`` calls this once its routes, or those of a deferred
+        blueprint, are registered.
+        """
+
+        deferred = self.app.extensions.get('via', {}).get('deferred', {})
+        placeholders = set(loader.endpoint for loader in deferred.values())
+        view_functions = self.app.view_functions
+
+        for endpoint, view in list(view_functions.items()):
+            if (endpoint in self.ignore or
+                    endpoint in placeholders or
+                    view_histogram(view) is not None):
+                continue
+            histogram = self.histograms.get(endpoint)
+            if histogram is None:
+                histogram = Histogram(endpoint, self.buckets)
+                self.histograms[endpoint] = histogram
+            view_functions[endpoint] = measured(view, histogram)
+
+    def stats(self):
+        """ Returns the summary of every endpoint, see
+        :meth:`Histogram.stats`.
+
+        Returns
+        -------
+        dict
+            Summaries by endpoint
+        """
+
+        return dict((n, h.stats()) for n, h in self.histograms.items())
+
+    def groups(self):
+        """ Returns the summary of every group of endpoints, their histograms
+        merged so percentiles are those of the group's requests. Endpoints
+        without a prefix form the ``''`` group.
+
+        Returns
+        -------
+        dict
+            Summaries by group
+        """
+
+        groups = {}
+        for endpoint, histogram in self.histograms.items():
+            name = group(endpoint)
+            if name not in groups:
+                groups[name] = Histogram(name, self.buckets)
+            groups[name].merge(histogram)
+
+        return dict((n, h.stats()) for n, h in groups.items())
+
+    def report(self):
+        """ Returns a text report of every group followed by its endpoints,
+        latencies in milliseconds.
+
+        Returns
+        -------
+        str
+            One line per group and endpoint
+        """
+
+        endpoints = self.stats()
+        groups = self.groups()
+
+        lines = ['{0:>9} {1:>7} {2:>9} {3:>9} {4:>9}  {5}'.format(
+            'count', 'errors', 'p50', 'p95', 'p99', 'name')]
+
+        def line(name, stats):
+            lines.append(
+                '{0:>9} {1:>7} {2:>7.2f}ms {3:>7.2f}ms {4:>7.2f}ms  '
+                '{5}'.format(
+                    stats['count'],
+                    stats['errors'],
+                    stats['p50'] * 1000,
+                    stats['p95'] * 1000,
+                    stats['p99'] * 1000,
+                    name))
+
+        for name in sorted(groups):
+            line('{0}.*'.format(name) if name else '*', groups[name])
+            for endpoint in sorted(endpoints):
+                if group(endpoint) == name:
+                    line('  ' + endpoint, endpoints[endpoint])
+
+        return '\n'.join(lines)
+
+
+def install(app, ignore=()):
+    """ Measures the endpoints of an application, optionally registering a
+    text report at ``VIA_METRICS_URL``.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    app : flask.app.Flask
+        Flask application instance
+
+    Keyword Arguments
+    -----------------
+    ignore : iterable, optional
+        Endpoints not registered by ``Via``, defaults to ``()``
+
+    Returns
+    -------
+    Metrics
+        The application metrics
+    """
+
+    extension = app.extensions.setdefault('via', {})
+    metrics = extension.get('metrics')
+    if metrics is None:
+        metrics = Metrics(
+            app,
+            ignore,
+            app.config.get('VIA_METRICS_BUCKETS', BUCKETS))
+        extension['metrics'] = metrics
+
+    metrics.instrument()
+
+    url = app.config.get('VIA_METRICS_URL')
+    if url:
+        metrics.ignore.add('via_metrics')
+        app.add_url_rule(
+            url,
+            'via_metrics',
+            lambda: Response(metrics.report(), mimetype='text/plain'))
+
+    return metrics
+
+
+def latency_stats(app):
+    """ Returns the summary of every endpoint measured, see
+    :meth:`Metrics.stats`, or an empty dict if ``VIA_METRICS`` is disabled.
+
+    .. versionadded:: 2015.2.0
+    """
+
+    metrics = app.extensions.get('via', {}).get('metrics')
+    if metrics is None:
+        return {}
+
+    return metrics.stats()
+
+
+def group(endpoint):
+    """ Returns the group of an endpoint, its prefix up to the last dot.
+    """
+
+    return endpoint.rpartition('.')[0]
+
+
+def failed(rv):
+    """ Returns whether a view return value is a server error response.
+    """
+
+    status = getattr(rv, 'status_code', None)
+    if status is None and type(rv) is tuple and len(rv) > 1:
+        status = rv[1]
+
+    return isinstance(status, int) and status >= 500
+
+
+def measured(view, histogram):
+    """ Wraps a view to count its requests in a histogram.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    view : function
+        The view function
+    histogram : Histogram
+        Histogram of the endpoint
+
+    Returns
+    -------
+    function
+        The view
+    """
+
+    observe = histogram.observe
+
+    def measure(*args, **kwargs):
+        start = timer()
+        try:
+            rv = view(*args, **kwargs)
+        except HTTPException as e:
+            observe(timer() - start, (e.code or 500) >= 500)
+            raise
+        except Exception:
+            observe(timer() - start, True)
+            raise
+        observe(timer() - start, failed(rv))
+        return rv
+
+    return update_view(measure, view, histogram=histogram)
+
+
+def view_histogram(view):
+    """ Returns the histogram measuring a view or ``None``.
+
+    .. versionadded:: 2015.2.0
+    """
+
+    histogram = getattr(view, 'histogram', None)
+    if isinstance(histogram, Histogram):
+        return histogram
+
+    return None
+
+
+def unmeasured(view):
+    """ Returns the view wrapped by :func:`measured`.
+    """
+
+    if view_histogram(view) is not None:
+        return view.__wrapped__
+
+    return view
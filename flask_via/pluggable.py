@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+"""
+flask_via.pluggable
+-------------------
+
+View functions for stateless pluggable views which reuse their view
+instances. :meth:`flask.views.View.as_view` creates an instance of the view
+class for every request and :class:`flask.views.MethodView` looks up the
+handler of the request method on it each time.
+"""
+
+import threading
+
+from flask import request
+from flask.views import MethodView
+
+
+def reusable_view(view_class, name):
+    """ Returns the view function of a pluggable view class, as
+    :meth:`flask.views.View.as_view` does, which creates one instance of
+    the class per thread and reuses it for every request. The view class
+    must not keep request state on its instances, and is created without
+    arguments. Instances are not pooled between threads, which would take a
+    lock on every request.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    view_class : class
+        The pluggable view class
+    name : str
+        The view name, used as its endpoint
+
+    Returns
+    -------
+    function
+        The view function
+    """
+
+    handlers = method_handlers(view_class)
+    local = threading.local()
+
+    def view(*args, **kwargs):
+        try:
+            instance = local.instance
+        except AttributeError:
+            instance = local.instance = view_class()
+
+        handler = handlers.get(request.method)
+        if handler is None:
+            return instance.dispatch_request(*args, **kwargs)
+
+        return handler(instance, *args, **kwargs)
+
+    if view_class.decorators:
+        view.__name__ = name
+        view.__module__ = view_class.__module__
+        for decorator in view_class.decorators:
+            view = decorator(view)
+
+    view.view_class = view_class
+    view.__name__ = name
+    view.__doc__ = view_class.__doc__
+    view.__module__ = view_class.__module__
+    view.methods = view_class.methods
+    view.reuse = True
+
+    return view
+
+
+def method_handlers(view_class):
+    """ Returns the handlers of a :class:`flask.views.MethodView` class by
+    request method, as its ``dispatch_request`` finds them, or an empty
+    dict for other views and method views dispatching requests themselves.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    view_class : class
+        The pluggable view class
+
+    Returns
+    -------
+    dict
+        Handlers by upper case request method
+    """
+
+    dispatch = getattr(
+        view_class.dispatch_request,
+        '__func__',
+        view_class.dispatch_request)
+    if not issubclass(view_class, MethodView) or dispatch is not getattr(
+            MethodView.dispatch_request,
+            '__func__',
+            MethodView.dispatch_request):
+        return {}
+
+    handlers = {}
+    for method in view_class.methods or ():
+        handler = getattr(view_class, method.lower(), None)
+        if handler is not None:
+            handlers[method.upper()] = handler
+
+    # Head requests are handled by get unless handled themselves
+    if 'HEAD' not in handlers and 'GET' in handlers:
+        handlers['HEAD'] = handlers['GET']
+
+    return handlers
+
+
+def reused(view):
+    """ Returns whether a view, or lazy view, reuses its view instances.
+
+    .. versionadded:: 2015.2.0
+    """
+
+    return getattr(view, 'reuse', False) is True
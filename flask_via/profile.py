@@ -0,0 +1,453 @@
+# -*- coding: utf-8 -*-
+
+"""
+flask_via.profile
+-----------------
+
+Records where time is spent while ``Via`` registers routes, enabled with the
+``VIA_PROFILE`` configuration variable, and in the views of endpoints
+selected with ``VIA_PROFILE_ENDPOINTS``.
+"""
+
+import cProfile
+import json
+import os
+import tempfile
+import threading
+import time
+
+from fnmatch import fnmatchcase
+from flask_via.metrics import measured, unmeasured, view_histogram
+from flask_via.wrappers import update_view
+
+
+#: Only one profiler can be enabled at a time, requests arriving while
+#: another is profiled run unprofiled
+profiling = threading.Lock()
+
+
+class ProfileNode(object):
+    """ A routes module include or a router in the profile tree.
+
+    .. versionadded:: 2015.2.0
+
+    Attributes
+    ----------
+    name : str
+        ``module:routes_name`` for includes, router ``repr`` for routers
+    kind : str
+        ``include`` or ``router``
+    import_time : float
+        Seconds spent importing the routes module
+    compile_time : float
+        Seconds spent compiling, including children
+    apply_time : float
+        Seconds spent adding the compiled entries to the application,
+        including children
+    rules : int
+        Number of entries produced, including children
+    cached : bool
+        Whether the entries were taken from an earlier include of the same
+        routes module
+    children : list
+        Child nodes
+    """
+
+    def __init__(self, name, kind):
+        self.name = name
+        self.kind = kind
+        self.import_time = 0.0
+        self.compile_time = 0.0
+        self.apply_time = 0.0
+        self.rules = 0
+        self.cached = False
+        self.children = []
+
+    def __repr__(self):
+        return '<ProfileNode {0} {1}>'.format(self.kind, self.name)
+
+    @property
+    def total_time(self):
+        """ Import, compile and apply time.
+        """
+
+        return self.import_time + self.compile_time + self.apply_time
+
+    def walk(self):
+        """ Yields this node and every descendant, depth first.
+        """
+
+        yield self
+        for child in self.children:
+            for node in child.walk():
+                yield node
+
+    def as_dict(self):
+        """ Returns the node and its children as JSON serialisable dicts.
+        """
+
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'import_time': self.import_time,
+            'compile_time': self.compile_time,
+            'apply_time': self.apply_time,
+            'rules': self.rules,
+            'cached': self.cached,
+            'children': [c.as_dict() for c in self.children],
+        }
+
+
+class Profiler(object):
+    """ Builds a tree of :class:`ProfileNode` while routes are compiled and
+    applied. ``Via`` passes the profiler to routers as the ``profiler``
+    keyword argument, when profiling is disabled it is not passed at all.
+
+    .. versionadded:: 2015.2.0
+
+    Example
+    -------
+    .. sourcecode:: python
+
+        app.config['VIA_PROFILE'] = True
+        via.init_app(app)
+
+        profiler = app.extensions['via']['profile']
+        print(profiler.report())
+    """
+
+    def __init__(self):
+        """ Constructor.
+        """
+
+        self.root = ProfileNode('via', 'root')
+        self.stack = [self.root]
+
+    def push(self, name, kind):
+        """ Starts a node as a child of the current node.
+
+        Returns
+        -------
+        ProfileNode
+            The new node
+        """
+
+        node = ProfileNode(name, kind)
+        self.stack[-1].children.append(node)
+        self.stack.append(node)
+        return node
+
+    def pop(self):
+        """ Finishes the current node.
+        """
+
+        self.stack.pop()
+
+    def record_apply(self, timings):
+        """ Attributes the time taken to apply each entry to the nodes which
+        produced them. Entries are produced depth first, children before any
+        entries of their own, which is the order they are applied in.
+
+        Arguments
+        ---------
+        timings : list
+            Seconds taken to apply each entry, in order
+        """
+
+        timings = iter(timings)
+
+        def consume(node):
+            spent = 0.0
+            produced = 0
+            for child in node.children:
+                spent += consume(child)
+                produced += child.rules
+            for i in range(node.rules - produced):
+                spent += next(timings, 0.0)
+            node.apply_time = spent
+            return spent
+
+        consume(self.root)
+
+    def as_dict(self):
+        """ Returns the profile tree as JSON serialisable dicts.
+        """
+
+        return self.root.as_dict()
+
+    def json(self, **kwargs):
+        """ Returns the profile tree as a JSON string, ``kwargs`` are passed
+        to :func:`json.dumps`.
+        """
+
+        return json.dumps(self.as_dict(), **kwargs)
+
+    def report(self, limit=20):
+        """ Returns a text report of the slowest nodes.
+
+        Keyword Arguments
+        -----------------
+        limit : int, optional
+            Maximum number of nodes to report, defaults to ``20``
+
+        Returns
+        -------
+        str
+            One line per node sorted by total time, slowest first
+        """
+
+        nodes = sorted(
+            (n for n in self.root.walk() if n is not self.root),
+            key=lambda n: n.total_time,
+            reverse=True)[:limit]
+
+        lines = ['{0:>9} {1:>9} {2:>9} {3:>9} {4:>7}  {5}'.format(
+            'total', 'import', 'compile', 'apply', 'rules', 'name')]
+        for node in nodes:
+            lines.append(
+                '{0:>8.4f}s {1:>8.4f}s {2:>8.4f}s {3:>8.4f}s {4:>7}  '
+                '{5} {6}{7}'.format(
+                    node.total_time,
+                    node.import_time,
+                    node.compile_time,
+                    node.apply_time,
+                    node.rules,
+                    node.kind,
+                    node.name,
+                    ' (cached)' if node.cached else ''))
+
+        return '\n'.join(lines)
+
+
+def describe(route):
+    """ Returns a short description of a router for the profile tree, its
+    class name followed by its url or routes module.
+    """
+
+    target = getattr(route, 'url', None)
+    if target is None:
+        target = getattr(route, 'routes_module', None)
+
+    if target is None:
+        return type(route).__name__
+
+    return '{0} {1}'.format(type(route).__name__, target)
+
+
+class EndpointProfile(object):
+    """ Profiles the view of an endpoint with :mod:`cProfile` for a number
+    of requests, then writes the aggregated stats to a file readable with
+    :class:`pstats.Stats` and restores the view, so the endpoint no longer
+    has any overhead.
+
+    .. versionadded:: 2015.2.0
+
+    Attributes
+    ----------
+    count : int
+        Requests profiled so far
+    done : bool
+        Whether profiling finished and the view was restored
+    path : str
+        Stats file once written, else ``None``
+    """
+
+    def __init__(self, app, endpoint, requests=100, directory=None):
+        """ Constructor.
+
+        Arguments
+        ---------
+        app : flask.app.Flask
+            Flask application instance
+        endpoint : str
+            Endpoint to profile
+
+        Keyword Arguments
+        -----------------
+        requests : int, optional
+            Number of requests to profile, defaults to ``100``
+        directory : str, optional
+            Directory the stats are written to, defaults to the system
+            temporary directory
+        """
+
+        self.app = app
+        self.endpoint = endpoint
+        self.requests = requests
+        self.directory = directory or tempfile.gettempdir()
+        self.profile = cProfile.Profile()
+        self.count = 0
+        self.done = False
+        self.path = None
+        self.view = None
+        self.wrapper = None
+
+    def __repr__(self):
+        return '<EndpointProfile {0} {1}/{2}>'.format(
+            self.endpoint,
+            self.count,
+            self.requests)
+
+    def start(self):
+        """ Replaces the view of the endpoint with one profiling it. Views
+        measured by ``VIA_METRICS`` keep being measured.
+        """
+
+        self.view = self.app.view_functions[self.endpoint]
+
+        wrapper = profiled(unmeasured(self.view), self)
+        histogram = view_histogram(self.view)
+        if histogram is not None:
+            wrapper = measured(wrapper, histogram)
+
+        self.wrapper = wrapper
+        self.app.view_functions[self.endpoint] = wrapper
+
+    def run(self, view, *args, **kwargs):
+        """ Runs the view, profiled unless enough requests were profiled or
+        another request is being profiled.
+        """
+
+        if self.done or not profiling.acquire(False):
+            return view(*args, **kwargs)
+
+        try:
+            if self.done:
+                return view(*args, **kwargs)
+
+            try:
+                self.profile.enable()
+            except ValueError:
+                # Another profiler, not started by Via, is running
+                return view(*args, **kwargs)
+
+            try:
+                return view(*args, **kwargs)
+            finally:
+                self.profile.disable()
+                self.count += 1
+                if self.count >= self.requests:
+                    self.finish()
+        finally:
+            profiling.release()
+
+    def stop(self):
+        """ Stops profiling before enough requests were profiled, writing
+        the stats of those which were.
+
+        Returns
+        -------
+        str
+            Stats file, ``None`` if no request was profiled
+        """
+
+        with profiling:
+            if not self.done:
+                self.finish()
+
+        return self.path
+
+    def finish(self):
+        """ Writes the stats and restores the view, the caller holds the
+        ``profiling`` lock.
+        """
+
+        self.done = True
+        if self.count:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            self.path = os.path.join(
+                self.directory,
+                '{0}.{1}.prof'.format(self.endpoint, int(time.time())))
+            self.profile.dump_stats(self.path)
+
+        if self.app.view_functions.get(self.endpoint) is self.wrapper:
+            self.app.view_functions[self.endpoint] = self.view
+
+        profiles = self.app.extensions['via']['endpoint_profiles']
+        if profiles.get(self.endpoint) is self:
+            del profiles[self.endpoint]
+
+        self.app.logger.info(
+            'Profiled %s requests to %s: %s',
+            self.count,
+            self.endpoint,
+            self.path or 'no stats')
+
+
+def profile_endpoints(app, patterns=None, requests=None, directory=None):
+    """ Profiles the endpoints matching any of ``patterns`` for their next
+    ``requests`` requests, see :class:`EndpointProfile`. Endpoints already
+    profiled which no longer match are stopped, call again with different
+    patterns to change the selection while the application runs, other
+    endpoints are left untouched.
+
+    .. versionadded:: 2015.2.0
+
+    Example
+    -------
+    .. sourcecode:: python
+
+        profile_endpoints(app, ['admin.*', 'search'], requests=50)
+
+    Arguments
+    ---------
+    app : flask.app.Flask
+        Flask application instance
+
+    Keyword Arguments
+    -----------------
+    patterns : list, optional
+        Endpoint names or :mod:`fnmatch` patterns, defaults to
+        ``VIA_PROFILE_ENDPOINTS``
+    requests : int, optional
+        Requests to profile per endpoint, defaults to
+        ``VIA_PROFILE_REQUESTS`` or ``100``
+    directory : str, optional
+        Directory the stats are written to, defaults to
+        ``VIA_PROFILE_DIR`` or the system temporary directory
+
+    Returns
+    -------
+    dict
+        :class:`EndpointProfile` by endpoint
+    """
+
+    if patterns is None:
+        patterns = app.config.get('VIA_PROFILE_ENDPOINTS') or ()
+    if requests is None:
+        requests = app.config.get('VIA_PROFILE_REQUESTS', 100)
+    if directory is None:
+        directory = app.config.get('VIA_PROFILE_DIR')
+
+    profiles = app.extensions.setdefault('via', {}).setdefault(
+        'endpoint_profiles',
+        {})
+
+    def selected(endpoint):
+        return any(fnmatchcase(endpoint, p) for p in patterns)
+
+    for endpoint, profile in list(profiles.items()):
+        if not selected(endpoint):
+            profile.stop()
+
+    for endpoint in list(app.view_functions):
+        if endpoint in profiles or not selected(endpoint):
+            continue
+        profile = EndpointProfile(app, endpoint, requests, directory)
+        profiles[endpoint] = profile
+        profile.start()
+
+    return dict(profiles)
+
+
+def profiled(view, profile):
+    """ Wraps a view to run through an :class:`EndpointProfile`.
+
+    .. versionadded:: 2015.2.0
+    """
+
+    def run(*args, **kwargs):
+        return profile.run(view, *args, **kwargs)
+
+    return update_view(run, view, profile=profile)
@@ -0,0 +1,459 @@
+# -*- coding: utf-8 -*-
+
+"""
+flask_via.reloader
+------------------
+
+Reloads changed routes modules in a running development server, registering
+only the url rules which changed rather than restarting the process and
+importing every routes module again.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+
+from flask import request
+from flask_via.deferred import setup
+from flask_via.files import is_routes_file
+from flask_via.lazy import LazyView, resolve_views
+from flask_via.manifest import module_file
+from flask_via.table import (
+    BlueprintRule, Rule, apply, check_options, unwrap, view_options)
+from werkzeug.exceptions import HTTPException
+
+try:
+    from importlib import reload as reload_module
+except ImportError:  # Python 2
+    reload_module = reload  # noqa
+
+#: Exit status the Werkzeug reloader restarts the process on
+RESTART = 3
+
+
+class Reloader(object):
+    """ Watches the source files of the routes modules included to compile
+    an application's routes. Once one changes the module is reloaded, the
+    routes tree compiled again, unchanged modules being ``sys.modules``
+    lookups, and the new table compared to the registered one. Url rules
+    which were removed or changed are removed from the url map and rules
+    which were added or changed are registered.
+
+    Changes are checked for before the request is matched, so the request
+    noticing them is matched against the new url rules.
+
+    Changes to blueprints and to routers which do not implement ``compile``
+    cannot be applied to a running application, ``fallback`` is called
+    instead, by default restarting the process when it runs under the
+    Werkzeug reloader.
+
+    The reloader is stored in ``app.extensions['via']['reloader']``, see
+    :func:`install`.
+
+    .. versionadded:: 2015.2.0
+    """
+
+    def __init__(
+            self,
+            via,
+            app,
+            table,
+            routes_module,
+            routes_name,
+            interval=1.0,
+            fallback=None,
+            **kwargs):
+        """ Constructor.
+
+        Arguments
+        ---------
+        via : flask_via.Via
+            Compiles the routes tree
+        app : flask.app.Flask
+            Flask application instance
+        table : flask_via.table.RouteTable
+            The registered routes
+        routes_module : str
+            Python dotted path to the root routes module
+        routes_name : str
+            Name of the variable holding the routes in the module
+
+        Keyword Arguments
+        -----------------
+        interval : float, optional
+            Seconds between checks for changed files, defaults to ``1.0``
+        fallback : function, optional
+            Called with the application when changes cannot be applied,
+            defaults to :func:`restart`
+        \*\*kwargs
+            Arbitrary keyword arguments passed in to ``init_app``
+        """
+
+        self.via = via
+        self.app = app
+        self.table = table
+        self.routes_module = routes_module
+        self.routes_name = routes_name
+        self.interval = interval
+        self.fallback = fallback or restart
+        self.kwargs = kwargs
+        self.checked = time.time()
+        self.lock = threading.Lock()
+        self.files = {}
+        self.mtimes = self.watch(table)
+
+    def watch(self, table):
+        """ Finds the source files of the routes modules a table was
+        compiled from, also when it was read from ``VIA_ROUTES_MANIFEST``,
+        returning their modification times.
+
+        Returns
+        -------
+        dict
+            Modification times by routes module
+        """
+
+        for routes_module in table.modules:
+            if routes_module not in self.files:
+                self.files[routes_module] = module_file(routes_module)
+
+        return self.stat()
+
+    def stat(self):
+        """ Returns the modification time of each watched file.
+        """
+
+        mtimes = {}
+        for routes_module, filename in self.files.items():
+            try:
+                mtimes[routes_module] = os.stat(filename).st_mtime
+            except (OSError, TypeError):
+                mtimes[routes_module] = None
+
+        return mtimes
+
+    def check(self):
+        """ Reloads changed routes modules, at most once every ``interval``
+        seconds.
+
+        Returns
+        -------
+        bool
+            Whether url rules of the application changed
+        """
+
+        if time.time() - self.checked < self.interval:
+            return False
+
+        with self.lock:
+            if time.time() - self.checked < self.interval:
+                return False
+            self.checked = time.time()
+
+            mtimes = self.stat()
+            changed = [
+                routes_module for routes_module, mtime in mtimes.items()
+                if mtime != self.mtimes.get(routes_module)]
+            # Changes which fail to import are raised once, the registered
+            # routes are kept until the module changes again
+            self.mtimes = mtimes
+
+            if changed:
+                return self.reload(changed)
+
+            return False
+
+    def preprocess(self, endpoint, values):
+        """ Url value preprocessor, checks for changed routes modules before
+        other preprocessors and ``before_request`` functions run and matches
+        the request again once the url rules changed. The view the request
+        was first matched to may have been removed.
+        """
+
+        if not self.check():
+            return
+
+        request.url_rule = request.view_args = None
+        request.routing_exception = None
+        adapter = self.app.create_url_adapter(request)
+        try:
+            request.url_rule, request.view_args = adapter.match(
+                return_rule=True)
+        except HTTPException as e:
+            request.routing_exception = e
+            return
+
+        # Requests to attached routes are matched against them again
+        attached = self.app.extensions['via'].get('attached', {})
+        for attachment in attached.values():
+            attachment.match(request.endpoint, request.view_args)
+
+    def reload(self, changed):
+        """ Reloads routes modules and registers the changes to the routes
+        tree, see :func:`changes`.
+
+        Arguments
+        ---------
+        changed : list
+            Python dotted paths of changed routes modules, route files are
+            read again once changed
+
+        Returns
+        -------
+        bool
+            Whether url rules of the application changed, ``False`` when
+            ``fallback`` was called instead
+        """
+
+        for routes_module in changed:
+            module = sys.modules.get(routes_module)
+            if module is not None and not is_routes_file(routes_module):
+                reload_module(module)
+
+        table = self.via.compile(
+            self.app,
+            self.routes_module,
+            self.routes_name,
+            **self.kwargs)
+
+        difference = changes(self.table, table)
+        if difference is None:
+            self.app.logger.info(
+                'Routes in %s cannot be reloaded, reloading application',
+                ', '.join(sorted(changed)))
+            self.fallback(self.app)
+            return False
+
+        added, removed = difference
+        check_options(self.app, added)
+        with setup(self.app):
+            for entry in removed:
+                remove_rule(self.app, entry)
+            for entry in added:
+                # The old view of a changed rule is replaced
+                self.app.view_functions.pop(endpoint(entry), None)
+            apply(self.app, added)
+
+        extension = self.app.extensions['via']
+        if extension.get('metrics') is not None:
+            extension['metrics'].instrument()
+        if self.app.config.get('VIA_RESOLVE_VIEWS'):
+            resolve_views(self.app)
+
+        self.table = table
+        self.mtimes = self.watch(table)
+
+        self.app.logger.info(
+            'Reloaded %s: %d rules added, %d removed',
+            ', '.join(sorted(changed)),
+            len(added),
+            len(removed))
+
+        return True
+
+
+def install(via, app, table, routes_module, routes_name, **kwargs):
+    """ Reloads the routes of an application as their routes modules
+    change, checking every ``VIA_RELOAD_INTERVAL`` seconds before requests
+    are preprocessed.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    via : flask_via.Via
+        Compiles the routes tree
+    app : flask.app.Flask
+        Flask application instance
+    table : flask_via.table.RouteTable
+        The registered routes
+    routes_module : str
+        Python dotted path to the root routes module
+    routes_name : str
+        Name of the variable holding the routes in the module
+    \*\*kwargs
+        Arbitrary keyword arguments passed in to ``init_app``
+
+    Returns
+    -------
+    Reloader
+        The reloader of the application
+    """
+
+    kwargs.pop('profiler', None)
+    reloader = Reloader(
+        via,
+        app,
+        table,
+        routes_module,
+        routes_name,
+        interval=app.config.get('VIA_RELOAD_INTERVAL', 1.0),
+        **kwargs)
+
+    app.extensions.setdefault('via', {})['reloader'] = reloader
+    # Runs before url value preprocessors registered earlier
+    app.url_value_preprocessors.setdefault(None, []).insert(
+        0,
+        reloader.preprocess)
+
+    return reloader
+
+
+def changes(old, new):
+    """ Compares the url rules of two tables registered with the same
+    application.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    old : flask_via.table.RouteTable
+        The registered table
+    new : flask_via.table.RouteTable
+        The table to register instead
+
+    Returns
+    -------
+    tuple or None
+        ``(added, removed)`` lists of :class:`flask_via.table.Rule`
+        entries, ``None`` if blueprints, rules of blueprints or routers
+        which do not implement ``compile`` changed
+    """
+
+    if others(old) != others(new):
+        return None
+
+    old_rules = rules(old)
+    new_rules = rules(new)
+
+    added = [e for k, e in new_rules.items() if k not in old_rules]
+    removed = [e for k, e in old_rules.items() if k not in new_rules]
+
+    if any(e.blueprint is not None for e in added + removed):
+        return None
+
+    order = dict((id(e), i) for i, e in enumerate(new.entries))
+    added.sort(key=lambda e: order[id(e)])
+
+    return added, removed
+
+
+def rules(table):
+    """ Returns the :class:`flask_via.table.Rule` entries of a table by a
+    key which changes when the rule or its view changes.
+    """
+
+    entries = [e for e in table.entries if isinstance(e, Rule)]
+
+    keyed = {}
+    for entry, described in zip(entries, table.rules()):
+        options = view_options(entry.view)
+        keyed[described + (
+            view_key(entry.view),
+            repr(sorted(entry.options.items())),
+            tuple(options[name] for name in sorted(options)))] = entry
+
+    return keyed
+
+
+def view_key(view):
+    """ Returns what identifies a view across compiles, views created by
+    routers when compiled are compared by what they were created from.
+    """
+
+    view = unwrap(view)
+    if isinstance(view, LazyView):
+        return (view.path, view.name)
+
+    return getattr(view, 'view_class', view)
+
+
+def others(table):
+    """ Returns what identifies the entries of a table which are not url
+    rules of the application.
+    """
+
+    described = []
+    for entry in table.entries:
+        if isinstance(entry, BlueprintRule):
+            described.append((
+                entry.name,
+                entry.import_name,
+                repr(sorted(entry.options.items())),
+                id(entry.instance)))
+        elif not isinstance(entry, Rule):
+            described.append((
+                id(entry.router),
+                repr(sorted(entry.kwargs.items()))))
+
+    return described
+
+
+def endpoint(entry):
+    """ Returns the endpoint a rule registers.
+    """
+
+    return entry.endpoint or entry.view.__name__
+
+
+def remove_rule(app, entry):
+    """ Removes the url rules registered for a rule entry from the url map,
+    and its view once no rules for its endpoint are left.
+    """
+
+    url_map = app.url_map
+    name = endpoint(entry)
+    subdomain = entry.options.get('subdomain')
+
+    def matches(rule):
+        return (
+            rule.endpoint == name and
+            rule.rule == entry.url and
+            (subdomain is None or rule.subdomain == subdomain))
+
+    url_map._rules = [r for r in url_map._rules if not matches(r)]
+    left = [
+        r for r in url_map._rules_by_endpoint.get(name, ())
+        if not matches(r)]
+    if left:
+        url_map._rules_by_endpoint[name] = left
+    else:
+        url_map._rules_by_endpoint.pop(name, None)
+        app.view_functions.pop(name, None)
+    url_map._remap = True
+
+
+def restart(app):
+    """ Exits the process with status ``3``, the Werkzeug reloader then
+    starts a new one, the same as when it notices a changed file itself.
+
+    Called from a request thread, where raising ``SystemExit`` would only end
+    that thread, logging is flushed and the process exits immediately.
+    Processes not started by the Werkzeug reloader, which nothing would
+    restart, log a warning instead and keep serving the routes they have.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    app : flask.app.Flask
+        Flask application instance
+    """
+
+    if os.environ.get('WERKZEUG_RUN_MAIN') != 'true':
+        app.logger.warning(
+            'Changed routes cannot be reloaded and the application does not '
+            'run under the Werkzeug reloader, restart it to apply them')
+        return
+
+    app.logger.info('Exiting with status 3 for the reloader to restart')
+
+    if threading.current_thread().name == 'MainThread':
+        sys.exit(RESTART)
+
+    logging.shutdown()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(RESTART)
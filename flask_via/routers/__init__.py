@@ -7,7 +7,8 @@ flask_via.routers
 Base router classes and utilities.
 """
 
-from flask_via import RoutesImporter
+from flask_via import VIEW_OPTIONS, RoutesImporter
+from flask_via.lazy import interned
 
 
 class BaseRouter(object):
@@ -29,8 +30,16 @@ class BaseRouter(object):
 
             def add_to_app(self, app):
                 ...
+
+    Note
+    ----
+    Routers stay referenced by their routes modules for the life of the
+    process, so routers declare ``__slots__`` rather than carry a
+    ``__dict__``. Subclasses which do not declare them still work.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         """ Constructor should be overridden to accept specific arguments
         for the router.
@@ -55,6 +64,65 @@ class BaseRouter(object):
 
         raise NotImplementedError('add_to_app must be overridden')
 
+    def compile(self, app, **kwargs):
+        """ Optional method returning the routes this router would add to
+        the application as a list of :mod:`flask_via.table` entries, without
+        adding them. Routers which do not implement this cannot be stored in
+        a routes manifest.
+
+        .. versionadded:: 2015.2.0
+
+        Raises
+        ------
+        NotImplementedError
+            If method not implemented
+        """
+
+        raise NotImplementedError('compile must be overridden')
+
+    def option(self, name, kwargs):
+        """ Returns a view option, see ``flask_via.VIEW_OPTIONS``, given to
+        this router or else passed on by the router including it.
+
+        .. versionadded:: 2015.2.0
+
+        Arguments
+        ---------
+        name : str
+            Option name, for example ``cache``
+        kwargs : dict
+            Keyword arguments passed in to ``compile``
+
+        Returns
+        -------
+        object
+            The option value or ``None``
+        """
+
+        value = getattr(self, name, None)
+        if value is None:
+            value = kwargs.get(name)
+
+        return value
+
+    def inherit(self, kwargs):
+        """ Injects the view options given to this router into the keyword
+        arguments passed on to included routes, replacing those of outer
+        routers.
+
+        .. versionadded:: 2015.2.0
+
+        Arguments
+        ---------
+        kwargs : dict
+            Keyword arguments passed on to included routes, updated in place
+        """
+
+        for name in VIEW_OPTIONS:
+            value = getattr(self, name, None)
+            if value is not None:
+                kwargs[name] = value
+
 
 class Include(BaseRouter, RoutesImporter):
     """ Adds the ability to include routes from other modules, this can be
@@ -68,12 +136,24 @@ class Include(BaseRouter, RoutesImporter):
     This is not a implementation of Flask blueprints
     """
 
+    __slots__ = (
+        'routes_module',
+        'routes_name',
+        'url_prefix',
+        'endpoint',
+        'cache',
+        'executor',
+        'limit')
+
     def __init__(
             self,
             routes_module,
             routes_name=None,
             url_prefix=None,
-            endpoint=None):
+            endpoint=None,
+            cache=None,
+            executor=None,
+            limit=None):
         """ Constructor for Include router, taking the passed arguments
         and storing them on the instance.
 
@@ -86,6 +166,12 @@ class Include(BaseRouter, RoutesImporter):
             * ``routes_name`` keyword argument default value set to ``None``
             * ``endpoint`` keyword argument added
 
+        .. versionchanged:: 2015.2.0
+
+            * ``cache`` keyword argument added
+            * ``executor`` keyword argument added
+            * ``limit`` keyword argument added
+
         Arguments
         ---------
         routes_module : str
@@ -101,12 +187,27 @@ class Include(BaseRouter, RoutesImporter):
             to ``None``
         endpoint : str, optional
             Prefix an endpoint to all routes included, defaults to ``None``
+        cache : flask_via.cache.ResponseCache, optional
+            Serves responses of all routes included from this cache, ``False``
+            to not cache them when included by a router given a cache,
+            defaults to ``None``
+        executor : str, flask_via.executors.Bulkhead, optional
+            Runs the views of all routes included on this executor, ``False``
+            to run them on the request thread when included by a router
+            given an executor, defaults to ``None``
+        limit : str, flask_via.limits.Limiter, optional
+            Admits requests to all routes included through this limit,
+            ``False`` to not limit them when included by a router given a
+            limit, defaults to ``None``
         """
 
         self.routes_module = routes_module
         self.routes_name = routes_name
-        self.url_prefix = url_prefix
-        self.endpoint = endpoint
+        self.url_prefix = interned(url_prefix)
+        self.endpoint = interned(endpoint)
+        self.cache = cache
+        self.executor = executor
+        self.limit = limit
 
     def add_to_app(self, app, **kwargs):
         """ Instead of adding a route to the flask application this will
@@ -121,6 +222,10 @@ class Include(BaseRouter, RoutesImporter):
 
             * ``endpoint`` now injects into kwargs when loading in routes
 
+        .. versionchanged:: 2015.2.0
+
+            * Raises ``ImproperlyConfigured`` on include cycles
+
         Arguments
         ---------
         app : flask.app.Flask
@@ -133,6 +238,36 @@ class Include(BaseRouter, RoutesImporter):
         if not self.routes_name:
             self.routes_name = app.config.get('VIA_ROUTES_NAME', 'routes')
 
+        kwargs = self.prefix(**kwargs)
+        kwargs['include_path'] = self.trace(
+            self.routes_module,
+            self.routes_name,
+            **kwargs)
+
+        # Get the routes
+        routes = self.include(self.routes_module, self.routes_name)
+
+        # Load the routes
+        self.load(app, routes, **kwargs)
+
+    def prefix(self, **kwargs):
+        """ Injects this routers ``url_prefix``, ``endpoint`` and view
+        options, see ``flask_via.VIEW_OPTIONS``, into the keyword arguments
+        passed on to included routes.
+
+        .. versionadded:: 2015.2.0
+
+        Arguments
+        ---------
+        \*\*kwargs
+            Arbitrary keyword arguments passed in to ``init_app``
+
+        Returns
+        -------
+        dict
+            Updated keyword arguments
+        """
+
         # Inject url_prefix into kwargs
         if self.url_prefix:
             # This allows us to chain url prefix's when multiple includes
@@ -154,8 +289,36 @@ class Include(BaseRouter, RoutesImporter):
             finally:
                 kwargs['endpoint'] = endpoint + self.endpoint + '.'
 
-        # Get the routes
-        routes = self.include(self.routes_module, self.routes_name)
+        # Inject view options into kwargs
+        self.inherit(kwargs)
 
-        # Load the routes
-        self.load(app, routes, **kwargs)
+        return kwargs
+
+    def compile(self, app, **kwargs):
+        """ Compiles the included routes rather than adding them to the
+        application, see :meth:`add_to_app`.
+
+        .. versionadded:: 2015.2.0
+
+        Arguments
+        ---------
+        app : flask.app.Flask
+            Flask application instance
+        \*\*kwargs
+            Arbitrary keyword arguments passed in to ``init_app``
+
+        Returns
+        -------
+        list
+            List of compiled entries
+        """
+
+        routes_name = self.routes_name or app.config.get(
+            'VIA_ROUTES_NAME',
+            'routes')
+
+        return self.compile_module(
+            app,
+            self.routes_module,
+            routes_name,
+            **self.prefix(**kwargs))
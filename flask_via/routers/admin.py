@@ -54,6 +54,8 @@ class AdminRoute(BaseRouter):
             app.run(debug=True)
     """
 
+    __slots__ = ('view',)
+
     def __init__(self, view):
         """ Admin route constructor, this router handles adding ``Flask-admin``
         views to the application.
@@ -25,7 +25,13 @@ import warnings
 
 from flask import Blueprint as FlaskBlueprint
 from flask_via import RoutesImporter
+from flask_via.deferred import DeferredLoader
+from flask_via.coroutines import sync
+from flask_via.exceptions import ImproperlyConfigured
+from flask_via.lazy import LazyView, as_view, interned, string_types
 from flask_via.routers import BaseRouter
+from flask_via.table import BlueprintRule, Rule, apply, check_options, wrap
+from werkzeug.utils import import_string
 
 
 class Functional(BaseRouter):
@@ -48,16 +54,33 @@ class Functional(BaseRouter):
         ]
     """
 
-    def __init__(self, url, func, endpoint=None):
+    __slots__ = ('url', 'func', 'endpoint', 'cache', 'executor', 'limit')
+
+    def __init__(
+            self,
+            url,
+            func,
+            endpoint=None,
+            cache=None,
+            executor=None,
+            limit=None):
         """ Basic router constructor, stores passed arguments on the
         instance.
 
+        .. versionchanged:: 2015.2.0
+
+            * ``func`` can be a python dotted path to the view function
+            * Added ``cache`` keyword argument
+            * Added ``executor`` keyword argument
+            * Added ``limit`` keyword argument
+
         Arguments
         ---------
         url : str
             The url to use for the route
-        func : function
-            The view function to connect the route with
+        func : function, str
+            The view function to connect the route with, or its python
+            dotted path in which case the view is imported on first request
 
         Keyword Arguments
         -----------------
@@ -65,11 +88,29 @@ class Functional(BaseRouter):
             Optional endpoint string, by default flask will use the
             view function name as the endpoint name, use this argument
             to change the endpoint name.
+        cache : flask_via.cache.ResponseCache, optional
+            Serves responses of the view from this cache, ``False`` to not
+            cache a route included by a router given a cache, defaults to
+            ``None``
+        executor : str, flask_via.executors.Bulkhead, optional
+            Runs the view on this executor, ``False`` to run it on the request
+            thread when included by a router given an executor, defaults to
+            ``None``
+        limit : str, flask_via.limits.Limiter, optional
+            Admits requests to the view through this limit, ``False`` to not
+            limit a route included by a router given a limit, defaults to
+            ``None``
         """
 
-        self.url = url
+        if isinstance(func, string_types):
+            func = LazyView(func)
+
+        self.url = interned(url)
         self.func = func
-        self.endpoint = endpoint
+        self.endpoint = interned(endpoint)
+        self.cache = cache
+        self.executor = executor
+        self.limit = limit
 
     def add_to_app(self, app, **kwargs):
         """ Adds the url route to the flask application object.mro
@@ -90,6 +131,26 @@ class Functional(BaseRouter):
             Arbitrary keyword arguments passed in to ``init_app``
         """
 
+        apply(app, self.compile(app, **kwargs))
+
+    def compile(self, app, **kwargs):
+        """ Returns the url rule :meth:`add_to_app` would add.
+
+        .. versionadded:: 2015.2.0
+
+        Arguments
+        ---------
+        app : flask.app.Flask
+            Flask application instance
+        \*\*kwargs
+            Arbitrary keyword arguments passed in to ``init_app``
+
+        Returns
+        -------
+        list
+            A single :class:`flask_via.table.Rule`
+        """
+
         url = self.url
         endpoint = self.endpoint
 
@@ -105,11 +166,22 @@ class Functional(BaseRouter):
                 endpoint = self.func.__name__
             endpoint = kwargs['endpoint'] + endpoint
 
-        try:
-            app.add_url_rule(url, endpoint, self.func)
-        except AssertionError:
-            # TODO: Log / Warn
-            pass
+        url = interned(url)
+        endpoint = interned(endpoint)
+
+        view = wrap(
+            sync(self.func),
+            cache=self.option('cache', kwargs),
+            executor=self.option('executor', kwargs),
+            limit=self.option('limit', kwargs))
+
+        return [Rule(
+            url,
+            endpoint,
+            view,
+            None,
+            kwargs.get('blueprint'),
+            {})]
 
 
 class Basic(Functional):
@@ -120,6 +192,8 @@ class Basic(Functional):
     .. deprecated:: 2014.05.19
     """
 
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         """ Issues ``DeprecationWarning`` as this is deprecated and will be
         removed in a later version.
@@ -161,6 +235,16 @@ class Pluggable(BaseRouter):
         ]
     """
 
+    __slots__ = (
+        'url',
+        'view',
+        'endpoint',
+        'cache',
+        'executor',
+        'limit',
+        'reuse',
+        'kwargs')
+
     def __init__(self, url, view, endpoint, **kwargs):
         """ Pluggable router constructor, stores passed arguments on instance.
 
@@ -169,24 +253,47 @@ class Pluggable(BaseRouter):
             * Added ``view`` argument
             * Added ``endpoint`` argument
 
+        .. versionchanged:: 2015.2.0
+
+            * ``view`` can be a python dotted path to the view class
+            * Added ``cache``, ``executor`` and ``limit`` keyword arguments
+            * Added ``reuse`` keyword argument
+
         Arguments
         ---------
         url : str
             The url to use for the route
-        view : class
+        view : class, str
             The Flask pluggable view class, for example:
             * :class:`flask.views.View`
             * :class:`flask.views.MethodView`
+            or its python dotted path in which case the class is imported on
+            first request, ``methods`` must then be passed unless
+            ``VIA_RESOLVE_VIEWS`` is set
         endpoint : str
             The Flask endpoint name for the view, this is required for Flask
             pluggable views.
         \*\*kwargs :
-            Arbitrary keyword arguments for ``add_url_rule``
+            Arbitrary keyword arguments for ``add_url_rule``, other than
+            ``cache``, ``executor``, ``limit`` and ``reuse``, see
+            :class:`Functional`
+
+        Keyword Arguments
+        -----------------
+        reuse : bool, optional
+            The view is stateless, one instance of the view class is created
+            per thread and reused for every request, and the handlers of a
+            :class:`flask.views.MethodView` are looked up once, see
+            :func:`flask_via.pluggable.reusable_view`, defaults to ``False``
         """
 
-        self.url = url
+        self.url = interned(url)
         self.view = view
-        self.endpoint = endpoint
+        self.endpoint = interned(endpoint)
+        self.cache = kwargs.pop('cache', None)
+        self.executor = kwargs.pop('executor', None)
+        self.limit = kwargs.pop('limit', None)
+        self.reuse = kwargs.pop('reuse', False)
         self.kwargs = kwargs
 
     def add_to_app(self, app, **kwargs):
@@ -205,6 +312,26 @@ class Pluggable(BaseRouter):
             Arbitrary keyword arguments passed in to ``init_app``
         """
 
+        apply(app, self.compile(app, **kwargs))
+
+    def compile(self, app, **kwargs):
+        """ Returns the url rule :meth:`add_to_app` would add.
+
+        .. versionadded:: 2015.2.0
+
+        Arguments
+        ---------
+        app : flask.app.Flask
+            Flask application instance
+        \*\*kwargs
+            Arbitrary keyword arguments passed in to ``init_app``
+
+        Returns
+        -------
+        list
+            A single :class:`flask_via.table.Rule`
+        """
+
         url = self.url
         endpoint = self.endpoint
 
@@ -218,14 +345,66 @@ class Pluggable(BaseRouter):
         if 'endpoint' in kwargs:
             endpoint = kwargs['endpoint'] + endpoint
 
-        try:
-            app.add_url_rule(
-                url,
-                view_func=self.view.as_view(endpoint),
-                **self.kwargs)
-        except AssertionError:
-            # TODO: Log / Warn
-            pass
+        url = interned(url)
+        endpoint = interned(endpoint)
+
+        view_class = self.view
+        if isinstance(view_class, string_types):
+            view_class = self.resolve(app)
+
+        if view_class is None:
+            view = LazyView(self.view, endpoint, self.reuse)
+        else:
+            view = as_view(view_class, endpoint, self.reuse)
+
+        view = wrap(
+            view,
+            cache=self.option('cache', kwargs),
+            executor=self.option('executor', kwargs),
+            limit=self.option('limit', kwargs))
+
+        return [Rule(
+            url,
+            endpoint,
+            view,
+            view_class,
+            kwargs.get('blueprint'),
+            dict(self.kwargs))]
+
+    def resolve(self, app):
+        """ Returns the view class given as a python dotted path, imported
+        when ``VIA_RESOLVE_VIEWS`` is set so Flask registers the methods it
+        handles, or ``None`` to import it on first request.
+
+        .. versionadded:: 2015.2.0
+
+        Arguments
+        ---------
+        app : flask.app.Flask
+            Flask application instance
+
+        Returns
+        -------
+        class
+            The view class or ``None``
+
+        Raises
+        ------
+        ImproperlyConfigured
+            If the view class is imported on first request and ``methods``
+            was not passed, Flask would only route ``GET`` requests to it
+        """
+
+        if app.config.get('VIA_RESOLVE_VIEWS'):
+            return import_string(self.view)
+
+        if 'methods' not in self.kwargs:
+            raise ImproperlyConfigured(
+                'Pluggable view {0} is imported on first request, pass the '
+                'methods it handles or set VIA_RESOLVE_VIEWS.'.format(
+                    self.view))
+
+        return None
 
 
 class Blueprint(BaseRouter, RoutesImporter):
@@ -262,6 +441,23 @@ class Blueprint(BaseRouter, RoutesImporter):
 
     """
 
+    __slots__ = (
+        'instance',
+        'module',
+        'routes_module_name',
+        'routes_name',
+        'static_folder',
+        'static_url_path',
+        'template_folder',
+        'url_prefix',
+        'subdomain',
+        'url_defaults',
+        'deferred',
+        'endpoint',
+        'cache',
+        'executor',
+        'limit')
+
     def __init__(
             self,
             name_or_instance,
@@ -273,7 +469,11 @@ class Blueprint(BaseRouter, RoutesImporter):
             template_folder=None,
             url_prefix=None,
             subdomain=None,
-            url_defaults=None):
+            url_defaults=None,
+            deferred=False,
+            cache=None,
+            executor=None,
+            limit=None):
         """ Constructor for blueprint router.
 
         .. versionchanged:: 2014.05.19
@@ -284,6 +484,11 @@ class Blueprint(BaseRouter, RoutesImporter):
               first argument
             * ``routes_name`` keyword argument default value set to ``None``
 
+        .. versionchanged:: 2015.2.0
+
+            * Added ``deferred`` keyword argument
+            * Added ``cache``, ``executor`` and ``limit`` keyword arguments
+
         Arguments
         ---------
         name : str, flask.blueprints.Blueprint
@@ -314,6 +519,23 @@ class Blueprint(BaseRouter, RoutesImporter):
             Callback function for URL defaults for this blueprint.
             It's called with the endpoint and values and should update
             the values passed in place, defaults to ``None``.
+        deferred : bool, optional
+            Reserve the blueprint ``url_prefix`` and ``subdomain`` and only
+            import and register its routes on the first request under them,
+            see :class:`flask_via.deferred.DeferredLoader`, defaults to
+            ``False``
+        cache : flask_via.cache.ResponseCache, optional
+            Serves responses of every route in the blueprint from this cache,
+            ``False`` to not cache them when the blueprint is included by a
+            router given a cache, defaults to ``None``
+        executor : str, flask_via.executors.Bulkhead, optional
+            Runs the views of every route in the blueprint on this executor,
+            ``False`` to run them on the request thread when the blueprint is
+            included by a router given an executor, defaults to ``None``
+        limit : str, flask_via.limits.Limiter, optional
+            Admits requests to every route in the blueprint through this
+            limit, ``False`` to not limit them when the blueprint is included
+            by a router given a limit, defaults to ``None``
         """
 
         if isinstance(name_or_instance, FlaskBlueprint):
@@ -332,6 +554,10 @@ class Blueprint(BaseRouter, RoutesImporter):
         self.url_prefix = url_prefix
         self.subdomain = subdomain
         self.url_defaults = url_defaults
+        self.deferred = deferred
+        self.cache = cache
+        self.executor = executor
+        self.limit = limit
 
     @property
     def routes_module(self):
@@ -396,6 +622,10 @@ class Blueprint(BaseRouter, RoutesImporter):
         this means any routes defined will be added to the blueprint rather
         than the application.
 
+        .. versionchanged:: 2015.2.0
+
+            * Deferred blueprints only reserve their urls, see :meth:`defer`
+
         Arguments
         ---------
         app : flask.app.Flask
@@ -404,13 +634,23 @@ class Blueprint(BaseRouter, RoutesImporter):
             Arbitrary keyword arguments passed in to ``init_app``
         """
 
+        if self.deferred:
+            self.defer(app, **kwargs)
+            return
+
         # Register blueproiint
         blueprint = self.blueprint(**kwargs)
+        self.inherit(kwargs)
 
         # Routes name can be configured by setting VIA_ROUTES_NAME
         if not self.routes_name:
             self.routes_name = app.config.get('VIA_ROUTES_NAME', 'routes')
 
+        kwargs['include_path'] = self.trace(
+            self.routes_module,
+            self.routes_name,
+            **kwargs)
+
         # Get the routes
         routes = self.include(self.routes_module, self.routes_name)
 
@@ -419,3 +659,151 @@ class Blueprint(BaseRouter, RoutesImporter):
 
         # Register the blueprint with the application
         app.register_blueprint(blueprint)
+
+    def defer(self, app, **kwargs):
+        """ Reserves the blueprint urls without importing its routes module,
+        the routes are compiled and registered by a
+        :class:`flask_via.deferred.DeferredLoader` on the first request
+        under the blueprint ``url_prefix`` or ``subdomain``.
+
+        .. versionadded:: 2015.2.0
+
+        Arguments
+        ---------
+        app : flask.app.Flask
+            Flask application instance
+        \*\*kwargs
+            Arbitrary keyword arguments passed in to ``init_app``
+
+        Returns
+        -------
+        flask_via.deferred.DeferredLoader
+            The loader registering the blueprint
+        """
+
+        blueprint = self.blueprint_rule(**kwargs)
+        if blueprint.instance is not None:
+            url_prefix = blueprint.instance.url_prefix
+            subdomain = blueprint.instance.subdomain
+        else:
+            url_prefix = blueprint.options['url_prefix']
+            subdomain = blueprint.options['subdomain']
+
+        def load():
+            entries = self.expand(app, blueprint, **kwargs)
+            check_options(app, entries)
+            apply(app, entries)
+
+        return DeferredLoader(
+            app,
+            blueprint.name,
+            load,
+            url_prefix=url_prefix,
+            subdomain=subdomain)
+
+    def blueprint_rule(self, **kwargs):
+        """ Returns the :class:`flask_via.table.BlueprintRule` for the
+        blueprint, unlike :meth:`blueprint` the router is not modified.
+
+        .. versionadded:: 2015.2.0
+
+        Returns
+        -------
+        flask_via.table.BlueprintRule
+            The blueprint record
+        """
+
+        try:
+            instance = self.instance
+        except AttributeError:
+            url_prefix = self.url_prefix
+            endpoint = self.endpoint
+
+            #: If this route was included a url preifx may have been passed
+            #: to the route
+            if 'url_prefix' in kwargs:
+                url_prefix = kwargs['url_prefix'] + (url_prefix or '')
+
+            #: If this route was included a endpoint prefix may have been
+            #: passed to the route
+            if 'endpoint' in kwargs:
+                endpoint = kwargs['endpoint'] + (endpoint or '')
+
+            return BlueprintRule(endpoint, self.module, {
+                'static_folder': self.static_folder,
+                'static_url_path': self.static_url_path,
+                'template_folder': self.template_folder,
+                'url_prefix': url_prefix,
+                'subdomain': self.subdomain,
+                'url_defaults': self.url_defaults,
+            }, None)
+
+        return BlueprintRule(
+            instance.name,
+            instance.import_name,
+            {},
+            instance)
+
+    def compile(self, app, **kwargs):
+        """ Compiles the blueprint and its routes rather than registering
+        them, see :meth:`add_to_app`. Unlike :meth:`blueprint` the router
+        is not modified.
+
+        .. versionadded:: 2015.2.0
+
+        Arguments
+        ---------
+        app : flask.app.Flask
+            Flask application instance
+        \*\*kwargs
+            Arbitrary keyword arguments passed in to ``init_app``
+
+        Returns
+        -------
+        list
+            Compiled routes of the blueprint followed by a
+            :class:`flask_via.table.BlueprintRule`, or for a deferred
+            blueprint a :class:`flask_via.table.RouterRule` adding it to the
+            application with :meth:`add_to_app` when applied
+        """
+
+        if self.deferred:
+            return [self.router_rule(self, **kwargs)]
+
+        return self.expand(app, self.blueprint_rule(**kwargs), **kwargs)
+
+    def expand(self, app, blueprint, **kwargs):
+        """ Compiles the routes module of the blueprint, see :meth:`compile`.
+
+        .. versionadded:: 2015.2.0
+
+        Arguments
+        ---------
+        app : flask.app.Flask
+            Flask application instance
+        blueprint : flask_via.table.BlueprintRule
+            The blueprint record from :meth:`blueprint_rule`
+        \*\*kwargs
+            Arbitrary keyword arguments passed in to ``init_app``
+
+        Returns
+        -------
+        list
+            Compiled routes of the blueprint followed by ``blueprint``
+        """
+
+        routes_name = self.routes_name or app.config.get(
+            'VIA_ROUTES_NAME',
+            'routes')
+
+        kwargs['blueprint'] = blueprint
+        self.inherit(kwargs)
+
+        entries = self.compile_module(
+            app,
+            self.routes_module,
+            routes_name,
+            **kwargs)
+        entries.append(blueprint)
+
+        return entries
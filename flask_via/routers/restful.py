@@ -7,7 +7,10 @@ flask_via.routers.restful
 Routers for the Flask-Restful framework.
 """
 
+from flask_via.exceptions import ImproperlyConfigured
+from flask_via.lazy import LazyView, interned, string_types
 from flask_via.routers import BaseRouter
+from werkzeug.utils import import_string
 
 
 class Resource(BaseRouter):
@@ -46,29 +49,49 @@ class Resource(BaseRouter):
 
     """
 
-    def __init__(self, url, resource, endpoint=None):
+    __slots__ = ('url', 'resource', 'endpoint', 'kwargs')
+
+    def __init__(self, url, resource, endpoint=None, **kwargs):
         """ Constructor for flask restful resource router.
 
+        .. versionchanged:: 2015.2.0
+
+            * ``resource`` can be a python dotted path to the resource class
+            * Added ``**kwargs``
+
         Arguments
         ---------
         url : str
             The url to use for the route
-        resource
-            A flask ``restful.Resource`` resource class
+        resource : class, str
+            A flask ``restful.Resource`` resource class, or its python dotted
+            path in which case the class is imported on first request and
+            ``methods`` must be passed, unless ``VIA_RESOLVE_VIEWS`` is set
 
         Keyword Arguments
         -----------------
         endpoint : str, optional
             Optional, override ``Flask-Restful`` automatic endpoint naming
+        \*\*kwargs
+            Arbitrary keyword arguments for ``add_resource``, for example
+            ``methods``
         """
 
-        self.url = url
+        self.url = interned(url)
+        if isinstance(resource, string_types):
+            resource = LazyResource(resource, kwargs.get('methods'))
         self.resource = resource
-        self.endpoint = endpoint
+        self.endpoint = interned(endpoint)
+        self.kwargs = kwargs
 
     def add_to_app(self, app, **kwargs):
         """ Adds the restul api resource route to the application.
 
+        .. versionchanged:: 2015.2.0
+
+            The ``url_prefix`` and ``endpoint`` of including routers are
+            added to the url and endpoint of the resource
+
         Arguments
         ---------
         app : flask.app.Flask
@@ -76,6 +99,68 @@ class Resource(BaseRouter):
         \*\*kwargs
             Arbitrary keyword arguments
 
+        Raises
+        ------
+        NotImplementedError
+            If ``restful_api`` is not provided
+        ImproperlyConfigured
+            If the resource is imported on first request and ``methods``
+            was not passed
+        """
+
+        restful_api = self.restful_api(kwargs)
+        url, endpoint = self.prefixed(kwargs)
+
+        restful_api.add_resource(
+            self.resolve(app),
+            url,
+            endpoint=endpoint,
+            **self.kwargs)
+
+    def resolve(self, app):
+        """ Returns the resource to add, a resource given as a python dotted
+        path is imported when ``VIA_RESOLVE_VIEWS`` is set so Flask registers
+        the methods it handles.
+
+        .. versionadded:: 2015.2.0
+
+        Arguments
+        ---------
+        app : flask.app.Flask
+            Flask application instance
+
+        Returns
+        -------
+        class
+            The resource class or its :class:`LazyResource`
+
+        Raises
+        ------
+        ImproperlyConfigured
+            If the resource is imported on first request and ``methods``
+            was not passed, Flask would only route ``GET`` requests to it
+        """
+
+        resource = self.resource
+        if not isinstance(resource, LazyResource):
+            return resource
+
+        if getattr(app, 'config', {}).get('VIA_RESOLVE_VIEWS'):
+            return import_string(resource.path)
+
+        if resource.methods is None:
+            raise ImproperlyConfigured(
+                'Resource {0} is imported on first request, pass the '
+                'methods it handles or set VIA_RESOLVE_VIEWS.'.format(
+                    resource.path))
+
+        return resource
+
+    def restful_api(self, kwargs):
+        """ Returns the ``restful_api`` passed to ``init_app``.
+
+        .. versionadded:: 2015.2.0
+
         Raises
         ------
         NotImplementedError
@@ -83,13 +168,112 @@ class Resource(BaseRouter):
         """
 
         try:
-            restful_api = kwargs['restful_api']
+            return kwargs['restful_api']
         except KeyError:
             raise NotImplementedError(
                 'restful_api not passed to add_to_app, did you add it to '
                 'via.init_app?')
 
-        restful_api.add_resource(
-            self.resource,
-            self.url,
-            endpoint=self.endpoint)
+    def prefixed(self, kwargs):
+        """ Returns the url and endpoint of the resource with the
+        ``url_prefix`` and ``endpoint`` prefix of the routers including it.
+
+        .. versionadded:: 2015.2.0
+
+        Returns
+        -------
+        tuple
+            ``(url, endpoint)``, ``endpoint`` is ``None`` when Flask-Restful
+            names the endpoint
+        """
+
+        url = self.url
+        endpoint = self.endpoint
+
+        if 'url_prefix' in kwargs:
+            url = interned(kwargs['url_prefix'] + url)
+
+        if 'endpoint' in kwargs:
+            endpoint = interned(kwargs['endpoint'] + (
+                endpoint or self.resource.__name__.lower()))
+
+        return url, endpoint
+
+
+class LazyResource(object):
+    """ Stands in for a resource class given as a python dotted path,
+    Flask-Restful registers it as it would the class. The class is imported
+    on the first request to the resource and given the media types and
+    endpoint Flask-Restful set on the stand in.
+
+    .. versionadded:: 2015.2.0
+    """
+
+    def __init__(self, path, methods=None):
+        """ Constructor.
+
+        Arguments
+        ---------
+        path : str
+            Python dotted path to the resource class
+
+        Keyword Arguments
+        -----------------
+        methods : list, optional
+            Methods the resource handles, defaults to ``None``
+        """
+
+        self.path = path
+        self.methods = methods
+        self.mediatypes = None
+        self.endpoint = None
+
+        #: Flask-Restful names endpoints after the class
+        self.__name__ = path.replace(':', '.').rpartition('.')[2]
+
+    def as_view(self, name):
+        """ Returns a :class:`LazyResourceView` of the resource.
+        """
+
+        return LazyResourceView(self, name)
+
+    def __repr__(self):
+        return '<LazyResource {0}>'.format(self.path)
+
+
+class LazyResourceView(LazyView):
+    """ A :class:`flask_via.lazy.LazyView` of a :class:`LazyResource`,
+    setting up the resource class as Flask-Restful would before its view is
+    created.
+
+    .. versionadded:: 2015.2.0
+    """
+
+    def __init__(self, resource, name):
+        """ Constructor.
+
+        Arguments
+        ---------
+        resource : LazyResource
+            The resource stand in
+        name : str
+            The endpoint of the resource
+        """
+
+        super(LazyResourceView, self).__init__(resource.path, name)
+
+        #: Flask-Restful checks endpoints are not reused by other resources
+        self.view_class = resource
+        if resource.methods is not None:
+            self.methods = resource.methods
+
+    def load(self):
+        """ Imports the resource class and sets the media types and endpoint
+        Flask-Restful set on the stand in.
+        """
+
+        resource = super(LazyResourceView, self).load()
+        resource.mediatypes = self.view_class.mediatypes
+        resource.endpoint = self.view_class.endpoint
+
+        return resource
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+
+"""
+flask_via.shared
+----------------
+
+Compiles a routes tree once per process for every application registering
+it, for example tenant applications built by the same factory, and shares
+what Werkzeug compiled for the url rules of the first application, their
+regular expressions, converters and url builders, and the views with the
+others. Every application is given url rules of its own, bound to its url
+map.
+"""
+
+import threading
+
+from flask_via.table import Rule, RouteTable
+
+#: Url map settings rules are compiled with, maps sharing rules must agree
+MAP_SETTINGS = (
+    'charset',
+    'default_subdomain',
+    'encoding_errors',
+    'host_matching',
+    'redirect_defaults',
+    'sort_key',
+    'sort_parameters',
+    'strict_slashes')
+
+#: Application settings routes are compiled with, applications sharing a
+#: table must agree
+COMPILE_SETTINGS = (
+    'VIA_RESOLVE_VIEWS',
+    'VIA_ROUTES_MANIFEST')
+
+#: Shared tables by routes module, routes name, ``init_app`` arguments and
+#: ``COMPILE_SETTINGS``
+tables = {}
+
+#: Guards ``tables``, applications built concurrently compile once
+lock = threading.Lock()
+
+
+class SharedTable(RouteTable):
+    """ A :class:`flask_via.table.RouteTable` registered with several
+    applications. The first application registers the entries as usual and
+    the url rules it created are kept, later applications with url maps of
+    the same settings are given copies of the rules, see :func:`copy_rule`,
+    and the same views rather than compiling their own.
+
+    Tables with blueprints or routers which do not implement ``compile``
+    register them with every application, as blueprints also set up the
+    application they are registered with.
+
+    .. versionadded:: 2015.2.0
+    """
+
+    def __init__(self, entries, included=(), modules=None):
+        """ Constructor, see :class:`flask_via.table.RouteTable`.
+        """
+
+        super(SharedTable, self).__init__(entries, included, modules)
+        self.rules_lock = threading.Lock()
+        self.url_rules = None
+        self.views = None
+        self.settings = None
+
+    def shareable(self):
+        """ Returns whether every entry is a url rule of the application.
+
+        Returns
+        -------
+        bool
+        """
+
+        return all(
+            isinstance(e, Rule) and e.blueprint is None
+            for e in self.entries)
+
+    def apply(self, app, timings=None):
+        """ Registers the table with an application, see
+        :meth:`flask_via.table.RouteTable.apply`, sharing the url rules of
+        the first application when possible.
+
+        Arguments
+        ---------
+        app : flask.app.Flask
+            Flask application instance
+
+        Keyword Arguments
+        -----------------
+        timings : list, optional
+            If given the seconds taken to register each entry are appended
+            to it, the table is then registered as usual, defaults to
+            ``None``
+        """
+
+        if timings is not None or not self.shareable():
+            return super(SharedTable, self).apply(app, timings)
+
+        with self.rules_lock:
+            if self.url_rules is None:
+                return self.capture(app)
+
+        if not self.share(app):
+            super(SharedTable, self).apply(app)
+
+    def capture(self, app):
+        """ Registers the table and keeps the url rules and views created.
+        """
+
+        url_map = app.url_map
+        start = len(url_map._rules)
+        super(SharedTable, self).apply(app)
+
+        self.url_rules = tuple(url_map._rules[start:])
+        self.views = dict(
+            (r.endpoint, app.view_functions[r.endpoint])
+            for r in self.url_rules)
+        self.settings = settings(url_map)
+
+    def share(self, app):
+        """ Adds copies of the kept url rules, and the kept views, to an
+        application.
+
+        Returns
+        -------
+        bool
+            ``False`` if the url map settings differ or the application has
+            other views for the same endpoints
+        """
+
+        url_map = app.url_map
+        if settings(url_map) != self.settings:
+            return False
+
+        view_functions = app.view_functions
+        for endpoint, view in self.views.items():
+            if view_functions.get(endpoint, view) is not view:
+                return False
+
+        by_endpoint = url_map._rules_by_endpoint
+        for rule in self.url_rules:
+            rule = copy_rule(rule, url_map)
+            url_map._rules.append(rule)
+            by_endpoint.setdefault(rule.endpoint, []).append(rule)
+        url_map._remap = True
+        view_functions.update(self.views)
+
+        return True
+
+
+def copy_rule(rule, url_map):
+    """ Returns a copy of a compiled url rule bound to another url map,
+    without compiling it again. Werkzeug creates the copy with
+    ``rule.empty()``, the compiled regular expression, converters and url
+    builders of the rule are then shared, builders being bound to the copy.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    rule : werkzeug.routing.Rule
+        Url rule compiled for a url map of the same settings
+    url_map : werkzeug.routing.Map
+        The url map to bind the copy to
+
+    Returns
+    -------
+    werkzeug.routing.Rule
+        The copy
+    """
+
+    copied = rule.empty()
+    own = vars(copied)
+
+    for name, value in vars(rule).items():
+        if own.get(name) is not None:
+            continue
+        if getattr(value, '__self__', None) is rule:
+            value = value.__func__.__get__(copied, type(copied))
+        own[name] = value
+
+    copied.map = url_map
+    copied.strict_slashes = rule.strict_slashes
+    copied.subdomain = rule.subdomain
+    copied.arguments = set(rule.arguments)
+
+    return copied
+
+
+def settings(url_map):
+    """ Returns the settings of a url map rules are compiled with.
+    """
+
+    return (
+        tuple(getattr(url_map, name) for name in MAP_SETTINGS),
+        sorted(url_map.converters.items()))
+
+
+def shared_table(via, app, routes_module, routes_name, **kwargs):
+    """ Returns the :class:`SharedTable` of a routes tree, compiled by the
+    first application registering it with the same ``init_app`` arguments
+    and ``COMPILE_SETTINGS``.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    via : flask_via.Via
+        Compiles the routes tree
+    app : flask.app.Flask
+        Flask application instance
+    routes_module : str
+        Python dotted path to the root routes module
+    routes_name : str
+        Name of the variable holding the routes in the module
+    \*\*kwargs
+        Arbitrary keyword arguments passed in to ``init_app``
+
+    Returns
+    -------
+    flask_via.table.RouteTable
+        The compiled routes, not shared if ``kwargs`` cannot be compared or
+        registration is profiled
+    """
+
+    key = (
+        routes_module,
+        routes_name,
+        tuple(sorted(kwargs.items())),
+        tuple(app.config.get(name) for name in COMPILE_SETTINGS))
+    try:
+        hash(key)
+    except TypeError:
+        key = None
+
+    if key is None or kwargs.get('profiler') is not None:
+        return via.compile(app, routes_module, routes_name, **kwargs)
+
+    with lock:
+        try:
+            return tables[key]
+        except KeyError:
+            pass
+        table = via.compile(app, routes_module, routes_name, **kwargs)
+        table = tables[key] = SharedTable(
+            table.entries,
+            table.included,
+            table.modules)
+        return table
+
+
+def clear():
+    """ Forgets every shared table, applications built afterwards compile
+    their routes again.
+
+    .. versionadded:: 2015.2.0
+    """
+
+    with lock:
+        tables.clear()
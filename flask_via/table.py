@@ -0,0 +1,517 @@
+# -*- coding: utf-8 -*-
+
+"""
+flask_via.table
+---------------
+
+Flat records describing the routes produced by walking a routes tree. Routers
+which implement ``compile`` return these records instead of registering
+routes directly, allowing the result of the walk to be stored, inspected and
+replayed onto one or more applications later.
+"""
+
+import time
+
+from collections import namedtuple
+from flask import Blueprint as FlaskBlueprint
+from flask_via.cache import cached, response_cache, uncached
+from flask_via.exceptions import ImproperlyConfigured
+from flask_via.executors import inline, offload, view_executor
+from flask_via.lazy import LazyView, as_view, interned, string_types
+from flask_via.limits import limited, unlimited, view_limit
+from flask_via.pluggable import reused
+
+
+#: A single url rule, ``url`` and ``endpoint`` are the values passed to
+#: ``add_url_rule`` on the application or blueprint. ``view_class`` is set
+#: for pluggable views where ``view`` is the result of ``as_view``, ``view``
+#: may also be a :class:`flask_via.lazy.LazyView`, either may be wrapped by
+#: :func:`wrap`.
+#: ``blueprint`` is the :class:`BlueprintRule` the rule belongs to or ``None``.
+Rule = namedtuple('Rule', [
+    'url',
+    'endpoint',
+    'view',
+    'view_class',
+    'blueprint',
+    'options'])
+
+#: A blueprint to register with the application, ``instance`` is set when an
+#: existing blueprint instance was given to the router, else a blueprint is
+#: created from ``name``, ``import_name`` and ``options``.
+BlueprintRule = namedtuple('BlueprintRule', [
+    'name',
+    'import_name',
+    'options',
+    'instance'])
+
+#: A router which does not implement ``compile``, its ``add_to_app`` is called
+#: with ``kwargs`` when the entry is applied. ``blueprint`` is the
+#: :class:`BlueprintRule` the router was included in or ``None``.
+RouterRule = namedtuple('RouterRule', [
+    'router',
+    'blueprint',
+    'kwargs'])
+
+
+def pluggable(view):
+    """ Returns whether ``view`` is a lazily imported pluggable view.
+    """
+
+    view = unwrap(view)
+    return isinstance(view, LazyView) and view.name is not None
+
+
+def wrap(view, cache=None, executor=None, limit=None):
+    """ Wraps a view with the view options of its router, a response cache
+    serving it, a limit admitting requests the cache did not serve and an
+    executor running it.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    view : function
+        The view function
+
+    Keyword Arguments
+    -----------------
+    cache : flask_via.cache.ResponseCache, optional
+        Response cache, defaults to ``None``
+    executor : str, flask_via.executors.Bulkhead, optional
+        Executor name or instance, defaults to ``None``
+    limit : str, flask_via.limits.Limiter, optional
+        Limit name or instance, defaults to ``None``
+
+    Returns
+    -------
+    function
+        The view
+    """
+
+    return cached(limited(offload(unwrap(view), executor), limit), cache)
+
+
+def unwrap(view):
+    """ Returns the view wrapped by :func:`wrap`.
+    """
+
+    return inline(unlimited(uncached(view)))
+
+
+def view_options(view):
+    """ Returns the keyword arguments :func:`wrap` was given for a view.
+    """
+
+    return {
+        'cache': response_cache(view),
+        'executor': view_executor(unlimited(uncached(view))),
+        'limit': view_limit(uncached(view)),
+    }
+
+
+def check_options(app, entries):
+    """ Checks the executors and limits rules name are configured, so a
+    misspelt name fails at registration rather than on the first request.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    app : flask.app.Flask
+        Flask application instance
+    entries : list
+        List of :class:`Rule`, :class:`BlueprintRule` and
+        :class:`RouterRule` records
+
+    Raises
+    ------
+    ImproperlyConfigured
+        If a rule names an executor ``VIA_EXECUTORS`` or a limit
+        ``VIA_LIMITS`` does not configure
+    """
+
+    settings = (
+        ('executor', 'VIA_EXECUTORS', app.config.get('VIA_EXECUTORS') or {}),
+        ('limit', 'VIA_LIMITS', app.config.get('VIA_LIMITS') or {}))
+
+    for entry in entries:
+        if not isinstance(entry, Rule):
+            continue
+
+        options = view_options(entry.view)
+        for option, setting, configured in settings:
+            name = options[option]
+            if isinstance(name, string_types) and name not in configured:
+                raise ImproperlyConfigured(
+                    'Route {0} uses the {1} {2} which is not configured in '
+                    '{3}.'.format(entry.url, option, name, setting))
+
+
+def apply(app, entries, timings=None):
+    """ Registers compiled entries with a Flask application in order. Rules
+    belonging to a blueprint are added to that blueprint which is registered
+    with the application when its :class:`BlueprintRule` is reached.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    app : flask.app.Flask
+        Flask application instance
+    entries : list
+        List of :class:`Rule`, :class:`BlueprintRule` and
+        :class:`RouterRule` records
+
+    Keyword Arguments
+    -----------------
+    timings : list, optional
+        If given the seconds taken to register each entry are appended to
+        it, defaults to ``None``
+    """
+
+    blueprints = {}
+
+    def blueprint(entry):
+        try:
+            return blueprints[id(entry)]
+        except KeyError:
+            if entry.instance is not None:
+                instance = entry.instance
+            else:
+                instance = FlaskBlueprint(
+                    entry.name,
+                    entry.import_name,
+                    **entry.options)
+            blueprints[id(entry)] = instance
+            return instance
+
+    def add(entry):
+        if isinstance(entry, BlueprintRule):
+            app.register_blueprint(blueprint(entry))
+            return
+
+        target = app
+        if entry.blueprint is not None:
+            target = blueprint(entry.blueprint)
+
+        if isinstance(entry, RouterRule):
+            entry.router.add_to_app(target, **entry.kwargs)
+            return
+
+        # Pluggable views are registered by the name given to as_view, the
+        # same as Pluggable.add_to_app
+        endpoint = entry.endpoint
+        if entry.view_class is not None or pluggable(entry.view):
+            endpoint = None
+
+        try:
+            target.add_url_rule(
+                entry.url,
+                endpoint,
+                entry.view,
+                **entry.options)
+        except AssertionError:
+            # TODO: Log / Warn
+            pass
+
+    if timings is None:
+        for entry in entries:
+            add(entry)
+        return
+
+    for entry in entries:
+        start = time.time()
+        add(entry)
+        timings.append(time.time() - start)
+
+
+def prefix(entries, url_prefix=None, endpoint=None, blueprint=None):
+    """ Returns entries compiled without a url prefix, endpoint prefix or
+    blueprint as if they had been compiled with them, the same as routers
+    prefix routes passed ``url_prefix`` and ``endpoint`` keyword arguments.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    entries : list
+        List of :class:`Rule` and :class:`BlueprintRule` records
+
+    Keyword Arguments
+    -----------------
+    url_prefix : str, optional
+        Url prefix to add, defaults to ``None``
+    endpoint : str, optional
+        Endpoint prefix to add, including the trailing ``.``, defaults to
+        ``None``
+    blueprint : BlueprintRule, optional
+        Blueprint rules without a blueprint belong to, defaults to ``None``
+
+    Returns
+    -------
+    list
+        New list of entries
+    """
+
+    if url_prefix is None and endpoint is None and blueprint is None:
+        return list(entries)
+
+    blueprints = {}
+
+    def prefixed(entry):
+        try:
+            return blueprints[id(entry)]
+        except KeyError:
+            pass
+
+        result = entry
+        if entry.instance is None:
+            options = dict(entry.options)
+            name = entry.name
+            if url_prefix is not None:
+                options['url_prefix'] = url_prefix + (
+                    options.get('url_prefix') or '')
+            if endpoint is not None:
+                name = endpoint + (name or '')
+            result = BlueprintRule(name, entry.import_name, options, None)
+
+        blueprints[id(entry)] = result
+        return result
+
+    result = []
+    for entry in entries:
+        if isinstance(entry, BlueprintRule):
+            result.append(prefixed(entry))
+            continue
+
+        if isinstance(entry, RouterRule):
+            kwargs = dict(entry.kwargs)
+            if url_prefix is not None:
+                kwargs['url_prefix'] = url_prefix + kwargs.get(
+                    'url_prefix',
+                    '')
+            if endpoint is not None:
+                kwargs['endpoint'] = endpoint + kwargs.get('endpoint', '')
+            result.append(RouterRule(
+                entry.router,
+                blueprint if entry.blueprint is None else prefixed(
+                    entry.blueprint),
+                kwargs))
+            continue
+
+        url = entry.url
+        name = entry.endpoint
+        view = entry.view
+
+        if url_prefix is not None:
+            url = interned(url_prefix + url)
+
+        if endpoint is not None:
+            name = interned(endpoint + (name or view.__name__))
+            # Pluggable views take their endpoint from as_view
+            options = view_options(view)
+            reuse = reused(unwrap(view))
+            if entry.view_class is not None:
+                view = wrap(
+                    as_view(entry.view_class, name, reuse), **options)
+            elif pluggable(view):
+                view = wrap(
+                    LazyView(unwrap(view).path, name, reuse), **options)
+
+        result.append(Rule(
+            url,
+            name,
+            view,
+            entry.view_class,
+            blueprint if entry.blueprint is None else prefixed(
+                entry.blueprint),
+            entry.options))
+
+    return result
+
+
+def view_name(view):
+    """ Returns a readable python dotted path for a view, used to describe
+    routes.
+    """
+
+    view = unwrap(view)
+    if isinstance(view, LazyView):
+        return view.path
+
+    view = getattr(view, 'view_class', view)
+
+    return '{0}.{1}'.format(
+        getattr(view, '__module__', None),
+        getattr(view, '__name__', None))
+
+
+class RouteTable(object):
+    """ An ordered table of compiled entries for a routes tree. The table is
+    built once by :meth:`flask_via.Via.compile` and can then be inspected,
+    compared to another table or applied to any number of applications
+    without walking the routes tree again.
+
+    The entries are kept in a tuple, but the ``options`` and ``kwargs``
+    dictionaries of entries are shared by every application the table is
+    applied to and must not be changed once the table is built.
+
+    .. versionadded:: 2015.2.0
+
+    Example
+    -------
+    .. sourcecode:: python
+
+        via = Via()
+        table = via.compile(app, 'yourapp.routes')
+
+        for app in apps:
+            table.apply(app)
+    """
+
+    def __init__(self, entries, included=(), modules=None):
+        """ Constructor.
+
+        Arguments
+        ---------
+        entries : list
+            List of :class:`Rule`, :class:`BlueprintRule` and
+            :class:`RouterRule` records
+
+        Keyword Arguments
+        -----------------
+        included : iterable, optional
+            ``(routes_module, routes_name)`` pairs of the routes imported
+            to compile the entries, defaults to ``()``
+        modules : iterable, optional
+            Python dotted paths of the routes modules the entries were
+            compiled from, for tables read from a manifest which imported
+            none, defaults to the modules of ``included``
+        """
+
+        self.entries = tuple(entries)
+        self.included = tuple(included)
+        if modules is None:
+            modules = [routes_module for routes_module, _ in self.included]
+        self.modules = tuple(sorted(set(modules)))
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __eq__(self, other):
+        return isinstance(other, RouteTable) and self.rules() == other.rules()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def apply(self, app, timings=None):
+        """ Registers every entry with the application, see :func:`apply`.
+
+        Arguments
+        ---------
+        app : flask.app.Flask
+            Flask application instance
+
+        Keyword Arguments
+        -----------------
+        timings : list, optional
+            If given the seconds taken to register each entry are appended
+            to it, defaults to ``None``
+        """
+
+        apply(app, self.entries, timings)
+
+    def compilable(self):
+        """ Returns whether every entry in the table was compiled, tables
+        containing :class:`RouterRule` entries cannot be described fully or
+        stored in a manifest.
+
+        Returns
+        -------
+        bool
+        """
+
+        return not any(isinstance(e, RouterRule) for e in self.entries)
+
+    def rules(self):
+        """ Describes each url rule the table registers, as the application
+        will see it once blueprint prefixes have been applied.
+
+        Returns
+        -------
+        list
+            List of ``(url, endpoint, view, methods, subdomain, defaults)``
+            tuples in registration order, ``methods`` and ``defaults`` are
+            sorted tuples
+        """
+
+        described = []
+
+        for entry in self.entries:
+            if not isinstance(entry, Rule):
+                continue
+
+            url = entry.url
+            endpoint = entry.endpoint or entry.view.__name__
+            subdomain = entry.options.get('subdomain')
+            defaults = dict(entry.options.get('defaults') or {})
+
+            if entry.blueprint is not None:
+                bp = entry.blueprint
+                if bp.instance is not None:
+                    bp_prefix = bp.instance.url_prefix
+                    bp_subdomain = bp.instance.subdomain
+                    bp_defaults = bp.instance.url_values_defaults
+                else:
+                    bp_prefix = bp.options.get('url_prefix')
+                    bp_subdomain = bp.options.get('subdomain')
+                    bp_defaults = bp.options.get('url_defaults')
+                url = (bp_prefix or '') + url
+                endpoint = '{0}.{1}'.format(bp.name, endpoint)
+                if subdomain is None:
+                    subdomain = bp_subdomain
+                defaults = dict(bp_defaults or {}, **defaults)
+
+            methods = entry.options.get('methods') or getattr(
+                entry.view,
+                'methods',
+                None) or ('GET',)
+
+            described.append((
+                url,
+                endpoint,
+                view_name(entry.view),
+                tuple(sorted(m.upper() for m in methods)),
+                subdomain,
+                tuple(sorted(defaults.items()))))
+
+        return described
+
+    def diff(self, other):
+        """ Compares the url rules of two tables, for example the tables
+        built before and after a deploy.
+
+        Arguments
+        ---------
+        other : RouteTable
+            The table to compare against
+
+        Returns
+        -------
+        tuple
+            ``(added, removed)`` lists of rules, see :meth:`rules`, in
+            ``self`` but not ``other`` and in ``other`` but not ``self``
+        """
+
+        ours = self.rules()
+        theirs = other.rules()
+        ours_set = set(ours)
+        theirs_set = set(theirs)
+
+        return (
+            [r for r in ours if r not in theirs_set],
+            [r for r in theirs if r not in ours_set])
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+"""
+flask_via.warmup
+----------------
+
+Does the work Flask and ``Via`` otherwise leave to the first request before
+worker processes are forked, for example by ``gunicorn --preload``, so every
+worker starts ready and shares the resulting memory pages with the master
+process instead of building its own copy.
+"""
+
+import gc
+import time
+
+from flask_via.deferred import load_deferred
+from flask_via.lazy import resolve_views
+
+
+def warmup(app, deferred=True, templates=False, freeze=True):
+    """ Loads deferred blueprints, imports lazy views, sorts the url map and
+    compiles its indexes and url builders, creates the Jinja environment and
+    template loaders, then collects garbage and moves every object left into
+    the permanent generation with :func:`gc.freeze`, so collections in forked
+    workers do not write to, and so copy, the pages shared with the master.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    app : flask.app.Flask
+        Flask application instance
+
+    Keyword Arguments
+    -----------------
+    deferred : bool, optional
+        Load deferred blueprints, defaults to ``True``
+    templates : bool, optional
+        Compile every template the application and its blueprints can
+        list, defaults to ``False``
+    freeze : bool, optional
+        Freeze the objects left after collecting garbage, requires Python
+        3.7 or later, defaults to ``True``
+
+    Returns
+    -------
+    dict
+        Seconds taken by each step
+    """
+
+    timings = []
+
+    def step(name, func, *args):
+        start = time.time()
+        func(*args)
+        timings.append((name, time.time() - start))
+
+    if deferred:
+        step('deferred', load_deferred, app)
+    step('views', resolve_views, app)
+    step('url_map', compile_url_map, app)
+    step('jinja', create_jinja_env, app)
+    if templates:
+        step('templates', compile_templates, app)
+    step('gc', collect, freeze)
+
+    app.logger.debug(
+        'Warmed up: %s',
+        ', '.join('{0} {1:.4f}s'.format(n, t) for n, t in timings))
+
+    return dict(timings)
+
+
+def compile_url_map(app):
+    """ Sorts the url map, builds the ``VIA_PREFIX_DISPATCH`` and
+    ``VIA_STATIC_DISPATCH`` indexes and compiles ``VIA_URL_BUILDERS``, all
+    otherwise done by the first request matching or building a url.
+    """
+
+    app.url_map.update()
+
+    builders = app.extensions.get('via', {}).get('builders')
+    if builders is not None:
+        builders.compile()
+
+
+def create_jinja_env(app):
+    """ Creates the Jinja environment and the template loaders of the
+    application and its blueprints, otherwise created by the first template
+    rendered.
+    """
+
+    app.jinja_env.loader
+    for blueprint in app.blueprints.values():
+        blueprint.jinja_loader
+
+
+def compile_templates(app):
+    """ Compiles every template the Jinja environment can list into its
+    template cache.
+    """
+
+    env = app.jinja_env
+    try:
+        names = env.list_templates()
+    except TypeError:
+        # The loader cannot list its templates
+        return
+
+    for name in names:
+        env.get_template(name)
+
+
+def collect(freeze=True):
+    """ Collects garbage, then freezes what is left if supported.
+    """
+
+    gc.collect()
+    if freeze and hasattr(gc, 'freeze'):
+        gc.freeze()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+"""
+flask_via.wrappers
+------------------
+
+Helpers shared by the view wrappers routers apply for their view options,
+see :func:`flask_via.table.wrap`.
+"""
+
+from functools import update_wrapper
+
+
+#: View attributes Flask and Flask-Via read when registering a view
+VIEW_ATTRIBUTES = (
+    'view_class',
+    'methods',
+    'required_methods',
+    'provide_automatic_options')
+
+
+def update_view(wrapper, view, **attributes):
+    """ Makes ``wrapper`` look like ``view`` when it is registered, views
+    may be lazy views rather than functions so only what registering the
+    view needs is copied.
+
+    .. versionadded:: 2015.2.0
+
+    Arguments
+    ---------
+    wrapper : function
+        The wrapping function
+    view : function
+        The wrapped view
+    \*\*attributes
+        Attributes to set on ``wrapper``, marking what wrapped it
+
+    Returns
+    -------
+    function
+        ``wrapper``
+    """
+
+    update_wrapper(
+        wrapper,
+        view,
+        assigned=('__module__', '__name__', '__doc__'),
+        updated=())
+
+    for name in VIEW_ATTRIBUTES:
+        if hasattr(view, name):
+            setattr(wrapper, name, getattr(view, name))
+
+    wrapper.__wrapped__ = view
+    for name, value in attributes.items():
+        setattr(wrapper, name, value)
+
+    return wrapper
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+"""
+tests.async_views
+=================
+
+Coroutine views for the coroutine tests. This module uses ``async def`` so it
+is only imported by tests skipped before Python 3.5, and is kept out of the
+installed package.
+"""
+
+import asyncio
+
+from flask.views import MethodView
+from flask_via.routers.default import Functional, Pluggable
+
+
+async def service(name, delay=0.01):
+    await asyncio.sleep(delay)
+    return name
+
+
+async def dashboard():
+    results = await asyncio.gather(
+        service('users'),
+        service('orders'),
+        service('stock'))
+    return ', '.join(results)
+
+
+class ReportView(MethodView):
+
+    async def get(self, name):
+        return 'Report - {0}'.format(await service(name))
+
+    def post(self, name):
+        return 'Report - {0} created'.format(name)
+
+
+routes = [
+    Functional('/dashboard', dashboard),
+    Pluggable('/reports/<name>', ReportView, 'report'),
+]
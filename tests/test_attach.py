@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+
+"""
+tests.test_attach
+=================
+
+Unit tests for attaching and detaching routes at runtime.
+"""
+
+from flask import request, url_for
+from flask.views import MethodView
+from flask_via import Via
+from flask_via.exceptions import ImproperlyConfigured
+from flask_via.routers import Include, default
+from tests import ViaTestCase
+
+
+def home(**kwargs):
+    return 'home'
+
+
+def report(id):
+    return 'report {0}'.format(id)
+
+
+def item(**kwargs):
+    return 'item'
+
+
+class ItemView(MethodView):
+
+    def get(self):
+        return 'get'
+
+    def post(self):
+        return 'post'
+
+
+routes = [
+    default.Functional('/', home, 'home'),
+]
+
+reports = [
+    default.Functional('/<int:id>', report, 'report'),
+]
+
+items = [
+    default.Functional('/', item, 'index'),
+    default.Pluggable('/view', ItemView, 'view'),
+]
+
+blueprints = [
+    default.Blueprint('bp', 'flask_via.examples.blueprints.foo'),
+]
+
+
+class TestAttach(ViaTestCase):
+
+    def setUp(self):
+        self.via = Via()
+        self.via.init_app(self.app, routes_module='tests.test_attach')
+
+    def test_attach_routes(self):
+        self.via.attach(
+            self.app,
+            'reports',
+            reports,
+            url_prefix='/reports',
+            endpoint='reports')
+        self.client.get('/')
+
+        self.assertEqual(self.client.get('/reports/1').data, b'report 1')
+        self.assert404(self.client.get('/reports/x'))
+        self.assert200(self.client.get('/'))
+
+        with self.app.test_request_context():
+            self.assertEqual(url_for('reports.report', id=2), '/reports/2')
+
+    def test_attach_routes_module(self):
+        self.via.attach(
+            self.app,
+            'items',
+            'tests.test_attach',
+            url_prefix='/items',
+            routes_name='items',
+            endpoint='items')
+
+        self.assertEqual(self.client.get('/items/').data, b'item')
+        self.assertEqual(self.client.post('/items/view').data, b'post')
+        self.assert405(self.client.delete('/items/view'))
+
+    def test_include(self):
+        self.via.attach(
+            self.app,
+            'items',
+            [Include('tests.test_attach', routes_name='items',
+                     url_prefix='/nested')],
+            url_prefix='/items')
+
+        self.assertEqual(self.client.get('/items/nested/').data, b'item')
+
+    def test_detach(self):
+        self.via.attach(self.app, 'reports', reports, url_prefix='/reports')
+        self.via.detach(self.app, 'reports')
+
+        self.assert404(self.client.get('/reports/1'))
+        self.assertNotIn(
+            'report',
+            self.app.url_map._rules_by_endpoint)
+
+    def test_reattach_replaces(self):
+        self.via.attach(self.app, 'x', reports, url_prefix='/x')
+        placeholders = len(self.app.url_map._rules)
+
+        self.via.attach(self.app, 'x', items, url_prefix='/x')
+
+        self.assertEqual(len(self.app.url_map._rules), placeholders)
+        self.assert404(self.client.get('/x/1'))
+        self.assertEqual(self.client.get('/x/').data, b'item')
+
+    def test_in_flight_requests_keep_routes(self):
+        attached = self.via.attach(
+            self.app,
+            'reports',
+            reports,
+            url_prefix='/reports')
+        routes = attached.routes
+
+        self.via.detach(self.app, 'reports')
+
+        self.assertEqual(routes[1]['report'](id=3), 'report 3')
+        self.assertIsNone(attached.routes)
+
+    def test_url_prefix_required(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.via.attach(self.app, 'reports', reports)
+
+    def test_other_url_prefix(self):
+        self.via.attach(self.app, 'reports', reports, url_prefix='/reports')
+
+        with self.assertRaises(ImproperlyConfigured):
+            self.via.attach(self.app, 'reports', reports, url_prefix='/r')
+
+    def test_blueprints_refused(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.via.attach(
+                self.app,
+                'bp',
+                blueprints,
+                url_prefix='/bp')
+
+    def test_detach_unknown(self):
+        with self.assertRaises(KeyError):
+            self.via.detach(self.app, 'missing')
+
+    def test_options(self):
+        self.via.attach(self.app, 'items', items, url_prefix='/items')
+
+        response = self.client.open('/items/view', method='OPTIONS')
+
+        self.assertIn('POST', response.headers['Allow'])
+        self.assertNotIn('DELETE', response.headers['Allow'])
+
+    def test_existing_endpoint_refused(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.via.attach(self.app, 'home', routes, url_prefix='/home')
+
+        self.assertEqual(self.client.get('/').data, b'home')
+
+    def test_other_attachment_endpoint_refused(self):
+        self.via.attach(self.app, 'reports', reports, url_prefix='/reports')
+
+        with self.assertRaises(ImproperlyConfigured):
+            self.via.attach(self.app, 'other', reports, url_prefix='/other')
+
+        self.assertEqual(self.client.get('/reports/1').data, b'report 1')
+
+    def test_detached_endpoint_reused(self):
+        self.via.attach(self.app, 'reports', reports, url_prefix='/reports')
+        self.via.detach(self.app, 'reports')
+        self.via.attach(self.app, 'other', reports, url_prefix='/other')
+
+        self.assertEqual(self.client.get('/other/1').data, b'report 1')
+
+    def test_hooks_see_attached_rule(self):
+        seen = []
+
+        @self.app.url_value_preprocessor
+        def preprocess(endpoint, values):
+            seen.append((endpoint, values))
+
+        @self.app.before_request
+        def before():
+            seen.append((request.endpoint, request.url_rule.rule))
+
+        self.via.attach(
+            self.app,
+            'reports',
+            reports,
+            url_prefix='/reports',
+            endpoint='reports')
+
+        self.assertEqual(self.client.get('/reports/1').data, b'report 1')
+        self.assertEqual(seen, [
+            ('reports.report', {'id': 1}),
+            ('reports.report', '/reports/<int:id>'),
+        ])
+
+    def test_hooks_on_unknown_url(self):
+        endpoints = []
+
+        @self.app.before_request
+        def before():
+            endpoints.append(request.endpoint)
+
+        self.via.attach(self.app, 'reports', reports, url_prefix='/reports')
+
+        self.assert404(self.client.get('/reports/x'))
+        self.assertEqual(endpoints, [None])
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+"""
+tests.test_build
+================
+
+Unit tests for precompiled url builders.
+"""
+
+import flask
+import mock
+
+from flask import Blueprint, render_template_string
+from flask_via import Via
+from flask_via.build import URLBuilders, install, url_for, url_for_many
+from tests import ViaTestCase
+from werkzeug.routing import BuildError
+
+
+def view(**kwargs):
+    return 'view'
+
+
+class TestURLBuilders(ViaTestCase):
+
+    def setUp(self):
+        app = self.app
+        app.config['SERVER_NAME'] = 'example.com'
+        app.add_url_rule('/', 'index', view)
+        app.add_url_rule('/users/<int:id>', 'user', view)
+        app.add_url_rule('/files/<path:name>', 'file', view)
+        app.add_url_rule(
+            '/page/<int:page>',
+            'page',
+            view,
+            defaults={'sort': 'name'})
+        app.add_url_rule('/posts/', 'posts', view, defaults={'page': 1})
+        app.add_url_rule('/posts/<int:page>', 'posts', view)
+        app.add_url_rule('/post', 'post', view, methods=['POST'])
+        app.add_url_rule('/sub', 'sub', view, subdomain='api')
+
+        blueprint = Blueprint('bp', __name__, url_prefix='/bp')
+        blueprint.add_url_rule('/<lang>/about', 'about', view)
+        blueprint.add_url_rule('/home', 'home', view)
+
+        @blueprint.url_defaults
+        def lang(endpoint, values):
+            values.setdefault('lang', 'en')
+
+        app.register_blueprint(blueprint)
+
+        self.builders = install(app)
+
+    def assertSameURL(self, endpoint, path='/', **values):
+        with self.app.test_request_context(
+                path,
+                environ_overrides={'SCRIPT_NAME': '/app'}):
+            self.assertEqual(
+                url_for(endpoint, **values),
+                flask.url_for(endpoint, **values))
+
+    def test_builders(self):
+        self.assertIn('user', self.builders.builders)
+        self.assertIn('bp.about', self.builders.builders)
+        self.assertNotIn('posts', self.builders.builders)
+
+    def test_same_urls(self):
+        self.assertSameURL('index')
+        self.assertSameURL('index', q='a b', page=None)
+        self.assertSameURL('index', q=['a', 'b'])
+        self.assertSameURL('user', id=1)
+        self.assertSameURL('user', id=2, next=u'/ü')
+        self.assertSameURL('file', name='a/b c.txt')
+        self.assertSameURL('page', page=2)
+        self.assertSameURL('page', page=2, sort='name')
+        self.assertSameURL('posts')
+        self.assertSameURL('posts', page=3)
+        self.assertSameURL('post')
+        self.assertSameURL('sub')
+        self.assertSameURL('user', id=1, _anchor='top')
+        self.assertSameURL('user', id=1, _external=True)
+        self.assertSameURL('bp.about')
+        self.assertSameURL('bp.about', lang='fr')
+        self.assertSameURL('.about', path='/bp/en/about')
+        self.assertSameURL('.home', path='/bp/en/about')
+        self.assertSameURL('.index')
+
+    def test_build_error(self):
+        with self.app.test_request_context('/'):
+            self.assertRaises(BuildError, url_for, 'user')
+            self.assertRaises(BuildError, url_for, 'page', page=1, sort='x')
+            self.assertRaises(BuildError, url_for, 'missing')
+
+    def test_rules_added(self):
+        self.app.add_url_rule('/later', 'later', view)
+
+        with self.app.test_request_context('/'):
+            self.assertEqual(url_for('later'), '/later')
+
+        self.assertIn('later', self.builders.builders)
+
+    def test_host_matching(self):
+        self.app.url_map.host_matching = True
+
+        self.assertEqual(URLBuilders(self.app.url_map).builders, {})
+
+    @mock.patch('flask_via.build.flask_url_for')
+    def test_fast_path(self, _url_for):
+        with self.app.test_request_context('/'):
+            self.assertEqual(url_for('user', id=1), '/users/1')
+
+        self.assertFalse(_url_for.called)
+
+    def test_url_for_many(self):
+        items = [{'id': 1}, {'id': 2, 'q': 'x'}, {}]
+
+        with self.app.test_request_context('/'):
+            self.assertEqual(
+                url_for_many('user', items[:2], tab='a'),
+                ['/users/1?tab=a', '/users/2?q=x&tab=a'])
+            self.assertEqual(
+                url_for_many('posts', [{}, {'page': 2}]),
+                ['/posts/', '/posts/2'])
+            self.assertRaises(BuildError, url_for_many, 'user', items)
+
+    def test_templates(self):
+        with self.app.test_request_context('/'):
+            rendered = render_template_string(
+                '{{ url_for("user", id=1) }} '
+                '{{ url_for_many("user", [{"id": 2}])|join }}')
+
+        self.assertEqual(rendered, '/users/1 /users/2')
+
+
+class TestViaURLBuilders(ViaTestCase):
+
+    def test_disabled(self):
+        Via().init_app(
+            self.app,
+            routes_module='flask_via.examples.small.routes')
+
+        self.assertNotIn('via', self.app.extensions)
+
+    def test_config(self):
+        self.app.config['VIA_URL_BUILDERS'] = True
+        Via().init_app(
+            self.app,
+            routes_module='flask_via.examples.small.routes')
+
+        builders = self.app.extensions['via']['builders']
+
+        self.assertIn('home', builders.builders)
+        self.assertIs(self.app.jinja_env.globals['url_for'], url_for)
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+
+"""
+tests.test_cache
+================
+
+Unit tests for the in process response cache.
+"""
+
+import mock
+
+from flask import Flask, make_response, request
+from flask.views import MethodView
+from flask_via import Via
+from flask_via.cache import ResponseCache, cached, response_cache, uncached
+from flask_via.routers import Include, default
+from tests import ViaTestCase
+
+
+calls = []
+
+
+def view(**kwargs):
+    calls.append(request.path)
+    return 'called {0}'.format(len(calls))
+
+
+class CountView(MethodView):
+
+    def get(self):
+        return view()
+
+
+cache = ResponseCache()
+
+routes = [
+    Include('tests.test_cache', 'included', url_prefix='/inc', cache=cache),
+    default.Functional('/plain', view, 'plain'),
+]
+
+included = [
+    default.Functional('/foo', view, 'foo'),
+    default.Functional('/bar', view, 'bar', cache=False),
+    default.Pluggable('/baz', CountView, 'baz'),
+    Include('tests.test_cache', 'nested', endpoint='nested'),
+]
+
+nested = [
+    default.Pluggable('/qux', CountView, 'qux'),
+]
+
+
+class TestResponseCache(ViaTestCase):
+
+    def setUp(self):
+        del calls[:]
+        self.cache = ResponseCache(maxsize=2, ttl=10, query=['page'])
+
+    def route(self, url, func=view, methods=('GET', 'POST')):
+        self.app.add_url_rule(
+            url,
+            func.__name__,
+            self.cache(func),
+            methods=methods)
+
+    def test_wrapped(self):
+        wrapped = self.cache(view)
+
+        self.assertEqual(wrapped.__name__, 'view')
+        self.assertIs(response_cache(wrapped), self.cache)
+        self.assertIs(uncached(wrapped), view)
+        self.assertIs(uncached(view), view)
+        self.assertIsNone(response_cache(mock.Mock()))
+        self.assertIs(cached(wrapped, False), view)
+        self.assertIs(cached(wrapped, cache).__wrapped__, view)
+
+    def test_hits(self):
+        self.route('/<int:id>')
+
+        self.assertEqual(self.client.get('/1').data, b'called 1')
+        self.assertEqual(self.client.get('/1').data, b'called 1')
+        self.assertEqual(self.client.get('/2').data, b'called 2')
+        self.assertEqual(self.client.head('/2').status_code, 200)
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(
+            self.cache.stats(),
+            {'hits': 2, 'misses': 2, 'evictions': 0, 'size': 2})
+
+    def test_post_not_cached(self):
+        self.route('/')
+
+        self.client.post('/')
+        self.client.post('/')
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(self.cache.stats()['misses'], 0)
+
+    def test_query(self):
+        self.route('/')
+
+        self.client.get('/?page=1&sort=a')
+        self.client.get('/?page=1&sort=b')
+        self.client.get('/?page=2')
+
+        self.assertEqual(len(calls), 2)
+
+    def test_all_query(self):
+        self.cache = ResponseCache()
+        self.route('/')
+
+        self.client.get('/?page=1&sort=a')
+        self.client.get('/?page=1&sort=b')
+
+        self.assertEqual(len(calls), 2)
+
+    def test_vary(self):
+        def varies():
+            response = make_response(view())
+            response.vary.add('Accept-Language')
+            return response
+
+        self.route('/', varies)
+
+        en = self.client.get('/', headers={'Accept-Language': 'en'})
+        self.client.get('/', headers={'Accept-Language': 'fr'})
+        again = self.client.get('/', headers={'Accept-Language': 'en'})
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(en.data, again.data)
+        self.assertEqual(again.headers['Vary'], 'Accept-Language')
+
+    def test_uncacheable(self):
+        def cookie():
+            response = make_response(view())
+            response.set_cookie('foo', 'bar')
+            return response
+
+        def no_store():
+            response = make_response(view())
+            response.cache_control.no_store = True
+            return response
+
+        def missing():
+            view()
+            return 'missing', 404
+
+        def vary_all():
+            response = make_response(view())
+            response.vary.add('*')
+            return response
+
+        for func in (cookie, no_store, missing, vary_all):
+            self.route('/' + func.__name__, func)
+            self.client.get('/' + func.__name__)
+            self.client.get('/' + func.__name__)
+
+        self.assertEqual(len(calls), 8)
+        self.assertEqual(self.cache.stats()['size'], 0)
+
+    def test_ttl(self):
+        self.route('/')
+
+        with mock.patch('flask_via.cache.time.time', return_value=0):
+            self.client.get('/')
+            self.client.get('/')
+        with mock.patch('flask_via.cache.time.time', return_value=11):
+            self.client.get('/')
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(self.cache.stats()['misses'], 2)
+
+    def test_evictions(self):
+        self.route('/<int:id>')
+
+        self.client.get('/1')
+        self.client.get('/2')
+        self.client.get('/1')
+        self.client.get('/3')
+        self.client.get('/1')
+        self.client.get('/2')
+
+        self.assertEqual(calls, ['/1', '/2', '/3', '/2'])
+        self.assertEqual(self.cache.stats()['evictions'], 2)
+
+    def test_host_and_script_root(self):
+        self.cache = ResponseCache()
+        self.route('/')
+
+        self.client.get('/', base_url='http://a.example.com')
+        self.client.get('/', base_url='http://b.example.com')
+        self.client.get('/', base_url='http://a.example.com/root')
+        again = self.client.get('/', base_url='http://a.example.com')
+
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(again.data, b'called 1')
+
+    def test_clear(self):
+        self.route('/')
+
+        self.client.get('/')
+        self.cache.clear()
+        self.client.get('/')
+
+        self.assertEqual(len(calls), 2)
+
+
+class TestCachedRoutes(ViaTestCase):
+
+    def setUp(self):
+        del calls[:]
+        cache.clear()
+        cache.hits = cache.misses = cache.evictions = 0
+        via = Via()
+        via.init_app(self.app, routes_module='tests.test_cache')
+
+    def test_include(self):
+        for url in ('/inc/foo', '/inc/baz', '/inc/qux'):
+            first = self.client.get(url).data
+            self.assertEqual(self.client.get(url).data, first)
+
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(cache.stats()['hits'], 3)
+        self.assertIs(
+            response_cache(self.app.view_functions['nested.qux']),
+            cache)
+        self.assertIs(
+            uncached(self.app.view_functions['nested.qux']).view_class,
+            CountView)
+
+    def test_not_cached(self):
+        for url in ('/inc/bar', '/plain'):
+            self.client.get(url)
+            self.client.get(url)
+
+        self.assertEqual(len(calls), 4)
+        self.assertIsNone(response_cache(self.app.view_functions['plain']))
+
+    def test_applications_do_not_share_responses(self):
+        other = Flask(__name__, static_folder=None)
+        Via().init_app(other, routes_module='tests.test_cache')
+
+        first = self.client.get('/inc/foo')
+        second = other.test_client().get('/inc/foo')
+
+        self.assertEqual(first.data, b'called 1')
+        self.assertEqual(second.data, b'called 2')
+        self.assertEqual(self.client.get('/inc/foo').data, b'called 1')
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+"""
+tests.test_coroutines
+=====================
+
+Unit tests for coroutine views, which require Python 3.5 or later.
+"""
+
+import mock
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+from flask import Flask
+from flask.views import MethodView
+from flask_via import Via
+from flask_via.coroutines import event_loop, is_async, sync, unsync
+from flask_via.routers import Include, default
+from tests import ViaTestCase
+
+
+COROUTINES = sys.version_info >= (3, 5)
+
+routes = [
+    default.Functional('/lazy', 'tests.async_views.dashboard'),
+    default.Pluggable(
+        '/lazy/<name>',
+        'tests.async_views.ReportView',
+        'lazy_report',
+        methods=['GET']),
+    Include('tests.async_views', url_prefix='/c', endpoint='c'),
+]
+
+
+def view():
+    return 'view'
+
+
+class PlainView(MethodView):
+
+    def get(self):
+        return 'view'
+
+
+@unittest.skipUnless(COROUTINES, 'coroutines require Python 3.5')
+class TestCoroutines(ViaTestCase):
+
+    def setUp(self):
+        from tests import async_views
+        self.example = async_views
+
+    def test_is_async(self):
+        self.assertTrue(is_async(self.example.dashboard))
+        self.assertTrue(is_async(self.example.ReportView))
+        self.assertTrue(is_async(self.example.ReportView.as_view('report')))
+        self.assertFalse(is_async(view))
+        self.assertFalse(is_async(PlainView))
+        self.assertFalse(is_async(PlainView.as_view('plain')))
+
+    def test_sync(self):
+        wrapped = sync(self.example.dashboard)
+
+        self.assertIs(sync(view), view)
+        self.assertIs(sync(wrapped), wrapped)
+        self.assertIs(unsync(wrapped), self.example.dashboard)
+        self.assertIs(unsync(view), view)
+        self.assertEqual(wrapped(), 'users, orders, stock')
+
+    def test_event_loop_reused(self):
+        loop = event_loop()
+        loops = []
+
+        thread = threading.Thread(target=lambda: loops.append(event_loop()))
+        thread.start()
+        thread.join()
+
+        self.assertIs(event_loop(), loop)
+        self.assertIsNot(loops[0], loop)
+
+        with mock.patch('flask_via.coroutines.os.getpid', return_value=-1):
+            self.assertIsNot(event_loop(), loop)
+
+    def test_async_views(self):
+        Via().init_app(self.app, routes_module='tests.async_views')
+        client = self.client
+
+        self.assertEqual(
+            client.get('/dashboard').data,
+            b'users, orders, stock')
+        self.assertEqual(client.get('/reports/a').data, b'Report - a')
+        self.assertEqual(
+            client.post('/reports/a').data,
+            b'Report - a created')
+
+    def test_routes(self):
+        Via().init_app(self.app, routes_module='tests.test_coroutines')
+
+        self.assertEqual(
+            self.client.get('/lazy').data,
+            b'users, orders, stock')
+        self.assertEqual(self.client.get('/lazy/a').data, b'Report - a')
+        self.assertEqual(
+            self.client.get('/c/dashboard').data,
+            b'users, orders, stock')
+        self.assertEqual(self.client.get('/c/reports/b').data, b'Report - b')
+        self.assertIn('c.report', self.app.view_functions)
+
+    def test_manifest(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+
+        for i in range(2):
+            app = Flask(__name__)
+            app.config['VIA_ROUTES_MANIFEST'] = os.path.join(tmp, 'r.json')
+            Via().init_app(app, routes_module='tests.test_coroutines')
+
+        client = app.test_client()
+
+        self.assertEqual(
+            client.get('/c/dashboard').data,
+            b'users, orders, stock')
+        self.assertEqual(client.get('/c/reports/b').data, b'Report - b')
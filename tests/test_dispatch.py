@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+"""
+tests.test_dispatch
+===================
+
+Unit tests for prefix trie url matching.
+"""
+
+from flask import Flask
+from flask_via import Via
+from flask_via.dispatch import (
+    PrefixTrie,
+    StaticIndex,
+    ViaMap,
+    install,
+    prefix_segments)
+from tests import ViaTestCase
+from werkzeug.exceptions import MethodNotAllowed, NotFound
+from werkzeug.routing import Map, RequestRedirect, Rule
+
+
+class TestPrefixSegments(ViaTestCase):
+
+    def test_segments(self):
+        self.assertEqual(prefix_segments('/'), [])
+        self.assertEqual(prefix_segments('/foo'), [])
+        self.assertEqual(prefix_segments('/foo/bar'), ['foo'])
+        self.assertEqual(prefix_segments('/foo/bar/<int:id>'), ['foo', 'bar'])
+        self.assertEqual(prefix_segments('/foo/bar<id>'), ['foo'])
+        self.assertEqual(prefix_segments('/foo/<id>/bar'), ['foo'])
+
+    def test_static_trailing_slash(self):
+        # /foo/bar redirects to /foo/bar/ so the rule must be found there
+        self.assertEqual(prefix_segments('/foo/bar/'), ['foo'])
+        self.assertEqual(prefix_segments('/foo/<id>/'), ['foo'])
+
+
+class TestPrefixTrie(ViaTestCase):
+
+    def test_candidates(self):
+        rules = [
+            Rule('/', endpoint='index'),
+            Rule('/foo/bar/<int:id>', endpoint='bar'),
+            Rule('/foo/<id>', endpoint='foo'),
+            Rule('/baz/<id>', endpoint='baz'),
+        ]
+        trie = PrefixTrie(rules)
+
+        self.assertEqual(
+            [r.endpoint for r in trie.candidates('/foo/bar/1')],
+            ['index', 'bar', 'foo'])
+        self.assertEqual(
+            [r.endpoint for r in trie.candidates('/foo/1')],
+            ['index', 'foo'])
+        self.assertEqual(
+            [r.endpoint for r in trie.candidates('/qux/1')],
+            ['index'])
+
+
+class TestViaMap(ViaTestCase):
+
+    rules = [
+        ('/', 'index', {}),
+        ('/foo/', 'foo', {}),
+        ('/foo/bar/<int:id>', 'bar', {'methods': ['POST']}),
+        ('/foo/<path:path>', 'path', {}),
+        ('/baz/<id>/', 'baz', {}),
+        ('/old', 'old', {'redirect_to': '/foo/'}),
+        ('/qux', 'qux', {'methods': ['GET']}),
+        ('/<id>', 'id', {'methods': ['POST']}),
+        ('/quux', 'quux', {'methods': ['GET'], 'strict_slashes': False}),
+    ]
+
+    paths = [
+        '/',
+        '/foo',
+        '/foo/',
+        '/foo/bar/1',
+        '/foo/bar/x',
+        '/foo/qux/quux',
+        '/baz/1',
+        '/baz/1/',
+        '/old',
+        '/missing/',
+        '//foo/bar/1',
+        '/qux',
+        '/qux/',
+        '/quux/',
+    ]
+
+    def match(self, adapter, path, method):
+        try:
+            return adapter.match(path, method)
+        except RequestRedirect as e:
+            return 'redirect', e.new_url
+        except MethodNotAllowed as e:
+            return 'not allowed', sorted(e.valid_methods)
+        except NotFound:
+            return 'not found'
+
+    def assertMatchesWerkzeug(self, prefix, static):
+        werkzeug = Map([Rule(r, endpoint=e, **kw) for r, e, kw in self.rules])
+        via = ViaMap([Rule(r, endpoint=e, **kw) for r, e, kw in self.rules])
+        via.prefix_dispatch = prefix
+        via.static_dispatch = static
+        werkzeug_adapter = werkzeug.bind('example.com')
+        via_adapter = via.bind('example.com')
+
+        for path in self.paths:
+            for method in ('GET', 'POST'):
+                self.assertEqual(
+                    self.match(via_adapter, path, method),
+                    self.match(werkzeug_adapter, path, method))
+
+    def test_prefix_matches_werkzeug(self):
+        self.assertMatchesWerkzeug(True, False)
+
+    def test_static_matches_werkzeug(self):
+        self.assertMatchesWerkzeug(False, True)
+
+    def test_prefix_and_static_match_werkzeug(self):
+        self.assertMatchesWerkzeug(True, True)
+
+    def test_rules_added_later(self):
+        url_map = ViaMap([Rule('/foo/<id>', endpoint='foo')])
+        url_map.prefix_dispatch = url_map.static_dispatch = True
+        adapter = url_map.bind('example.com')
+        adapter.match('/foo/1')
+
+        url_map.add(Rule('/foo/bar/<id>', endpoint='bar'))
+        url_map.add(Rule('/foo/bar', endpoint='baz'))
+
+        self.assertEqual(adapter.match('/foo/bar/1'), ('bar', {'id': '1'}))
+        self.assertEqual(adapter.match('/foo/bar'), ('baz', {}))
+
+
+class TestStaticIndex(ViaTestCase):
+
+    def test_direct(self):
+        url_map = Map([
+            Rule('/foo', endpoint='foo', methods=['GET']),
+            Rule('/bar/', endpoint='bar', methods=['GET']),
+            Rule('/baz', endpoint='baz', methods=['GET'], subdomain='api'),
+            Rule('/qux', endpoint='qux', defaults={'id': 1}),
+            Rule('/<id>', endpoint='id', methods=['GET']),
+        ])
+        url_map.update()
+        index = StaticIndex(url_map)
+
+        self.assertEqual(
+            sorted(k for k in index.direct if k[2] == 'GET'),
+            [
+                ('', '/bar/', 'GET'),
+                ('', '/foo', 'GET'),
+                ('api', '/baz', 'GET'),
+            ])
+        # Redirected to /bar/ by werkzeug
+        self.assertEqual(
+            [r.endpoint for r in index.candidates[('', '/bar')]],
+            ['bar'])
+
+
+class TestInstall(ViaTestCase):
+
+    def test_install(self):
+        self.app.add_url_rule('/foo/<int:id>', 'foo', lambda id: str(id))
+        install(self.app)
+        install(self.app)
+
+        self.assertIsInstance(self.app.url_map, ViaMap)
+        self.assertTrue(self.app.url_map.prefix_dispatch)
+        self.assertTrue(self.app.url_map.static_dispatch)
+        self.assertEqual(self.client.get('/foo/1').data, b'1')
+        self.assert404(self.client.get('/foo/bar'))
+
+    def test_config(self):
+        app = Flask(__name__)
+        app.config['VIA_PREFIX_DISPATCH'] = True
+        Via(app, routes_module='flask_via.examples.include.routes')
+
+        self.assertIsInstance(app.url_map, ViaMap)
+        self.assertFalse(app.url_map.static_dispatch)
+        self.assertEqual(app.test_client().get('/foo/bar').status_code, 200)
+
+    def test_static_config(self):
+        app = Flask(__name__)
+        app.config['VIA_STATIC_DISPATCH'] = True
+        Via(app, routes_module='flask_via.examples.include.routes')
+
+        self.assertFalse(app.url_map.prefix_dispatch)
+        self.assertTrue(app.url_map.static_dispatch)
+        self.assertEqual(app.test_client().get('/foo/bar').status_code, 200)
+        self.assertEqual(
+            app.test_client().post('/foo/bar').status_code,
+            405)
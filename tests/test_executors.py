@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+
+"""
+tests.test_executors
+====================
+
+Unit tests for bulkhead executors.
+"""
+
+import threading
+import time
+
+from flask import abort, g, request
+from flask_via import Via
+from flask_via.exceptions import ImproperlyConfigured
+from flask_via.executors import (
+    Bulkhead,
+    executor_stats,
+    get_executor,
+    inline,
+    offload,
+    view_executor)
+from flask_via.manifest import RouteManifest
+from flask_via.routers import Include, default
+from flask_via.table import Rule, unwrap
+from tests import ViaTestCase
+
+
+def view(**kwargs):
+    return '{0} {1}'.format(request.path, threading.current_thread().name)
+
+
+routes = [
+    Include('tests.test_executors', 'reports', executor='reports'),
+    default.Functional('/fast', view, 'fast'),
+]
+
+reports = [
+    default.Functional('/report', view, 'report'),
+    default.Functional('/inline', view, 'inline', executor=False),
+]
+
+
+class TestBulkhead(ViaTestCase):
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.bulkhead = Bulkhead('test', workers=1, queue=1, timeout=5)
+        self.addCleanup(self.bulkhead.shutdown)
+        self.addCleanup(self.release.set)
+
+    def route(self, url, func):
+        self.app.add_url_rule(url, func.__name__, self.bulkhead(func))
+
+    def blocked(self):
+        self.started.set()
+        self.release.wait(5)
+        return 'blocked'
+
+    def request(self, url, results):
+        thread = threading.Thread(
+            target=lambda: results.append(self.app.test_client().get(url)))
+        thread.start()
+        return thread
+
+    def test_wrapped(self):
+        wrapped = offload(view, 'reports')
+
+        self.assertEqual(wrapped.__name__, 'view')
+        self.assertEqual(view_executor(wrapped), 'reports')
+        self.assertIs(inline(wrapped), view)
+        self.assertIs(inline(view), view)
+        self.assertIs(offload(wrapped, False), view)
+        self.assertIs(self.bulkhead(wrapped).executor, self.bulkhead)
+
+    def test_request_context(self):
+        def context():
+            g.user = 'foo'
+            return '{0} {1} {2}'.format(
+                request.path,
+                g.user,
+                threading.current_thread() is main)
+
+        main = threading.current_thread()
+        self.route('/context', context)
+
+        response = self.client.get('/context')
+
+        self.assertEqual(response.data, b'/context foo False')
+        self.assertEqual(self.bulkhead.stats()['completed'], 1)
+
+    def test_exceptions(self):
+        def missing():
+            abort(404)
+
+        self.route('/missing', missing)
+
+        self.assert404(self.client.get('/missing'))
+        self.assertEqual(self.bulkhead.stats()['active'], 0)
+
+    def test_queue_full(self):
+        self.route('/blocked', self.blocked)
+        results = []
+
+        first = self.request('/blocked', results)
+        self.started.wait(5)
+        second = self.request('/blocked', results)
+        while self.bulkhead.stats()['queued'] != 1:
+            time.sleep(0.001)
+
+        response = self.client.get('/blocked')
+        self.release.set()
+        first.join()
+        second.join()
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(
+            [r.data for r in results],
+            [b'blocked', b'blocked'])
+
+        stats = self.bulkhead.stats()
+        self.assertEqual(stats['rejected'], 1)
+        self.assertEqual(stats['completed'], 2)
+        self.assertEqual(stats['queued'], 0)
+        self.assertGreater(stats['max_wait'], 0)
+
+    def test_timeout(self):
+        self.bulkhead.timeout = 0.01
+        self.route('/blocked', self.blocked)
+        called = []
+
+        def queued():
+            called.append(True)
+            return 'queued'
+
+        self.route('/queued', queued)
+        results = []
+
+        first = self.request('/blocked', results)
+        self.started.wait(5)
+        response = self.client.get('/queued')
+        self.release.set()
+        first.join()
+
+        self.assertEqual(response.status_code, 504)
+        self.assertEqual([r.data for r in results], [b'blocked'])
+        self.assertEqual(self.bulkhead.stats()['timeouts'], 1)
+
+        # The cancelled view is dropped once a thread is free
+        while self.bulkhead.stats()['queued']:
+            time.sleep(0.001)
+        self.assertEqual(called, [])
+        self.assertEqual(self.bulkhead.stats()['completed'], 1)
+
+    def test_started_view_not_timed_out(self):
+        def slow():
+            time.sleep(0.05)
+            return request.path
+
+        self.bulkhead.timeout = 0.01
+        self.route('/slow', slow)
+
+        response = self.client.get('/slow')
+
+        self.assertEqual(response.data, b'/slow')
+        self.assertEqual(self.bulkhead.stats()['timeouts'], 0)
+
+
+class TestExecutorRoutes(ViaTestCase):
+
+    def setUp(self):
+        self.app.config['VIA_EXECUTORS'] = {
+            'reports': {'workers': 2, 'queue': 4, 'timeout': 5},
+        }
+        Via().init_app(self.app, routes_module='tests.test_executors')
+        self.addCleanup(
+            lambda: get_executor(self.app, 'reports').shutdown())
+
+    def test_include(self):
+        main = threading.current_thread().name
+
+        report = self.client.get('/report').data.decode('utf-8')
+        fast = self.client.get('/fast').data.decode('utf-8')
+        inline_view = self.client.get('/inline').data.decode('utf-8')
+
+        self.assertNotEqual(report, '/report ' + main)
+        self.assertEqual(fast, '/fast ' + main)
+        self.assertEqual(inline_view, '/inline ' + main)
+
+        stats = executor_stats(self.app)
+        self.assertEqual(list(stats), ['reports'])
+        self.assertEqual(stats['reports']['workers'], 2)
+        self.assertEqual(stats['reports']['completed'], 1)
+
+    def test_get_executor(self):
+        bulkhead = get_executor(self.app, 'reports')
+
+        self.assertIs(get_executor(self.app, 'reports'), bulkhead)
+        self.assertIs(get_executor(self.app, bulkhead), bulkhead)
+        self.assertEqual(bulkhead.queue, 4)
+        self.assertRaises(KeyError, get_executor, self.app, 'missing')
+
+    def test_manifest(self):
+        entry = Rule(
+            '/report',
+            'report',
+            offload(view, 'reports'),
+            None,
+            None,
+            {})
+
+        self.assertIs(unwrap(entry.view), view)
+        self.assertRaises(ValueError, RouteManifest('r.json').dumps, [entry])
+
+
+class TestUnconfiguredExecutor(ViaTestCase):
+
+    def test_init_app(self):
+        with self.assertRaises(ImproperlyConfigured) as e:
+            Via().init_app(self.app, routes_module='tests.test_executors')
+
+        self.assertIn('VIA_EXECUTORS', str(e.exception))
+        self.assertEqual(self.app.view_functions, {})
+
+    def test_attach(self):
+        with self.assertRaises(ImproperlyConfigured):
+            Via().attach(
+                self.app,
+                'attached',
+                'tests.test_executors',
+                url_prefix='/attached')
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+"""
+tests.test_files
+================
+
+Unit tests for routes declared in route files.
+"""
+
+import json
+import mock
+import os
+import shutil
+import tempfile
+
+from flask import Flask
+from flask.views import MethodView
+from flask_restful import Resource as RestfulResource
+from flask_via import Via
+from flask_via.cache import ResponseCache
+from flask_via.exceptions import ImproperlyConfigured
+from flask_via.files import build, cache_file, include, is_routes_file, load
+from flask_via.routers import Include, restful
+from tests import ViaTestCase
+
+
+def view(**kwargs):
+    return 'view'
+
+
+class PluggableView(MethodView):
+
+    def get(self):
+        return 'pluggable'
+
+
+class Thing(RestfulResource):
+
+    def get(self):
+        return 'thing'
+
+
+ROUTES = {
+    'routes': [
+        {'router': 'functional', 'url': '/', 'view': 'tests.test_files.view',
+         'endpoint': 'home'},
+        {'router': 'pluggable', 'url': '/pluggable',
+         'view': 'tests.test_files.PluggableView', 'endpoint': 'pluggable',
+         'methods': ['GET']},
+        {'router': 'include', 'routes_name': 'admin', 'url_prefix': '/admin',
+         'endpoint': 'admin'},
+        {'router': 'include', 'routes_module': 'api.toml',
+         'url_prefix': '/api', 'endpoint': 'api'},
+    ],
+    'admin': [
+        {'router': 'functional', 'url': '/users',
+         'view': 'tests.test_files.view', 'endpoint': 'users'},
+    ],
+}
+
+API = '''
+[[routes]]
+router = "functional"
+url = "/things"
+view = "tests.test_files.view"
+endpoint = "things"
+cache = {ttl = 10}
+'''
+
+
+class FilesTestCase(ViaTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = self.write('routes.json', json.dumps(ROUTES))
+        self.write('api.toml', API)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+
+class TestRouteFiles(FilesTestCase):
+
+    def test_is_routes_file(self):
+        self.assertTrue(is_routes_file('conf/routes.json'))
+        self.assertTrue(is_routes_file('routes.YML'))
+        self.assertFalse(is_routes_file('app.routes'))
+
+    def test_init_app(self):
+        self.app.config['VIA_ROUTES_FILE'] = self.path
+        Via().init_app(self.app)
+
+        self.assertEqual(self.client.get('/').data, b'view')
+        self.assertEqual(self.client.get('/pluggable').data, b'pluggable')
+        self.assertEqual(self.client.get('/admin/users').data, b'view')
+        self.assertEqual(self.client.get('/api/things').data, b'view')
+        self.assertIn('admin.users', self.app.view_functions)
+        self.assertIn('api.things', self.app.view_functions)
+
+    def test_include_from_routes_module(self):
+        self.assertEqual(
+            [r.url for r in include(self.path, 'admin')],
+            ['/users'])
+        include_route = include(self.path, 'routes')[3]
+        self.assertIsInstance(include_route, Include)
+        self.assertEqual(
+            include_route.routes_module,
+            os.path.join(self.directory, 'api.toml'))
+
+    def test_missing_routes_name(self):
+        with self.assertRaises(AttributeError):
+            include(self.path, 'missing')
+
+    def test_cache_option(self):
+        route = include(
+            os.path.join(self.directory, 'api.toml'),
+            'routes')[0]
+
+        self.assertIsInstance(route.cache, ResponseCache)
+        self.assertEqual(route.cache.ttl, 10)
+
+    def test_resource(self):
+        route = build(self.path, {
+            'router': 'resource',
+            'url': '/thing',
+            'view': 'tests.test_files.Thing'})
+
+        self.assertIsInstance(route, restful.Resource)
+        self.assertIsInstance(route.resource, restful.LazyResource)
+        self.assertEqual(route.resource.path, 'tests.test_files.Thing')
+        self.assertIs(route.resource.as_view('thing').resolve().view_class,
+                      Thing)
+
+    def test_router_required(self):
+        with self.assertRaises(ImproperlyConfigured):
+            build(self.path, {'url': '/'})
+
+    def test_invalid_file(self):
+        path = self.write('bad.json', json.dumps({'routes': ['/']}))
+
+        with self.assertRaises(ImproperlyConfigured):
+            load(path)
+
+    def test_yaml_requires_pyyaml(self):
+        path = self.write('routes.yaml', 'routes: []')
+
+        with mock.patch.dict('sys.modules', {'yaml': None}):
+            with self.assertRaises(ImproperlyConfigured):
+                load(path)
+
+
+class TestCache(FilesTestCase):
+
+    def test_parsed_once(self):
+        with mock.patch('flask_via.files.parse', return_value={}) as parse:
+            load(self.path)
+            load(self.path)
+
+        self.assertEqual(parse.call_count, 1)
+        self.assertTrue(os.path.isfile(cache_file(self.path)))
+
+    def test_changed_file_parsed(self):
+        load(self.path)
+        self.write('routes.json', json.dumps({'routes': []}))
+        os.utime(self.path, (0, 0))
+
+        self.assertEqual(load(self.path), {'routes': []})
+
+    def test_unwritable_cache(self):
+        with mock.patch('flask_via.files.os.makedirs', side_effect=OSError):
+            with mock.patch('flask_via.files.os.path.isdir',
+                            return_value=False):
+                self.assertEqual(load(self.path), ROUTES)
+
+    def test_manifest_fingerprints_file(self):
+        # Cached views cannot be stored in manifests
+        self.write('api.toml', API.replace('cache = {ttl = 10}', ''))
+        manifest = os.path.join(self.directory, 'manifest.json')
+        self.app.config['VIA_ROUTES_FILE'] = self.path
+        self.app.config['VIA_ROUTES_MANIFEST'] = manifest
+        Via().init_app(self.app)
+
+        app = Flask(__name__)
+        app.config['VIA_ROUTES_FILE'] = self.path
+        app.config['VIA_ROUTES_MANIFEST'] = manifest
+        with mock.patch('flask_via.files.include') as include:
+            Via().init_app(app)
+
+        self.assertFalse(include.called)
+        self.assertIn('api.things', app.view_functions)
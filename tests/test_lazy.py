@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+"""
+tests.test_lazy
+===============
+
+Unit tests for lazily imported views.
+"""
+
+import mock
+import threading
+
+from flask import url_for
+from flask.views import MethodView
+from flask_via import Via
+from flask_via.exceptions import ImproperlyConfigured
+from flask_via.examples.include.foo.views import BarView
+from flask_via.examples.small import views
+from flask_via.lazy import LazyView, resolve_views
+from flask_via.routers import default
+from tests import ViaTestCase
+
+
+class PostView(MethodView):
+
+    def get(self):
+        return 'get'
+
+    def post(self):
+        return 'post'
+
+
+class TestLazyView(ViaTestCase):
+
+    def test_name(self):
+        self.assertEqual(
+            LazyView('flask_via.examples.small.views.home').__name__,
+            'home')
+        self.assertEqual(
+            LazyView('flask_via.examples.small.views:home').__name__,
+            'home')
+        self.assertEqual(
+            LazyView('flask_via.examples.views.BarView', 'bar').__name__,
+            'bar')
+
+    def test_resolve(self):
+        view = LazyView('flask_via.examples.small.views.home')
+
+        self.assertIsNone(view.view)
+        self.assertIs(view.resolve(), views.home)
+        self.assertEqual(view(), 'Home Page')
+
+    def test_resolve_pluggable(self):
+        view = LazyView('flask_via.examples.include.foo.views.BarView', 'bar')
+
+        self.assertIs(view.resolve().view_class, BarView)
+        self.assertEqual(view.resolve().__name__, 'bar')
+
+    @mock.patch('flask_via.lazy.import_string')
+    def test_resolve_imports_once(self, _import_string):
+        view = LazyView('foo.bar')
+        threads = [
+            threading.Thread(target=view.resolve) for i in range(10)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        _import_string.assert_called_once_with('foo.bar')
+
+    def test_resolve_views(self):
+        route = default.Functional('/', 'flask_via.examples.small.views.home')
+        route.add_to_app(self.app)
+
+        self.assertIsNone(route.func.view)
+        resolve_views(self.app)
+        self.assertIs(route.func.view, views.home)
+
+
+class TestLazyRouters(ViaTestCase):
+
+    def test_functional(self):
+        route = default.Functional('/', 'flask_via.examples.small.views.home')
+        route.add_to_app(self.app, endpoint='foo.')
+
+        self.assertEqual(url_for('foo.home'), '/')
+        self.assertEqual(self.client.get('/').data, b'Home Page')
+
+    def test_pluggable(self):
+        route = default.Pluggable(
+            '/',
+            'flask_via.examples.include.foo.views.BarView',
+            'bar',
+            methods=['GET'])
+        route.add_to_app(self.app, endpoint='foo.')
+
+        self.assertEqual(url_for('foo.bar'), '/')
+        self.assertEqual(self.client.get('/').data, b'/ - foo.bar')
+
+    def test_pluggable_methods(self):
+        route = default.Pluggable(
+            '/',
+            'tests.test_lazy.PostView',
+            'post',
+            methods=['GET', 'POST'])
+        route.add_to_app(self.app)
+
+        self.assertEqual(self.client.post('/').data, b'post')
+
+    def test_pluggable_requires_methods(self):
+        route = default.Pluggable('/', 'tests.test_lazy.PostView', 'post')
+
+        with self.assertRaises(ImproperlyConfigured):
+            route.add_to_app(self.app)
+
+    def test_pluggable_resolved_before_registration(self):
+        self.app.config['VIA_RESOLVE_VIEWS'] = True
+        route = default.Pluggable('/', 'tests.test_lazy.PostView', 'post')
+        route.add_to_app(self.app)
+
+        self.assertEqual(self.client.post('/').data, b'post')
+        self.assertIs(self.app.view_functions['post'].view_class, PostView)
+
+    @mock.patch('flask_via.import_module')
+    def test_via_resolve_views(self, _import_module):
+        route = default.Functional('/', 'flask_via.examples.small.views.home')
+        _import_module.return_value = mock.MagicMock(routes=[route])
+        self.app.config['VIA_RESOLVE_VIEWS'] = True
+
+        Via().init_app(self.app, routes_module='foo.bar')
+
+        self.assertIs(route.func.view, views.home)
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+
+"""
+tests.test_limits
+=================
+
+Unit tests for concurrency limits.
+"""
+
+import mock
+import threading
+import time
+
+from flask import request
+from flask_via import Via
+from flask_via.exceptions import ImproperlyConfigured
+from flask_via.cache import ResponseCache
+from flask_via.limits import (
+    Limiter,
+    Overloaded,
+    get_limiter,
+    limit_stats,
+    limited,
+    unlimited,
+    view_limit)
+from flask_via.routers import Include, default
+from flask_via.table import unwrap, view_options, wrap
+from tests import ViaTestCase
+
+
+release = threading.Event()
+started = threading.Event()
+
+
+def view(**kwargs):
+    return request.path
+
+
+def blocked(**kwargs):
+    started.set()
+    release.wait(5)
+    return 'blocked'
+
+
+routes = [
+    Include('tests.test_limits', 'search', limit='search'),
+    default.Functional('/other', view, 'other'),
+]
+
+search = [
+    default.Functional('/search', blocked, 'search'),
+    default.Functional('/suggest', view, 'suggest'),
+    default.Functional('/health', view, 'health', limit=False),
+]
+
+
+class TestLimiter(ViaTestCase):
+
+    def setUp(self):
+        self.limiter = Limiter('test', 1, queue=1, wait=5, retry_after=3)
+
+    def test_wrapped(self):
+        wrapped = limited(view, 'search')
+
+        self.assertEqual(wrapped.__name__, 'view')
+        self.assertEqual(view_limit(wrapped), 'search')
+        self.assertIs(unlimited(wrapped), view)
+        self.assertIs(unlimited(view), view)
+        self.assertIs(limited(wrapped, False), view)
+        self.assertIs(self.limiter(wrapped).limit, self.limiter)
+
+    def test_wrap(self):
+        cache = ResponseCache()
+        wrapped = wrap(view, cache=cache, executor='reports', limit='search')
+
+        self.assertIs(unwrap(wrapped), view)
+        self.assertEqual(view_options(wrapped), {
+            'cache': cache,
+            'executor': 'reports',
+            'limit': 'search',
+        })
+
+    def test_reject(self):
+        self.limiter.acquire()
+        self.limiter.queue = 0
+
+        with self.assertRaises(Overloaded) as context:
+            self.limiter.acquire()
+
+        self.assertEqual(context.exception.code, 503)
+        self.assertIn(
+            ('Retry-After', '3'),
+            context.exception.get_headers())
+        self.assertEqual(self.limiter.stats()['rejected'], 1)
+
+    def test_wait(self):
+        self.limiter.acquire()
+        admitted = threading.Event()
+
+        def waiter():
+            self.limiter.acquire()
+            admitted.set()
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        while self.limiter.stats()['waiting'] != 1:
+            time.sleep(0.001)
+
+        self.limiter.release()
+        thread.join()
+
+        self.assertTrue(admitted.is_set())
+        stats = self.limiter.stats()
+        self.assertEqual(stats['active'], 1)
+        self.assertEqual(stats['waiting'], 0)
+        self.assertEqual(stats['admitted'], 2)
+
+    def test_wait_timeout(self):
+        self.limiter.wait = 0.01
+        self.limiter.acquire()
+
+        with self.assertRaises(Overloaded) as context:
+            self.limiter.acquire()
+
+        self.assertEqual(context.exception.code, 503)
+        self.assertEqual(self.limiter.stats()['waiting'], 0)
+
+    def test_configure(self):
+        self.limiter.acquire()
+        self.limiter.configure(2)
+
+        self.limiter.acquire()
+
+        self.assertEqual(self.limiter.stats()['active'], 2)
+        self.assertEqual(self.limiter.stats()['queue'], 0)
+
+
+class TestLimitedRoutes(ViaTestCase):
+
+    def setUp(self):
+        release.clear()
+        started.clear()
+        self.addCleanup(release.set)
+        self.app.config['VIA_LIMITS'] = {
+            'search': {'concurrency': 1, 'retry_after': 2},
+        }
+        Via().init_app(self.app, routes_module='tests.test_limits')
+
+    def test_include(self):
+        results = []
+        thread = threading.Thread(
+            target=lambda: results.append(
+                self.app.test_client().get('/search')))
+        thread.start()
+        started.wait(5)
+
+        suggest = self.client.get('/suggest')
+        health = self.client.get('/health')
+        other = self.client.get('/other')
+        release.set()
+        thread.join()
+
+        self.assertEqual(suggest.status_code, 503)
+        self.assertEqual(suggest.headers['Retry-After'], '2')
+        self.assertEqual(health.data, b'/health')
+        self.assertEqual(other.data, b'/other')
+        self.assertEqual(results[0].data, b'blocked')
+
+        stats = limit_stats(self.app)
+        self.assertEqual(list(stats), ['search'])
+        self.assertEqual(stats['search']['admitted'], 1)
+        self.assertEqual(stats['search']['rejected'], 1)
+        self.assertEqual(stats['search']['active'], 0)
+
+    def test_runtime_config(self):
+        self.client.get('/suggest')
+        limiter = get_limiter(self.app, 'search')
+
+        self.app.config['VIA_LIMITS'] = {
+            'search': {'concurrency': 4},
+        }
+        self.client.get('/suggest')
+
+        self.assertIs(get_limiter(self.app, 'search'), limiter)
+        self.assertEqual(limiter.stats()['concurrency'], 4)
+        self.assertEqual(limiter.retry_after, 1)
+
+    def test_get_limiter(self):
+        limiter = Limiter('instance', 1)
+
+        self.assertIs(get_limiter(self.app, limiter), limiter)
+        self.assertIsNone(get_limiter(self.app, 'missing'))
+
+    def test_removed_limit(self):
+        self.client.get('/suggest')
+        limiter = get_limiter(self.app, 'search')
+        self.app.config['VIA_LIMITS'] = {}
+
+        with mock.patch.object(self.app.logger, 'warning') as warning:
+            self.assertEqual(self.client.get('/suggest').data, b'/suggest')
+            self.assertEqual(self.client.get('/suggest').data, b'/suggest')
+
+        self.assertEqual(warning.call_count, 1)
+        self.assertIs(get_limiter(self.app, 'search'), limiter)
+        self.assertEqual(limiter.stats()['admitted'], 3)
+
+    def test_never_configured_limit(self):
+        limited_view = limited(view, 'missing')
+
+        with mock.patch.object(self.app.logger, 'warning') as warning:
+            with self.app.test_request_context('/missing'):
+                self.assertEqual(limited_view(), '/missing')
+
+        self.assertEqual(warning.call_count, 1)
+        self.assertEqual(limit_stats(self.app), {})
+
+
+class TestUnconfiguredLimit(ViaTestCase):
+
+    def test_init_app(self):
+        with self.assertRaises(ImproperlyConfigured) as e:
+            Via().init_app(self.app, routes_module='tests.test_limits')
+
+        self.assertIn('VIA_LIMITS', str(e.exception))
+        self.assertEqual(self.app.view_functions, {})
+
+    def test_attach(self):
+        with self.assertRaises(ImproperlyConfigured):
+            Via().attach(
+                self.app,
+                'attached',
+                'tests.test_limits',
+                url_prefix='/attached')
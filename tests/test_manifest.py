@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+"""
+tests.test_manifest
+===================
+
+Unit tests for the compiled routes manifest.
+"""
+
+import json
+import mock
+import os
+import shutil
+import tempfile
+import warnings
+
+from flask import Flask, Blueprint, url_for
+from flask_via import Via
+from flask_via.manifest import RouteManifest, import_path, object_path
+from flask_via.routers import default
+from flask_via.examples.small import views
+from tests import ViaTestCase
+
+
+class TestObjectPath(ViaTestCase):
+
+    def test_object_path(self):
+        self.assertEqual(
+            object_path(views.home),
+            'flask_via.examples.small.views:home')
+
+    def test_import_path(self):
+        self.assertIs(
+            import_path('flask_via.examples.small.views:home'),
+            views.home)
+
+    def test_object_path_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            object_path(lambda: None)
+
+
+class TestRouteManifest(ViaTestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'routes.json')
+        self.app.config['VIA_ROUTES_MANIFEST'] = self.path
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def create_app(self):
+        app = Flask(__name__, static_folder=None)
+        app.config['TESTING'] = True
+        return app
+
+    def test_init_app_writes_manifest(self):
+        via = Via()
+        via.init_app(self.app, routes_module='flask_via.examples.small.routes')
+
+        with open(self.path) as f:
+            data = json.load(f)
+
+        self.assertEqual(data['modules'], [
+            'flask_via.examples.small.routes',
+            'flask_via.examples.small.foo.routes'])
+        self.assertEqual(url_for('home'), '/')
+        self.assertEqual(url_for('foo'), '/foo/foo')
+
+    def test_init_app_loads_manifest(self):
+        Via().init_app(
+            self.app,
+            routes_module='flask_via.examples.include.routes')
+
+        app = self.create_app()
+        app.config['VIA_ROUTES_MANIFEST'] = self.path
+
+        with mock.patch('flask_via.RoutesImporter.include') as _include:
+            Via().init_app(
+                app,
+                routes_module='flask_via.examples.include.routes')
+
+        self.assertFalse(_include.called)
+        with app.test_request_context():
+            self.assertEqual(url_for('foo.bar'), '/foo/bar')
+            self.assertEqual(url_for('foo.bar.faz'), '/foo/bar/faz')
+        self.assertEqual(
+            app.test_client().get('/foo/baz').data,
+            b'/foo/baz - foo.baz')
+
+    def test_stale_manifest_is_rebuilt(self):
+        via = Via()
+        via.init_app(self.app, routes_module='flask_via.examples.small.routes')
+
+        with open(self.path) as f:
+            data = json.load(f)
+        data['fingerprint'] = 'stale'
+        with open(self.path, 'w') as f:
+            json.dump(data, f)
+
+        manifest = RouteManifest(self.path)
+        key = manifest.key('flask_via.examples.small.routes', 'routes')
+        self.assertIsNone(manifest.load(key))
+
+        app = self.create_app()
+        app.config['VIA_ROUTES_MANIFEST'] = self.path
+        with mock.patch(
+                'flask_via.RoutesImporter.include',
+                wraps=via.include) as _include:
+            Via().init_app(
+                app,
+                routes_module='flask_via.examples.small.routes')
+
+        self.assertTrue(_include.called)
+        self.assertIsNotNone(manifest.load(key))
+
+    def test_blueprint_instance_is_not_stored(self):
+        blueprint = Blueprint('foo', __name__)
+        manifest = RouteManifest(self.path)
+
+        with mock.patch('flask_via.import_module') as _import_module:
+            _import_module.return_value = mock.MagicMock(routes=[])
+            entries = default.Blueprint(blueprint).compile(self.app)
+
+        self.assertFalse(manifest.dump(entries, [], {}))
+        self.assertFalse(os.path.exists(self.path))
+
+    @mock.patch('flask_via.import_module')
+    def test_uncompilable_routes_fall_back(self, _import_module):
+        route = mock.MagicMock()
+        route.compile.side_effect = NotImplementedError
+        _import_module.return_value = mock.MagicMock(routes=[route])
+
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            Via().init_app(self.app, routes_module='foo.bar')
+
+        w = [x for x in w if issubclass(x.category, RuntimeWarning)]
+        self.assertEqual(len(w), 1)
+        route.add_to_app.assert_called_once_with(self.app)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_unserialisable_kwargs_keyed_by_type(self):
+        class Api(object):
+            pass
+
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            Via().init_app(
+                self.app,
+                routes_module='flask_via.examples.small.routes',
+                api=Api())
+
+        self.assertEqual(
+            [x for x in w if issubclass(x.category, RuntimeWarning)], [])
+
+        manifest = RouteManifest(self.path)
+        key = manifest.key(
+            'flask_via.examples.small.routes', 'routes', api=Api())
+        self.assertIsNotNone(manifest.load(key))
+        self.assertIsNone(manifest.load(manifest.key(
+            'flask_via.examples.small.routes', 'routes', api=object())))
+
+    def test_lazy_views_are_not_imported(self):
+        manifest = RouteManifest(self.path)
+        entries = default.Functional(
+            '/',
+            'flask_via.examples.small.views.home').compile(self.app)
+        entries += default.Pluggable(
+            '/bar',
+            'flask_via.examples.include.foo.views.BarView',
+            'bar',
+            methods=['GET']).compile(self.app)
+
+        self.assertTrue(manifest.dump(entries, [], {}))
+        loaded = manifest.load({})
+
+        self.assertEqual(loaded[0].view.path, entries[0].view.path)
+        self.assertIsNone(loaded[0].view.view)
+        self.assertEqual(loaded[1].view.name, 'bar')
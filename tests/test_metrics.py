@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+"""
+tests.test_metrics
+==================
+
+Unit tests for endpoint latency histograms.
+"""
+
+from flask import Response, abort, request
+from flask_via import Via
+from flask_via.deferred import DeferredLoader
+from flask_via.lazy import resolve_views
+from flask_via.metrics import (
+    Histogram,
+    latency_stats,
+    measured,
+    unmeasured,
+    view_histogram)
+from flask_via.routers import Include, default
+from tests import ViaTestCase
+
+
+def view(**kwargs):
+    return request.path
+
+
+def missing(**kwargs):
+    abort(404)
+
+
+def broken(**kwargs):
+    return Response('broken', status=500)
+
+
+def crash(**kwargs):
+    raise RuntimeError('crash')
+
+
+routes = [
+    Include('tests.test_metrics', 'admin', url_prefix='/admin',
+            endpoint='admin'),
+    default.Functional('/', view, 'index'),
+    default.Functional('/missing', missing, 'missing'),
+    default.Functional('/broken', broken, 'broken'),
+    default.Functional('/crash', crash, 'crash'),
+]
+
+admin = [
+    default.Functional('/users', view, 'users'),
+    default.Functional('/orders', view, 'orders'),
+]
+
+
+class TestHistogram(ViaTestCase):
+
+    def setUp(self):
+        self.histogram = Histogram('test', buckets=(0.01, 0.02, 0.04))
+
+    def test_observe(self):
+        self.histogram.observe(0.005)
+        self.histogram.observe(0.01)
+        self.histogram.observe(0.03, error=True)
+        self.histogram.observe(1.0)
+
+        self.assertEqual(self.histogram.counts, [2, 0, 1, 1])
+        self.assertEqual(self.histogram.count, 4)
+        self.assertEqual(self.histogram.errors, 1)
+
+    def test_quantile(self):
+        for i in range(10):
+            self.histogram.observe(0.015)
+
+        self.assertEqual(self.histogram.quantile(0), 0.01)
+        self.assertAlmostEqual(self.histogram.quantile(0.5), 0.015)
+        self.assertAlmostEqual(self.histogram.quantile(1), 0.02)
+
+        self.histogram.observe(5)
+
+        self.assertEqual(self.histogram.quantile(1), 0.04)
+        self.assertEqual(Histogram('empty').quantile(0.5), 0.0)
+
+    def test_merge(self):
+        other = Histogram('other', buckets=(0.01, 0.02, 0.04))
+        other.observe(0.015, error=True)
+        self.histogram.observe(0.005)
+
+        self.histogram.merge(other)
+
+        self.assertEqual(self.histogram.counts, [1, 1, 0, 0])
+        self.assertEqual(self.histogram.stats()['errors'], 1)
+
+    def test_wrapped(self):
+        wrapped = measured(view, self.histogram)
+
+        self.assertEqual(wrapped.__name__, 'view')
+        self.assertIs(view_histogram(wrapped), self.histogram)
+        self.assertIs(unmeasured(wrapped), view)
+        self.assertIs(unmeasured(view), view)
+
+
+class TestMetrics(ViaTestCase):
+
+    def setUp(self):
+        self.app.add_url_rule('/other', 'other', view)
+        self.app.config['VIA_METRICS'] = True
+        self.app.config['VIA_METRICS_URL'] = '/_via/metrics'
+        Via().init_app(self.app, routes_module='tests.test_metrics')
+        self.metrics = self.app.extensions['via']['metrics']
+
+    def test_endpoints(self):
+        self.client.get('/admin/users')
+        self.client.get('/admin/users')
+        self.client.get('/admin/orders')
+        self.client.get('/other')
+
+        stats = latency_stats(self.app)
+
+        self.assertEqual(
+            sorted(stats),
+            ['admin.orders', 'admin.users', 'broken', 'crash', 'index',
+             'missing'])
+        self.assertEqual(stats['admin.users']['count'], 2)
+        self.assertGreater(stats['admin.users']['p99'], 0)
+        self.assertEqual(self.metrics.groups()['admin']['count'], 3)
+
+    def test_errors(self):
+        self.client.get('/missing')
+        self.client.get('/broken')
+        with self.assertRaises(RuntimeError):
+            self.client.get('/crash')
+
+        stats = latency_stats(self.app)
+
+        self.assertEqual(stats['missing']['errors'], 0)
+        self.assertEqual(stats['broken']['errors'], 1)
+        self.assertEqual(stats['crash']['errors'], 1)
+        self.assertEqual(stats['crash']['count'], 1)
+
+    def test_report(self):
+        self.client.get('/admin/users')
+
+        response = self.client.get('/_via/metrics')
+        lines = response.data.decode('utf-8').splitlines()
+
+        self.assertEqual(response.mimetype, 'text/plain')
+        self.assertEqual(lines[1].split()[-1], '*')
+        self.assertEqual(lines[6].split()[::5], ['1', 'admin.*'])
+        self.assertTrue(lines[8].endswith('  admin.users'))
+        self.assertNotIn('via_metrics', latency_stats(self.app))
+
+    def test_deferred(self):
+        DeferredLoader(
+            self.app,
+            'lazy',
+            lambda: self.app.add_url_rule('/lazy/', 'lazy.index', view),
+            url_prefix='/lazy')
+        self.metrics.instrument()
+
+        self.assertEqual(self.client.get('/lazy/').data, b'/lazy/')
+        self.client.get('/lazy/')
+
+        stats = latency_stats(self.app)
+        self.assertEqual(stats['lazy.index']['count'], 2)
+        self.assertNotIn('via_deferred.lazy', stats)
+
+    def test_resolve_views(self):
+        resolve_views(self.app)
+
+        self.assertIs(
+            unmeasured(self.app.view_functions['index']),
+            view)
+
+
+class TestDisabled(ViaTestCase):
+
+    def test_disabled(self):
+        Via().init_app(self.app, routes_module='tests.test_metrics')
+
+        self.assertEqual(latency_stats(self.app), {})
+        self.assertIs(self.app.view_functions['index'], view)
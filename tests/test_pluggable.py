@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+"""
+tests.test_pluggable
+====================
+
+Unit tests for pluggable views reusing their view instances.
+"""
+
+import threading
+
+from flask.views import MethodView, View
+from flask_via import Via
+from flask_via.lazy import LazyView
+from flask_via.manifest import RouteManifest
+from flask_via.pluggable import method_handlers, reusable_view, reused
+from flask_via.routers import Include, default
+from tests import ViaTestCase
+
+
+class CountedView(MethodView):
+
+    instances = []
+
+    def __init__(self):
+        self.instances.append(self)
+
+    def get(self, **kwargs):
+        return 'get'
+
+    def post(self, **kwargs):
+        return 'post'
+
+
+class DispatchingView(MethodView):
+
+    def get(self):
+        return 'get'
+
+    def dispatch_request(self):
+        return 'dispatched'
+
+
+class PlainView(View):
+
+    def dispatch_request(self):
+        return 'plain'
+
+
+def decorator(view):
+    def decorated(*args, **kwargs):
+        return 'decorated ' + view(*args, **kwargs)
+    return decorated
+
+
+class DecoratedView(MethodView):
+
+    decorators = [decorator]
+
+    def get(self):
+        return 'get'
+
+
+routes = [
+    default.Pluggable('/', CountedView, 'counted', reuse=True),
+    default.Pluggable(
+        '/lazy',
+        'tests.test_pluggable.CountedView',
+        'lazy',
+        methods=['GET', 'POST'],
+        reuse=True),
+]
+
+included = [
+    Include(
+        'tests.test_pluggable',
+        routes_name='routes',
+        url_prefix='/inc',
+        endpoint='inc'),
+]
+
+
+class TestReusableView(ViaTestCase):
+
+    def setUp(self):
+        del CountedView.instances[:]
+
+    def test_one_instance_per_thread(self):
+        self.app.add_url_rule(
+            '/',
+            view_func=reusable_view(CountedView, 'counted'))
+
+        self.assertEqual(self.client.get('/').data, b'get')
+        self.assertEqual(self.client.post('/').data, b'post')
+        self.assertEqual(len(CountedView.instances), 1)
+
+        thread = threading.Thread(target=self.client.get, args=('/',))
+        thread.start()
+        thread.join()
+
+        self.assertEqual(len(CountedView.instances), 2)
+
+    def test_head_handled_by_get(self):
+        self.app.add_url_rule(
+            '/',
+            view_func=reusable_view(CountedView, 'counted'))
+
+        self.assert200(self.client.head('/'))
+
+    def test_dispatch_request_overridden(self):
+        self.app.add_url_rule(
+            '/dispatching',
+            view_func=reusable_view(DispatchingView, 'dispatching'))
+        self.app.add_url_rule(
+            '/plain',
+            view_func=reusable_view(PlainView, 'plain'))
+
+        self.assertEqual(
+            self.client.get('/dispatching').data,
+            b'dispatched')
+        self.assertEqual(self.client.get('/plain').data, b'plain')
+
+    def test_decorators(self):
+        self.app.add_url_rule(
+            '/',
+            view_func=reusable_view(DecoratedView, 'decorated'))
+
+        self.assertEqual(self.client.get('/').data, b'decorated get')
+
+    def test_attributes(self):
+        view = reusable_view(CountedView, 'counted')
+
+        self.assertIs(view.view_class, CountedView)
+        self.assertEqual(view.__name__, 'counted')
+        self.assertEqual(view.methods, CountedView.methods)
+        self.assertTrue(reused(view))
+        self.assertFalse(reused(CountedView.as_view('counted')))
+
+    def test_method_handlers(self):
+        handlers = method_handlers(CountedView)
+
+        self.assertEqual(sorted(handlers), ['GET', 'HEAD', 'POST'])
+        self.assertEqual(method_handlers(DispatchingView), {})
+        self.assertEqual(method_handlers(PlainView), {})
+
+
+class TestPluggableReuse(ViaTestCase):
+
+    def setUp(self):
+        del CountedView.instances[:]
+
+    def test_routes(self):
+        Via().init_app(self.app, routes_module='tests.test_pluggable')
+
+        for i in range(3):
+            self.assertEqual(self.client.get('/').data, b'get')
+            self.assertEqual(self.client.post('/lazy').data, b'post')
+
+        self.assertEqual(len(CountedView.instances), 2)
+
+    def test_include_keeps_reuse(self):
+        Via().init_app(
+            self.app,
+            routes_module='tests.test_pluggable',
+            routes_name='included')
+
+        self.assertEqual(self.client.get('/inc/').data, b'get')
+        self.assertTrue(reused(self.app.view_functions['inc.counted']))
+        self.assertTrue(reused(self.app.view_functions['inc.lazy']))
+
+    def test_manifest_keeps_reuse(self):
+        table = Via().compile(self.app, 'tests.test_pluggable', 'routes')
+        manifest = RouteManifest(None)
+
+        entries = manifest.loads(manifest.dumps(table.entries))
+
+        self.assertTrue(reused(entries[0].view))
+        self.assertIsInstance(entries[1].view, LazyView)
+        self.assertTrue(entries[1].view.reuse)
+
+    def test_not_reused_by_default(self):
+        route = default.Pluggable('/', CountedView, 'counted')
+        route.add_to_app(self.app)
+
+        self.client.get('/')
+        self.client.get('/')
+
+        self.assertEqual(len(CountedView.instances), 2)
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+
+"""
+tests.test_profile
+==================
+
+Unit tests for route registration profiling.
+"""
+
+import json
+import mock
+import os
+import pstats
+import shutil
+import tempfile
+
+from flask import Flask
+from flask_via import Via
+from flask_via.profile import (
+    EndpointProfile,
+    Profiler,
+    describe,
+    profile_endpoints)
+from flask_via.routers import Include, default
+from tests import ViaTestCase
+
+
+class TestProfiler(ViaTestCase):
+
+    def test_describe(self):
+        self.assertEqual(
+            describe(default.Functional('/foo', 'foo.bar')),
+            'Functional /foo')
+        self.assertEqual(
+            describe(Include('foo.routes')),
+            'Include foo.routes')
+        self.assertEqual(describe(object()), 'object')
+
+    def test_record_apply(self):
+        profiler = Profiler()
+        include = profiler.push('foo:routes', 'include')
+        first = profiler.push('Functional /a', 'router')
+        first.rules = 1
+        profiler.pop()
+        blueprint = profiler.push('Blueprint foo.bar.routes', 'router')
+        nested = profiler.push('foo.bar.routes:routes', 'include')
+        nested.rules = 2
+        profiler.pop()
+        blueprint.rules = 3
+        profiler.pop()
+        profiler.pop()
+        include.rules = 4
+        profiler.root.rules = 4
+
+        profiler.record_apply([1.0, 2.0, 4.0, 8.0])
+
+        self.assertEqual(first.apply_time, 1.0)
+        self.assertEqual(nested.apply_time, 6.0)
+        self.assertEqual(blueprint.apply_time, 14.0)
+        self.assertEqual(profiler.root.apply_time, 15.0)
+
+    def test_report(self):
+        profiler = Profiler()
+        profiler.push('slow', 'router').compile_time = 2.0
+        profiler.pop()
+        profiler.push('fast', 'router').compile_time = 1.0
+        profiler.pop()
+
+        lines = profiler.report().splitlines()
+
+        self.assertEqual(len(lines), 3)
+        self.assertIn('router slow', lines[1])
+        self.assertIn('router fast', lines[2])
+        self.assertEqual(len(profiler.report(limit=1).splitlines()), 2)
+
+
+class TestViaProfile(ViaTestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.via = Via()
+
+    def test_disabled(self):
+        with mock.patch('flask_via.Profiler') as _profiler:
+            self.via.init_app(
+                self.app,
+                routes_module='flask_via.examples.include.routes')
+
+        self.assertFalse(_profiler.called)
+        self.assertNotIn('via', self.app.extensions)
+
+    def test_include_tree(self):
+        self.app.config['VIA_PROFILE'] = True
+        self.via.init_app(
+            self.app,
+            routes_module='flask_via.examples.include.routes')
+
+        profiler = self.app.extensions['via']['profile']
+        root = profiler.root
+        include = root.children[0]
+
+        self.assertEqual(root.rules, 5)
+        self.assertEqual(
+            include.name,
+            'flask_via.examples.include.routes:routes')
+        self.assertEqual(include.kind, 'include')
+        self.assertEqual(
+            [c.name for c in include.children],
+            ['Include flask_via.examples.include.foo.routes'])
+        self.assertEqual(
+            sum(n.rules for n in root.walk() if not n.children),
+            5)
+        self.assertAlmostEqual(
+            root.apply_time,
+            sum(c.apply_time for c in include.children))
+
+        data = json.loads(profiler.json())
+        self.assertEqual(data['children'][0]['name'], include.name)
+
+    def test_blueprints_cached(self):
+        self.app.config['VIA_PROFILE'] = True
+        self.via.init_app(
+            self.app,
+            routes_module='flask_via.examples.blueprints.routes')
+
+        profiler = self.app.extensions['via']['profile']
+        cached = [n for n in profiler.root.walk() if n.cached]
+
+        self.assertEqual(
+            [n.name for n in cached],
+            ['flask_via.examples.blueprints.foo.routes:routes'])
+        self.assertEqual(profiler.root.rules, 6)
+
+    def test_manifest(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        path = os.path.join(tmp, 'routes.json')
+
+        app = Flask(__name__)
+        app.config['VIA_ROUTES_MANIFEST'] = path
+        self.via.init_app(app, routes_module='flask_via.examples.small.routes')
+
+        self.app.config['VIA_ROUTES_MANIFEST'] = path
+        self.app.config['VIA_PROFILE'] = True
+        self.via.init_app(
+            self.app,
+            routes_module='flask_via.examples.small.routes')
+
+        profiler = self.app.extensions['via']['profile']
+        manifest = profiler.root.children[0]
+
+        self.assertEqual(manifest.kind, 'manifest')
+        self.assertEqual(manifest.name, path)
+        self.assertEqual(manifest.rules, profiler.root.rules)
+
+
+class TestEndpointProfile(ViaTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.app.config['VIA_PROFILE_ENDPOINTS'] = ['foo.bar.*']
+        self.app.config['VIA_PROFILE_REQUESTS'] = 2
+        self.app.config['VIA_PROFILE_DIR'] = self.tmp
+        Via().init_app(
+            self.app,
+            routes_module='flask_via.examples.include.routes')
+        self.profiles = self.app.extensions['via']['endpoint_profiles']
+
+    def test_selected(self):
+        self.assertEqual(
+            sorted(self.profiles),
+            ['foo.bar.faz', 'foo.bar.flop', 'foo.bar.foo'])
+        self.assertNotIn('foo.baz', self.profiles)
+
+    def test_requests(self):
+        profile = self.profiles['foo.bar.foo']
+        view = profile.view
+
+        for i in range(3):
+            self.assert200(self.client.get('/foo/bar/foo'))
+
+        self.assertEqual(profile.count, 2)
+        self.assertTrue(profile.done)
+        self.assertIs(self.app.view_functions['foo.bar.foo'], view)
+        self.assertNotIn('foo.bar.foo', self.profiles)
+        self.assertEqual(os.path.dirname(profile.path), self.tmp)
+        self.assertGreater(pstats.Stats(profile.path).total_calls, 0)
+
+    def test_runtime_selection(self):
+        self.client.get('/foo/bar/flop')
+        flop = self.profiles['foo.bar.flop']
+
+        profiles = profile_endpoints(self.app, ['foo.baz'])
+
+        self.assertEqual(list(profiles), ['foo.baz'])
+        self.assertTrue(flop.done)
+        self.assertTrue(os.path.exists(flop.path))
+        self.assertIs(self.app.view_functions['foo.bar.flop'], flop.view)
+
+        profiles['foo.baz'].stop()
+
+        self.assertIsNone(profiles['foo.baz'].path)
+        self.assertEqual(profile_endpoints(self.app, []), {})
+
+    def test_metrics(self):
+        app = Flask(__name__)
+        app.config['VIA_METRICS'] = True
+        app.config['VIA_PROFILE_ENDPOINTS'] = ['foo.baz']
+        app.config['VIA_PROFILE_DIR'] = self.tmp
+        Via().init_app(
+            app,
+            routes_module='flask_via.examples.include.routes')
+
+        app.test_client().get('/foo/baz')
+
+        metrics = app.extensions['via']['metrics']
+        self.assertEqual(metrics.stats()['foo.baz']['count'], 1)
+        self.assertEqual(
+            app.extensions['via']['endpoint_profiles']['foo.baz'].count,
+            1)
+
+    def test_repr(self):
+        profile = EndpointProfile(self.app, 'foo.baz', 5)
+
+        self.assertEqual(repr(profile), '<EndpointProfile foo.baz 0/5>')
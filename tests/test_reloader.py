@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+
+"""
+tests.test_reloader
+===================
+
+Unit tests for reloading changed routes modules.
+"""
+
+import mock
+import os
+import shutil
+import sys
+import tempfile
+
+from flask_via import Via, reloader
+from flask_via.reloader import restart
+from tests import ViaTestCase
+
+
+ROOT = '''
+from flask_via.routers import Include
+from flask_via.routers.default import Functional
+
+routes = [
+    Functional('/', 'tests.test_reloader.home', 'home'),
+    Include('{package}.admin', url_prefix='/admin', endpoint='admin'),
+]
+'''
+
+ADMIN = '''
+from flask_via.routers.default import Blueprint, Functional
+
+routes = [
+    {routes}
+]
+'''
+
+BLUEPRINT = '''
+from flask_via.routers.default import Functional
+
+routes = [
+    Functional('/', 'tests.test_reloader.home', 'index'),
+]
+'''
+
+
+def home(**kwargs):
+    return 'home'
+
+
+def users(**kwargs):
+    return 'users'
+
+
+def groups(**kwargs):
+    return 'groups'
+
+
+class TestReloader(ViaTestCase):
+
+    package = 'via_test_reloader'
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        sys.path.insert(0, self.directory)
+        self.addCleanup(self.cleanup)
+
+        os.mkdir(os.path.join(self.directory, self.package))
+        self.write('__init__.py', '')
+        self.write('routes.py', ROOT.format(package=self.package))
+        self.admin([
+            "Functional('/users', 'tests.test_reloader.users', 'users')",
+        ])
+
+        self.app.config['VIA_RELOAD'] = True
+        self.app.config['VIA_RELOAD_INTERVAL'] = 0
+        Via().init_app(
+            self.app,
+            routes_module='{0}.routes'.format(self.package))
+        self.reloader = self.app.extensions['via']['reloader']
+        self.reloader.fallback = mock.Mock()
+
+    def cleanup(self):
+        sys.path.remove(self.directory)
+        shutil.rmtree(self.directory)
+        for name in list(sys.modules):
+            if name.startswith(self.package):
+                del sys.modules[name]
+
+    def write(self, name, content, mtime=None):
+        path = os.path.join(self.directory, self.package, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+
+    def admin(self, routes, mtime=None):
+        self.write('admin.py', ADMIN.format(routes=',\n    '.join(routes)),
+                   mtime)
+
+    def rules(self):
+        return dict((r.endpoint, r) for r in self.app.url_map.iter_rules())
+
+    def test_watches_included_modules(self):
+        self.assertEqual(
+            sorted(self.reloader.files),
+            ['via_test_reloader.admin', 'via_test_reloader.routes'])
+
+    def test_added_and_removed_rules(self):
+        before = self.rules()
+
+        self.admin([
+            "Functional('/groups', 'tests.test_reloader.groups', 'groups')",
+        ], mtime=1)
+        self.client.get('/')
+
+        self.assert404(self.client.get('/admin/users'))
+        self.assertEqual(self.client.get('/admin/groups').data, b'groups')
+        self.assertNotIn('admin.users', self.app.view_functions)
+        # Rules of unchanged modules are not registered again
+        self.assertIs(self.rules()['home'], before['home'])
+        self.assertFalse(self.reloader.fallback.called)
+
+    def test_changed_view(self):
+        self.admin([
+            "Functional('/users', 'tests.test_reloader.groups', 'users')",
+        ], mtime=1)
+        self.client.get('/')
+
+        self.assertEqual(self.client.get('/admin/users').data, b'groups')
+
+    def test_changed_rule_of_request(self):
+        self.admin([
+            "Functional('/users', 'tests.test_reloader.groups', 'users')",
+        ], mtime=1)
+
+        self.assertEqual(self.client.get('/admin/users').data, b'groups')
+
+    def test_removed_rule_of_request(self):
+        self.admin([], mtime=1)
+
+        self.assert404(self.client.get('/admin/users'))
+
+    def test_added_rule_of_request(self):
+        self.admin([
+            "Functional('/users', 'tests.test_reloader.users', 'users')",
+            "Functional('/groups', 'tests.test_reloader.groups', 'groups')",
+        ], mtime=1)
+
+        self.assertEqual(self.client.get('/admin/groups').data, b'groups')
+
+    def test_unchanged(self):
+        with mock.patch.object(self.reloader, 'reload') as reload:
+            self.client.get('/')
+
+        self.assertFalse(reload.called)
+
+    def test_interval(self):
+        self.reloader.interval = 60
+        self.admin([], mtime=1)
+
+        self.client.get('/')
+
+        self.assertEqual(self.client.get('/admin/users').data, b'users')
+
+    def blueprint(self):
+        os.mkdir(os.path.join(self.directory, self.package, 'bp'))
+        self.write(os.path.join('bp', '__init__.py'), '')
+        self.write(os.path.join('bp', 'routes.py'), BLUEPRINT)
+
+    def test_blueprint_falls_back(self):
+        self.blueprint()
+        self.admin([
+            "Functional('/users', 'tests.test_reloader.users', 'users')",
+            "Blueprint('bp', '{0}.bp', url_prefix='/bp')".format(
+                self.package),
+        ], mtime=1)
+
+        self.client.get('/')
+
+        self.reloader.fallback.assert_called_once_with(self.app)
+
+    @mock.patch.dict(os.environ)
+    def test_blueprint_kept_without_werkzeug_reloader(self):
+        os.environ.pop('WERKZEUG_RUN_MAIN', None)
+        self.reloader.fallback = restart
+        self.blueprint()
+        self.admin([
+            "Functional('/users', 'tests.test_reloader.groups', 'users')",
+            "Blueprint('bp', '{0}.bp', url_prefix='/bp')".format(
+                self.package),
+        ], mtime=1)
+
+        with mock.patch.object(reloader.os, '_exit') as _exit:
+            response = self.client.get('/admin/users')
+
+        self.assertEqual(response.data, b'users')
+        self.assertFalse(_exit.called)
+
+    def test_import_error_raised_once(self):
+        self.write('admin.py', 'routes = [', mtime=1)
+
+        with self.assertRaises(SyntaxError):
+            self.reloader.check()
+
+        self.reloader.check()
+        self.assertEqual(self.client.get('/admin/users').data, b'users')
+
+
+class TestManifest(TestReloader):
+
+    def setUp(self):
+        self.manifest = os.path.join(tempfile.mkdtemp(), 'routes.json')
+        self.addCleanup(shutil.rmtree, os.path.dirname(self.manifest))
+        self.app.config['VIA_ROUTES_MANIFEST'] = self.manifest
+        super(TestManifest, self).setUp()
+
+        # A second process loading the manifest imports no routes module
+        self.app = self.create_app()
+        self.client = self.app.test_client()
+        self.app.config['VIA_ROUTES_MANIFEST'] = self.manifest
+        self.app.config['VIA_RELOAD'] = True
+        self.app.config['VIA_RELOAD_INTERVAL'] = 0
+        with mock.patch('flask_via.RoutesImporter.include') as _include:
+            Via().init_app(
+                self.app,
+                routes_module='{0}.routes'.format(self.package))
+        self.assertFalse(_include.called)
+        self.reloader = self.app.extensions['via']['reloader']
+        self.reloader.fallback = mock.Mock()
+
+
+class TestRestart(ViaTestCase):
+
+    def setUp(self):
+        patcher = mock.patch.dict(os.environ, {'WERKZEUG_RUN_MAIN': 'true'})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_restart(self):
+        with self.assertRaises(SystemExit) as raised:
+            restart(self.app)
+
+        self.assertEqual(raised.exception.code, 3)
+
+    def test_restart_from_request_thread(self):
+        thread = mock.Mock()
+        thread.name = 'Thread-1'
+
+        with mock.patch.object(
+                reloader.threading, 'current_thread', return_value=thread):
+            with mock.patch.object(reloader.os, '_exit') as _exit:
+                restart(self.app)
+
+        _exit.assert_called_once_with(3)
+
+    def test_not_under_reloader(self):
+        del os.environ['WERKZEUG_RUN_MAIN']
+
+        with mock.patch.object(self.app.logger, 'warning') as warning:
+            restart(self.app)
+
+        self.assertTrue(warning.called)
+
+
+class TestDisabled(ViaTestCase):
+
+    def test_not_installed(self):
+        Via().init_app(self.app, routes_module='flask_via.examples.basic')
+
+        self.assertNotIn('via', self.app.extensions)
@@ -12,6 +12,8 @@ import mock
 import unittest
 
 from flask import url_for
+from flask_via.exceptions import ImproperlyConfigured
+from flask_via.lazy import intern_string
 from flask_via.routers import BaseRouter, Include
 from flask_via.routers.default import Functional
 from tests import ViaTestCase
@@ -29,6 +31,31 @@ class TestBaseRouter(unittest.TestCase):
 
         self.assertTrue(str(e.exception), '__init__ must be overridden')
 
+    def test_routers_are_slotted(self):
+        from flask_via.routers.admin import AdminRoute
+        from flask_via.routers.default import Blueprint, Pluggable
+        from flask_via.routers.restful import Resource
+
+        routers = [
+            Functional('/foo', 'foo.bar'),
+            Pluggable('/foo', 'foo.Bar', 'bar'),
+            Include('foo.routes', url_prefix='/foo'),
+            Blueprint('foo', 'foo.bar'),
+            Resource('/foo', object),
+            AdminRoute(object()),
+        ]
+
+        for router in routers:
+            self.assertFalse(hasattr(router, '__dict__'), router)
+
+    def test_strings_interned(self):
+        prefix = ''.join(['/', 'foo'])
+        router = Functional(prefix + '/bar', 'foo.bar', 'bar')
+        include = Include('foo.routes', url_prefix=prefix)
+
+        self.assertIs(router.url, intern_string(prefix + '/bar'))
+        self.assertIs(include.url_prefix, intern_string(prefix))
+
 
 class TestIncludeRouter(ViaTestCase):
 
@@ -66,7 +93,7 @@ class TestIncludeRouter(ViaTestCase):
     def test_url_prefix(self, _import_module):
         routes1 = copy.deepcopy(self.routes)
         routes1.append(Include(
-            'foo.bar',
+            'foo.baz',
             url_prefix='/prefix2',
             endpoint='prefix2'))
         routes2 = copy.deepcopy(self.routes)
@@ -88,7 +115,7 @@ class TestIncludeRouter(ViaTestCase):
     def test_endpoint_prefix(self, _import_module):
         routes1 = copy.deepcopy(self.routes)
         routes1.append(Include(
-            'foo.bar',
+            'foo.baz',
             endpoint='endpoint2'))
         routes2 = copy.deepcopy(self.routes)
 
@@ -104,3 +131,18 @@ class TestIncludeRouter(ViaTestCase):
         self.assertEqual(url_for('endpoint1.bar'), '/bar')
         self.assertEqual(url_for('endpoint1.endpoint2.foo'), '/foo')
         self.assertEqual(url_for('endpoint1.endpoint2.bar'), '/bar')
+
+    @mock.patch('flask_via.import_module')
+    def test_include_cycle_raises_improperly_configured(self, _import_module):
+        _import_module.return_value = mock.MagicMock(
+            routes=[Include('foo.baz')])
+
+        include = Include('foo.bar')
+
+        with self.assertRaises(ImproperlyConfigured) as e:
+            include.add_to_app(self.app)
+
+        self.assertEqual(
+            str(e.exception),
+            'Include cycle detected: foo.bar:routes -> foo.baz:routes -> '
+            'foo.baz:routes')
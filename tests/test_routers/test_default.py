@@ -11,7 +11,11 @@ import mock
 
 from flask import Blueprint, url_for
 from flask.views import MethodView
-from flask_via.routers import default
+from flask_via import Via
+from flask_via.deferred import load_deferred
+from flask_via.exceptions import ImproperlyConfigured
+from flask_via.routers import BaseRouter, default
+from flask_via.table import RouterRule
 from tests import ViaTestCase
 
 
@@ -146,3 +150,127 @@ class TestBlueprintRouter(ViaTestCase):
 
         self.assertEqual(url_for('foo.foo'), '/foo')
         self.assertEqual(url_for('foo.bar'), '/bar')
+
+
+class TestDeferredBlueprintRouter(ViaTestCase):
+
+    def setUp(self):
+        def foo():
+            return 'foo'
+
+        def bar(id):
+            return 'bar {0}'.format(id)
+
+        self.routes = [
+            default.Functional('/', foo, 'foo'),
+            default.Functional('/bar/<int:id>', bar, 'bar'),
+        ]
+
+        patcher = mock.patch('flask_via.import_module')
+        self._import_module = patcher.start()
+        self._import_module.return_value = mock.MagicMock(routes=self.routes)
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch('flask.helpers.pkgutil.get_loader')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.route = default.Blueprint(
+            'foo',
+            'foo.bar',
+            url_prefix='/foo',
+            deferred=True)
+
+    def test_add_to_app_defers_import(self):
+        self.route.add_to_app(self.app)
+
+        self.assertFalse(self._import_module.called)
+        self.assertNotIn('foo', self.app.blueprints)
+
+    def test_first_request_registers_blueprint(self):
+        self.route.add_to_app(self.app)
+
+        response = self.client.get('/foo/bar/1')
+
+        self.assert200(response)
+        self.assertEqual(response.data, b'bar 1')
+        self.assertIn('foo', self.app.blueprints)
+        self.assertEqual(url_for('foo.foo'), '/foo/')
+
+        response = self.client.get('/foo/')
+
+        self.assertEqual(response.data, b'foo')
+        self._import_module.assert_called_once_with('foo.bar.routes')
+
+    def test_debug_left_untouched(self):
+        self.app.debug = True
+        first = mock.Mock()
+        self.app.before_first_request(first)
+        self.route.add_to_app(self.app)
+
+        with mock.patch.object(
+                type(self.app),
+                'debug',
+                new_callable=mock.PropertyMock,
+                return_value=True) as debug:
+            self.assertEqual(self.client.get('/foo/bar/1').data, b'bar 1')
+
+        self.assertNotIn(mock.call(False), debug.call_args_list)
+        self.assertTrue(self.app.debug)
+        self.assertTrue(self.app.got_first_request)
+        first.assert_called_once_with()
+
+    def test_unknown_url_after_load(self):
+        self.route.add_to_app(self.app)
+
+        self.assert404(self.client.get('/foo/baz'))
+        self.assert405(self.client.post('/foo/bar/1'))
+
+    def test_blueprint_before_request(self):
+        blueprint = Blueprint('foo', 'foo.bar', url_prefix='/foo')
+
+        @blueprint.before_request
+        def before():
+            return 'before'
+
+        self.routes.append(default.Functional('/before', before))
+        route = default.Blueprint(blueprint, deferred=True)
+        route.add_to_app(self.app)
+
+        self.assertEqual(self.client.get('/foo/bar/1').data, b'before')
+
+    def test_requires_url_prefix(self):
+        route = default.Blueprint('foo', 'foo.bar', deferred=True)
+
+        with self.assertRaises(ImproperlyConfigured):
+            route.add_to_app(self.app)
+
+    def test_load_deferred(self):
+        self.route.add_to_app(self.app)
+        load_deferred(self.app)
+
+        self.assertEqual(url_for('foo.bar', id=2), '/foo/bar/2')
+        self.assertEqual(
+            [r.rule for r in self.app.url_map.iter_rules()
+             if r.endpoint.startswith('via_deferred')],
+            [])
+
+    def test_compile(self):
+        entries = self.route.compile(self.app, url_prefix='/x')
+
+        self.assertEqual(len(entries), 1)
+        self.assertIsInstance(entries[0], RouterRule)
+        self.assertIs(entries[0].router, self.route)
+        self.assertEqual(entries[0].kwargs, {'url_prefix': '/x'})
+
+    def test_router_errors_are_raised(self):
+        class Router(BaseRouter):
+
+            def __init__(self):
+                pass
+
+            def compile(self, app, **kwargs):
+                raise NotImplementedError('broken')
+
+        with self.assertRaises(NotImplementedError):
+            Via().compile_routes(self.app, [Router()])
@@ -10,7 +10,12 @@ Unit tests for the Flask-Restful resource router.
 import mock
 import unittest
 
-from flask_via.routers import restful
+from flask import url_for
+from flask_restful import Api, Resource as RestfulResource
+from flask_via import Via
+from flask_via.exceptions import ImproperlyConfigured
+from flask_via.routers import Include, default, restful
+from tests import ViaTestCase
 
 
 class TestRestfulRouter(unittest.TestCase):
@@ -41,3 +46,157 @@ class TestRestfulRouter(unittest.TestCase):
         resource.add_to_app(self.app, restful_api=api)
 
         api.add_resource.assert_called_once_with(Resource, '/', endpoint=None)
+
+    def test_add_to_app_prefixed(self):
+
+        api = mock.MagicMock()
+
+        class Resource(mock.MagicMock):
+            pass
+
+        resource = restful.Resource('/', Resource)
+        resource.add_to_app(
+            self.app,
+            restful_api=api,
+            url_prefix='/foo',
+            endpoint='foo.')
+
+        api.add_resource.assert_called_once_with(
+            Resource,
+            '/foo/',
+            endpoint='foo.resource')
+
+    def test_lazy_resource(self):
+
+        resource = restful.Resource(
+            '/',
+            'tests.test_routers.test_restful.FooResource',
+            methods=['GET', 'POST'])
+
+        self.assertIsInstance(resource.resource, restful.LazyResource)
+        self.assertEqual(resource.resource.__name__, 'FooResource')
+        self.assertEqual(resource.resource.methods, ['GET', 'POST'])
+
+
+class FooResource(RestfulResource):
+
+    def get(self, **kwargs):
+        return {'foo': 'get'}
+
+    def post(self, **kwargs):
+        return {'foo': 'post'}
+
+
+class BarResource(RestfulResource):
+
+    def get(self):
+        return {'bar': 'get'}
+
+
+routes = [
+    restful.Resource('/foo', FooResource),
+    default.Functional('/home', lambda: 'home', 'home'),
+    restful.Resource('/bar', BarResource, endpoint='bar'),
+]
+
+lazy = [
+    restful.Resource(
+        '/foo',
+        'tests.test_routers.test_restful.FooResource',
+        methods=['GET', 'POST']),
+]
+
+unlisted = [
+    restful.Resource('/foo', 'tests.test_routers.test_restful.FooResource'),
+]
+
+conflict = [
+    restful.Resource('/foo', FooResource, endpoint='foo'),
+    restful.Resource('/bar', BarResource, endpoint='foo'),
+]
+
+included = [
+    Include(
+        'tests.test_routers.test_restful',
+        routes_name='routes',
+        url_prefix='/api',
+        endpoint='api'),
+]
+
+
+class TestRestfulRegistration(ViaTestCase):
+
+    def setUp(self):
+        self.api = Api(self.app)
+
+    def init_app(self, routes_name):
+        Via().init_app(
+            self.app,
+            routes_module='tests.test_routers.test_restful',
+            routes_name=routes_name,
+            restful_api=self.api)
+
+    def test_registered_with_add_resource(self):
+        with mock.patch.object(
+                self.api,
+                'add_resource',
+                wraps=self.api.add_resource) as add_resource:
+            self.init_app('routes')
+
+        self.assertEqual(add_resource.call_args_list, [
+            mock.call(FooResource, '/foo', endpoint=None),
+            mock.call(BarResource, '/bar', endpoint='bar'),
+        ])
+
+    def test_requests(self):
+        self.init_app('routes')
+
+        self.assertEqual(self.client.get('/foo').json, {'foo': 'get'})
+        self.assertEqual(self.client.get('/bar').json, {'bar': 'get'})
+        self.assertEqual(self.client.get('/home').data, b'home')
+        self.assertIn('fooresource', self.api.endpoints)
+        self.assertEqual(url_for('bar'), '/bar')
+
+    def test_include_prefixes(self):
+        self.init_app('included')
+
+        self.assertEqual(self.client.get('/api/foo').json, {'foo': 'get'})
+        self.assertEqual(url_for('api.fooresource'), '/api/foo')
+        self.assertEqual(url_for('api.bar'), '/api/bar')
+
+    def test_lazy_resource(self):
+        self.init_app('lazy')
+        view = self.app.view_functions['fooresource'].__wrapped__
+
+        self.assertIsNone(view.view)
+        self.assertEqual(self.client.post('/foo').json, {'foo': 'post'})
+        self.assertIs(view.view.view_class, FooResource)
+        self.assertEqual(FooResource.endpoint, 'fooresource')
+
+    def test_lazy_resource_requires_methods(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.init_app('unlisted')
+
+    def test_resolve_lazy_resources(self):
+        self.app.config['VIA_RESOLVE_VIEWS'] = True
+        self.init_app('unlisted')
+
+        view = self.app.view_functions['fooresource'].__wrapped__
+
+        self.assertIs(view.view_class, FooResource)
+        self.assertEqual(self.client.post('/foo').json, {'foo': 'post'})
+
+    def test_endpoint_conflict(self):
+        with self.assertRaises(ValueError):
+            self.init_app('conflict')
+
+    def test_api_without_app(self):
+        api = Api()
+
+        restful.Resource('/foo', FooResource).add_to_app(
+            self.app,
+            restful_api=api)
+
+        self.assertEqual(
+            api.resources,
+            [(FooResource, ('/foo',), {'endpoint': None})])
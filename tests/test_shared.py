@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+"""
+tests.test_shared
+=================
+
+Unit tests for routes shared by several applications.
+"""
+
+import mock
+
+from flask import Flask, url_for
+from flask_via import Via
+from flask_via.routers import default
+from flask_via.shared import SharedTable, clear, tables
+from tests import ViaTestCase
+
+
+def view(**kwargs):
+    return 'view'
+
+
+routes = [
+    default.Functional('/', view, 'home'),
+    default.Functional('/items/<int:id>', view, 'item'),
+]
+
+blueprints = [
+    default.Blueprint(
+        'foo',
+        'flask_via.examples.blueprints.foo',
+        routes_name='routes'),
+]
+
+
+class TestSharedTable(ViaTestCase):
+
+    def setUp(self):
+        self.addCleanup(clear)
+        self.via = Via()
+
+    def create(self, routes_name='routes', **config):
+        app = Flask(__name__, static_folder=None)
+        app.config['VIA_SHARED_ROUTES'] = True
+        app.config.update(config)
+        self.via.init_app(
+            app,
+            routes_module='tests.test_shared',
+            routes_name=routes_name)
+        return app
+
+    def test_compiled_once(self):
+        with mock.patch.object(
+                self.via,
+                'compile',
+                wraps=self.via.compile) as compile:
+            self.create()
+            self.create()
+
+        self.assertEqual(compile.call_count, 1)
+        self.assertEqual(len(tables), 1)
+
+    def test_rules_shared(self):
+        first = self.create()
+        second = self.create()
+
+        for rule, other in zip(first.url_map._rules, second.url_map._rules):
+            self.assertIsNot(rule, other)
+            self.assertIs(rule.map, first.url_map)
+            self.assertIs(other.map, second.url_map)
+            self.assertIs(rule._regex, other._regex)
+            self.assertIs(rule._converters, other._converters)
+        self.assertIs(
+            first.view_functions['item'],
+            second.view_functions['item'])
+
+        client = second.test_client()
+        self.assertEqual(client.get('/items/1').data, b'view')
+        self.assertEqual(client.get('/items/x').status_code, 404)
+        with second.test_request_context():
+            self.assertEqual(url_for('item', id=2), '/items/2')
+
+    def test_other_settings_compile_rules(self):
+        first = self.create()
+        second = Flask(__name__, static_folder=None)
+        second.url_map.strict_slashes = False
+        second.config['VIA_SHARED_ROUTES'] = True
+        self.via.init_app(second, routes_module='tests.test_shared')
+
+        self.assertFalse(
+            set(id(r._converters) for r in first.url_map._rules) &
+            set(id(r._converters) for r in second.url_map._rules))
+        self.assertEqual(second.test_client().get('/items/1').data, b'view')
+
+    def test_blueprints_registered_per_app(self):
+        first = self.create('blueprints')
+        second = self.create('blueprints')
+
+        self.assertIsInstance(
+            tables[('tests.test_shared', 'blueprints', (), (None, None))],
+            SharedTable)
+        self.assertIn('foo', first.blueprints)
+        self.assertIn('foo', second.blueprints)
+
+    def test_compile_settings_compiled_apart(self):
+        with mock.patch.object(
+                self.via,
+                'compile',
+                wraps=self.via.compile) as compile:
+            self.create()
+            self.create(VIA_RESOLVE_VIEWS=True)
+            self.create(VIA_RESOLVE_VIEWS=True)
+
+        self.assertEqual(compile.call_count, 2)
+        self.assertEqual(len(tables), 2)
+
+    def test_unhashable_kwargs(self):
+        app = Flask(__name__)
+        app.config['VIA_SHARED_ROUTES'] = True
+        self.via.init_app(
+            app,
+            routes_module='tests.test_shared',
+            options={})
+
+        self.assertEqual(tables, {})
+
+    def test_not_shared_by_default(self):
+        self.via.init_app(self.app, routes_module='tests.test_shared')
+
+        self.assertEqual(tables, {})
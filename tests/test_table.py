@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+"""
+tests.test_table
+================
+
+Unit tests for compiled route tables.
+"""
+
+import mock
+
+from flask import Flask
+from flask_via import Via
+from flask_via.table import RouteTable, RouterRule, Rule
+from tests import ViaTestCase
+
+
+class TestRouteTable(ViaTestCase):
+
+    def setUp(self):
+        self.table = Via().compile(
+            self.app,
+            'flask_via.examples.include.routes')
+
+    def test_rules(self):
+        self.assertEqual(self.table.rules()[:2], [
+            (
+                '/foo/bar',
+                'foo.bar',
+                'flask_via.examples.include.foo.views.BarView',
+                ('GET',),
+                None,
+                ()
+            ),
+            (
+                '/foo/baz',
+                'foo.baz',
+                'flask_via.examples.include.foo.views.BazView',
+                ('GET',),
+                None,
+                ()
+            ),
+        ])
+
+    def test_rules_include_blueprints(self):
+        table = Via().compile(self.app, 'flask_via.examples.blueprints.routes')
+
+        self.assertIn('/foo/baz', [r[0] for r in table.rules()])
+        self.assertIn('foo.baz', [r[1] for r in table.rules()])
+
+    def test_apply_to_many_apps(self):
+        apps = [Flask(__name__, static_folder=None) for i in range(2)]
+
+        for app in apps:
+            self.table.apply(app)
+
+        for app in apps:
+            self.assertEqual(
+                app.test_client().get('/foo/bar/flop').data,
+                b'/foo/bar/flop - foo.bar.flop')
+
+    def test_diff(self):
+        removed = self.table.entries[0]
+        other = RouteTable(self.table.entries[1:] + (
+            Rule(
+                '/new',
+                'new',
+                mock.MagicMock(__name__='new'),
+                None,
+                None,
+                {}),
+        ))
+
+        added, missing = other.diff(self.table)
+
+        self.assertEqual([r[0] for r in added], ['/new'])
+        self.assertEqual([r[0] for r in missing], [removed.url])
+        self.assertNotEqual(other, self.table)
+        self.assertEqual(RouteTable(self.table), self.table)
+
+    def test_router_rule(self):
+        router = mock.MagicMock()
+        table = RouteTable([RouterRule(router, None, {'foo': 'bar'})])
+
+        table.apply(self.app)
+
+        self.assertFalse(table.compilable())
+        router.add_to_app.assert_called_once_with(self.app, foo='bar')
@@ -10,8 +10,11 @@ Unit tests for flask_via.Via class.
 import mock
 import unittest
 
+from flask.views import MethodView
 from flask_via import Via, RoutesImporter
 from flask_via.exceptions import ImproperlyConfigured
+from flask_via.routers import Include
+from flask_via.routers.default import Functional, Pluggable
 
 
 class TestVia(unittest.TestCase):
@@ -63,6 +66,17 @@ class TestVia(unittest.TestCase):
             str(e.exception),
             "'Module' object has no attribute 'routes'")
 
+    @mock.patch('flask_via.RoutesImporter.prefetch')
+    @mock.patch('flask_via.import_module')
+    def test_init_app_prefetches_routes(self, import_module, _prefetch):
+        import_module.return_value = mock.MagicMock(routes=[])
+        self.app.config['VIA_IMPORT_WORKERS'] = 4
+
+        via = Via()
+        via.init_app(self.app, routes_module='foo.bar')
+
+        _prefetch.assert_called_once_with(self.app, 'foo.bar', 'routes', 4)
+
     @mock.patch('flask_via.import_module')
     def test_init_app_iterates_over_routes(self, import_module):
         routes = [
@@ -92,3 +106,88 @@ class TestRoutesImporter(unittest.TestCase):
         routes = i.include('foo.bar', 'routes')
 
         self.assertEqual(fake_routes, routes)
+
+    def test_prefetch_finds_included_modules(self):
+        i = RoutesImporter()
+        modules = i.prefetch(
+            mock.MagicMock(config={}),
+            'flask_via.examples.blueprints.routes',
+            'routes',
+            2)
+
+        self.assertEqual(modules, [
+            'flask_via.examples.blueprints.routes',
+            'flask_via.examples.blueprints.foo.routes',
+            'flask_via.examples.blueprints.baz.routes'])
+
+    @mock.patch('flask_via.import_module')
+    def test_prefetch_ignores_import_errors(self, _import_module):
+        _import_module.side_effect = ImportError
+
+        i = RoutesImporter()
+        modules = i.prefetch(mock.MagicMock(config={}), 'foo.bar', 'routes', 2)
+
+        self.assertEqual(modules, ['foo.bar'])
+
+    def test_compile_module_caches_included_modules(self):
+        view = mock.MagicMock(__name__='x', methods=['GET'])
+
+        class View(MethodView):
+            def get(self):
+                return 'y'
+
+        modules = {
+            'root': mock.MagicMock(routes=[
+                Include('common', url_prefix='/a', endpoint='a'),
+                Include('common', url_prefix='/b', endpoint='b'),
+            ]),
+            'common': mock.MagicMock(routes=[
+                Functional('/x', view),
+                Pluggable('/y', View, 'y'),
+            ]),
+        }
+        app = mock.MagicMock(config={})
+
+        with mock.patch('flask_via.import_module') as _import:
+            _import.side_effect = modules.get
+            i = RoutesImporter()
+            cached = i.compile_module(app, 'root', 'routes', routes_cache={})
+            self.assertEqual(_import.call_count, 2)
+            entries = i.compile_module(app, 'root', 'routes')
+
+        self.assertEqual(
+            [(e.url, e.endpoint, e.view.__name__) for e in cached],
+            [(e.url, e.endpoint, e.view.__name__) for e in entries])
+        self.assertEqual([(e.url, e.endpoint) for e in cached], [
+            ('/a/x', 'a.x'),
+            ('/a/y', 'a.y'),
+            ('/b/x', 'b.x'),
+            ('/b/y', 'b.y')])
+
+    def test_release(self):
+        module = mock.MagicMock(routes=[Functional('/x', 'foo.x')])
+        app = mock.MagicMock(config={'VIA_RELEASE_ROUTES': True})
+
+        with mock.patch('flask_via.import_module', return_value=module):
+            with mock.patch.dict('sys.modules', {'foo.routes': module}):
+                via = Via()
+                table = via.compile(app, 'foo.routes')
+                via.release(table.included)
+
+        self.assertEqual(table.included, (('foo.routes', 'routes'),))
+        self.assertEqual([e.url for e in table], ['/x'])
+        self.assertFalse(hasattr(module, 'routes'))
+
+    @mock.patch('flask_via.import_module')
+    def test_compile_module_raises_on_cycle(self, _import_module):
+        _import_module.return_value = mock.MagicMock(
+            routes=[Include('foo.bar')])
+
+        i = RoutesImporter()
+
+        with self.assertRaises(ImproperlyConfigured):
+            i.compile_module(
+                mock.MagicMock(config={}),
+                'foo.bar',
+                'routes',
+                routes_cache={})
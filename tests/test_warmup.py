@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+"""
+tests.test_warmup
+=================
+
+Unit tests for warming up applications before workers are forked.
+"""
+
+import mock
+
+from flask import Blueprint
+from flask_via import Via
+from flask_via.deferred import DeferredLoader
+from flask_via.routers import default
+from flask_via.warmup import compile_templates, warmup
+from jinja2 import DictLoader
+from tests import ViaTestCase
+
+
+def view(**kwargs):
+    return 'view'
+
+
+routes = [
+    default.Functional('/', 'tests.test_warmup.view', 'index'),
+]
+
+
+class TestWarmup(ViaTestCase):
+
+    def setUp(self):
+        self.app.config['VIA_URL_BUILDERS'] = True
+        self.via = Via()
+        self.via.init_app(self.app, routes_module='tests.test_warmup')
+        self.app.add_url_rule('/late', 'late', view)
+
+        patcher = mock.patch('flask_via.warmup.gc')
+        self.gc = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_warmup(self):
+        timings = self.via.warmup(self.app)
+
+        self.assertIs(self.app.view_functions['index'].view, view)
+        self.assertFalse(self.app.url_map._remap)
+        self.assertIn(
+            'late',
+            self.app.extensions['via']['builders'].builders)
+        self.gc.collect.assert_called_once_with()
+        self.gc.freeze.assert_called_once_with()
+        self.assertEqual(
+            sorted(timings),
+            ['deferred', 'gc', 'jinja', 'url_map', 'views'])
+
+    def test_no_freeze(self):
+        warmup(self.app, freeze=False)
+
+        self.assertTrue(self.gc.collect.called)
+        self.assertFalse(self.gc.freeze.called)
+
+    def test_deferred(self):
+        loaded = []
+        DeferredLoader(
+            self.app,
+            'lazy',
+            lambda: loaded.append(True),
+            url_prefix='/lazy')
+
+        warmup(self.app, deferred=False)
+        self.assertEqual(loaded, [])
+
+        warmup(self.app)
+        self.assertEqual(loaded, [True])
+
+    def test_blueprint_loaders(self):
+        blueprint = Blueprint('bp', __name__, template_folder='templates')
+        self.app.register_blueprint(blueprint)
+
+        warmup(self.app)
+
+        self.assertIn('jinja_loader', blueprint.__dict__)
+
+    def test_templates(self):
+        self.app.jinja_env.loader = DictLoader({'a.html': '{{ 1 + 1 }}'})
+
+        timings = warmup(self.app, templates=True)
+
+        self.assertIn('templates', timings)
+        self.assertEqual(len(self.app.jinja_env.cache), 1)
+
+    def test_unlisted_templates(self):
+        with mock.patch.object(
+                self.app.jinja_env,
+                'list_templates',
+                side_effect=TypeError):
+            compile_templates(self.app)
+
+        self.assertEqual(len(self.app.jinja_env.cache), 0)
+
+
+class TestDisabled(ViaTestCase):
+
+    def test_extension_untouched(self):
+        with mock.patch('flask_via.warmup.gc'):
+            warmup(self.app)
+
+        self.assertNotIn('via', self.app.extensions)